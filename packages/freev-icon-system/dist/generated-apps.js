@@ -0,0 +1,8 @@
+// AUTO-GENERATED by tools/generate_registry.py — DO NOT EDIT
+export const LABELS={"CodeMaster_V2":"CodeMaster V2","StreamStudio_Pro":"StreamStudio Pro","Freev_TaskFlow":"Freev TaskFlow","Freev_Sketch_Pro":"Freev Sketch Pro","DataVault":"DataVault","Freev_Convert":"Freev Convert","PixelForge":"PixelForge","ResumeMaster":"ResumeMaster","Crop_Studio":"Crop Studio","CSV_Explorer":"CSV Explorer","Markdown_Studio":"Markdown Studio","QR_Studio":"QR Studio","Signature_Studio":"Signature Studio","Excalidraw":"Excalidraw","OpenCut":"OpenCut"};
+export const DEFAULT_ANIM={"CodeMaster_V2":"glow-code","StreamStudio_Pro":"pulse-play","Freev_TaskFlow":"flow-cards","Freev_Sketch_Pro":"draw-pencil","DataVault":"lock-vault","Freev_Convert":"convert-swap","PixelForge":"pixel-spark","ResumeMaster":"resume-reveal","Crop_Studio":"pixel-spark","CSV_Explorer":"flow-cards","Markdown_Studio":"glow-code","QR_Studio":"pulse-play","Signature_Studio":"draw-pencil","Excalidraw":"pulse-play","OpenCut":"pulse-play"};
+export const ANIM_LAYERS={"CodeMaster_V2":1,"StreamStudio_Pro":1,"Freev_TaskFlow":3,"Freev_Sketch_Pro":1,"DataVault":1,"Freev_Convert":2,"PixelForge":2,"ResumeMaster":1,"Crop_Studio":1,"CSV_Explorer":1,"Markdown_Studio":1,"QR_Studio":1,"Signature_Studio":1,"Excalidraw":1,"OpenCut":1};
+export const ANIM_COVER={"StreamStudio_Pro":true,"Freev_Sketch_Pro":true,"DataVault":true,"Freev_Convert":true,"ResumeMaster":true,"Crop_Studio":true,"CSV_Explorer":true,"Markdown_Studio":true,"QR_Studio":true,"Signature_Studio":true,"Excalidraw":true,"OpenCut":true};
+export const RECONSTRUCT_SYMBOL=new Set(["CodeMaster_V2", "StreamStudio_Pro", "Freev_Sketch_Pro", "Freev_Convert", "PixelForge", "Crop_Studio", "CSV_Explorer", "Markdown_Studio", "QR_Studio", "Signature_Studio", "Excalidraw", "OpenCut"]);
+export const DEFAULT_APP="CodeMaster_V2";
+export const APP_REGISTRY=[{"id":"CodeMaster_V2","label":"CodeMaster V2","kind":"software","shortName":"CodeMaster","animation":"glow-code","animationLayers":1,"animationCover":false,"reconstructAnimationSymbol":true},{"id":"StreamStudio_Pro","label":"StreamStudio Pro","kind":"software","shortName":"StreamStudio","animation":"pulse-play","animationLayers":1,"animationCover":true,"reconstructAnimationSymbol":true},{"id":"Freev_TaskFlow","label":"Freev TaskFlow","kind":"software","shortName":"TaskFlow","animation":"flow-cards","animationLayers":3,"animationCover":false,"reconstructAnimationSymbol":false},{"id":"Freev_Sketch_Pro","label":"Freev Sketch Pro","kind":"software","shortName":"Sketch Pro","animation":"draw-pencil","animationLayers":1,"animationCover":true,"reconstructAnimationSymbol":true},{"id":"DataVault","label":"DataVault","kind":"software","shortName":"DataVault","animation":"lock-vault","animationLayers":1,"animationCover":true,"reconstructAnimationSymbol":false},{"id":"Freev_Convert","label":"Freev Convert","kind":"software","shortName":"Convert","animation":"convert-swap","animationLayers":2,"animationCover":true,"reconstructAnimationSymbol":true},{"id":"PixelForge","label":"PixelForge","kind":"software","shortName":"PixelForge","animation":"pixel-spark","animationLayers":2,"animationCover":false,"reconstructAnimationSymbol":true},{"id":"ResumeMaster","label":"ResumeMaster","kind":"software","shortName":"ResumeMaster","animation":"resume-reveal","animationLayers":1,"animationCover":true,"reconstructAnimationSymbol":false},{"id":"Crop_Studio","label":"Crop Studio","kind":"software","shortName":"Crop Studio","animation":"pixel-spark","animationLayers":1,"animationCover":true,"reconstructAnimationSymbol":true,"sourceSha256":"75b453c8320656d4c53b9d9ecb1475fb1de9d83a24934ba545c028b5332ccb70","symbolExtractionConfidence":1.0},{"id":"CSV_Explorer","label":"CSV Explorer","kind":"software","shortName":"CSV Explorer","animation":"flow-cards","animationLayers":1,"animationCover":true,"reconstructAnimationSymbol":true,"sourceSha256":"f4a766b1ab9bf51cc7141ec294a4710bcebd8dd318a5a28b7061adefe2b8c921","symbolExtractionConfidence":1.0},{"id":"Markdown_Studio","label":"Markdown Studio","kind":"software","shortName":"Markdown","animation":"glow-code","animationLayers":1,"animationCover":true,"reconstructAnimationSymbol":true,"sourceSha256":"d29aba2aa92f7ca9a0f809445ab9acd07cac1d2871e6f46bd9985cbcefc66e86","symbolExtractionConfidence":1.0},{"id":"QR_Studio","label":"QR Studio","kind":"software","shortName":"QR Studio","animation":"pulse-play","animationLayers":1,"animationCover":true,"reconstructAnimationSymbol":true,"sourceSha256":"a19ae81a6de1652fa20227c9963fed8b9effc3e3507afaad8cb925747b8b06d9","symbolExtractionConfidence":1.0},{"id":"Signature_Studio","label":"Signature Studio","kind":"software","shortName":"Signature","animation":"draw-pencil","animationLayers":1,"animationCover":true,"reconstructAnimationSymbol":true,"sourceSha256":"bf5ee95c5477123907030ff97b8799b7b95fe52cf99dcd2ee5a5bd5f55c29279","symbolExtractionConfidence":1.0},{"id":"Excalidraw","label":"Excalidraw","kind":"software","shortName":"Excalidraw","animation":"pulse-play","animationLayers":1,"animationCover":true,"reconstructAnimationSymbol":true,"sourceSha256":"40c0f1ec1db774fbd4bae0b0d0a3b8cd6ef4be1cb48c431765761640a96a1067","symbolExtractionConfidence":1.0},{"id":"OpenCut","label":"OpenCut","kind":"software","shortName":"OpenCut","animation":"pulse-play","animationLayers":1,"animationCover":true,"reconstructAnimationSymbol":true,"sourceSha256":"4bb91fbfc71a7cc953d90f3bfef830171097fd198496d67fe6bc4cb1a334ef41","symbolExtractionConfidence":1.0}];
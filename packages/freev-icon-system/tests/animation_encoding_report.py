@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+from pathlib import Path
+from PIL import Image
+import json,sys,time,tempfile
+import numpy as np
+ROOT=Path(__file__).resolve().parents[1];sys.path.insert(0,str(ROOT/'tools'))
+from freev_registry import load_registry
+from freev_animation import FRAMES,FRAME_MS,ENCODERS,export,iter_frames,write_gif_delta,global_palette
+SIZE=256
+REPEAT=3  # encode_ms : meilleur de REPEAT encodages, moins sensible à la charge de la machine
+# One representative app per animation kind: the first registry entry using it.
+KINDS={}
+for a in load_registry()['apps']:KINDS.setdefault(a['animation'],a['id'])
+report={'size':SIZE,'frames':FRAMES,'repeat':REPEAT,'kinds':{},'errors':[]}
+def baseline_export(app,kind,out,fmt):
+ """Chemin d'avant la série : toutes les trames en mémoire, puis save_all de Pillow (export_animation.py d'origine)."""
+ frames=list(iter_frames(app,kind,size=SIZE))
+ if fmt=='webp':frames[0].save(out,'WEBP',save_all=True,append_images=frames[1:],duration=FRAME_MS,loop=0,quality=93,method=4)
+ else:frames[0].save(out,'GIF',save_all=True,append_images=frames[1:],duration=FRAME_MS,loop=0,disposal=2)
+def gif_fidelity(path,app,kind):
+ """Écart moyen RVB max sur les pixels opaques et nombre max de pixels à la transparence erronée.
+
+ Une trame identique à la précédente est fusionnée (durée allongée) : chaque trame décodée couvre
+ durée / FRAME_MS trames rendues."""
+ err=0.0;alpha=0;refs=iter_frames(app,kind,size=SIZE);covered=0
+ with Image.open(path) as im:
+  for k in range(im.n_frames):
+   im.seek(k);a=np.asarray(im.convert('RGBA')).astype(int);n=round(im.info['duration']/FRAME_MS);covered+=n
+   for ref in (next(refs,None) for _ in range(n)):
+    if ref is None:break
+    r=np.asarray(ref).astype(int);op=r[...,3]>=128
+    err=max(err,float(np.abs(a[...,:3]-r[...,:3])[op].mean()));alpha=max(alpha,int(((a[...,3]>=128)!=op).sum()))
+ if covered!=FRAMES:report['errors'].append(f'{path.name}: frames cover {covered} of {FRAMES}');return None
+ return {'mean_rgb_error':round(err,3),'alpha_mismatch_px':alpha}
+def transparency_cases():
+ """Animations à vraies zones transparentes : les fonds d'icônes sont opaques et ne testent pas l'effacement.
+
+ 'repaint' : un pixel peint par une trame ancienne, hors du rectangle de la trame en attente, doit redevenir
+ transparent ; 'blobs' : rectangles opaques qui apparaissent et disparaissent n'importe où, bouclage compris."""
+ R,G,T=(255,0,0,255),(0,255,0,255),(0,0,0,0)
+ yield 'repaint',[np.array([row],np.uint8) for row in ([R]*6,[G]+[R]*5,[G]+[R]*4+[T],[R]*6)]
+ rng=np.random.default_rng(27);colors=np.array([[255,0,0,255],[0,128,255,255],[250,220,30,255]],np.uint8);frames=[]
+ for _ in range(FRAMES):
+  a=np.zeros((48,48,4),np.uint8)
+  for _ in range(rng.integers(1,5)):
+   x,y=rng.integers(0,40,2);w,h=rng.integers(2,12,2);a[y:y+h,x:x+w]=colors[rng.integers(len(colors))]
+  frames.append(a)
+ yield 'blobs',frames
+def transparency_fidelity(tmp):
+ """Pixels dont l'opacité décodée diffère de la trame source, pour chaque cas de transparency_cases."""
+ out={}
+ for name,arrays in transparency_cases():
+  frames=[Image.fromarray(a,'RGBA') for a in arrays];path=Path(tmp)/f'transparency-{name}.gif'
+  write_gif_delta(iter(frames),path,global_palette(frames));bad=0
+  with Image.open(path) as im:
+   for i,ref in enumerate(arrays):
+    im.seek(i);bad+=int(((np.asarray(im.convert('RGBA'))[...,3]>=128)!=(ref[...,3]>=128)).sum())
+  out[name]={'frames':len(arrays),'alpha_mismatch_px':bad}
+  if bad:report['errors'].append(f'gif delta transparency {name}: {bad} pixels with the wrong opacity')
+ return out
+with tempfile.TemporaryDirectory() as tmp:
+ report['transparency']=transparency_fidelity(tmp)
+ for kind,app in sorted(KINDS.items()):
+  row=report['kinds'][kind]={'app':app}
+  for fmt in ['webp','gif']:
+   # 'baseline' : l'exporteur d'avant la série, référence de « la sortie actuelle » pour les gains annoncés.
+   for enc in ('baseline',*ENCODERS):
+    out=Path(tmp)/f'{kind}-{enc}.{fmt}';best=float('inf')
+    for _ in range(REPEAT):
+     t=time.perf_counter()
+     if enc=='baseline':baseline_export(app,kind,out,fmt)
+     else:export(app,kind,out,fmt,enc,size=SIZE)
+     best=min(best,time.perf_counter()-t)
+    with Image.open(out) as im:count=im.n_frames
+    row[f'{fmt}_{enc}']={'bytes':out.stat().st_size,'frames':count,'encode_ms':round(best*1000,1)}
+    if fmt=='gif':row[f'{fmt}_{enc}']['fidelity']=gif_fidelity(out,app,kind)
+   base,full,delta=row[f'{fmt}_baseline'],row[f'{fmt}_full'],row[f'{fmt}_delta']
+   row[f'{fmt}_bytes_ratio']=round(delta['bytes']/full['bytes'],3);row[f'{fmt}_bytes_ratio_vs_baseline']=round(delta['bytes']/base['bytes'],3)
+   if delta['bytes']>full['bytes']:report['errors'].append(f'{kind} {fmt}: delta output larger than full output')
+   if fmt=='gif' and full['bytes']>base['bytes']:report['errors'].append(f'{kind} gif: full output larger than the baseline exporter')
+  fd,ff=row['gif_delta']['fidelity'],row['gif_full']['fidelity']
+  # Sub-rectangle frames must decode to the same animation: no stray transparency, no drift from the source.
+  if fd and (fd['alpha_mismatch_px'] or (ff and fd['mean_rgb_error']>ff['mean_rgb_error']+1)):report['errors'].append(f'{kind} gif: delta frames drift from the rendered animation')
+report['ok']=not report['errors']
+(ROOT/'tests/ANIMATION_ENCODING_REPORT.json').write_text(json.dumps(report,indent=2),encoding='utf-8')
+print(json.dumps(report,indent=2));sys.exit(0 if report['ok'] else 1)
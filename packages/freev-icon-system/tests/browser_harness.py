@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Shared Playwright harness: one Chromium for every browser suite, assets served from memory.
+
+Each suite module exposes REPORT (file name under tests/) and ``async def run(h)`` returning its
+report dict with an 'ok' key. ``python tests/browser_harness.py`` runs the screenshot suites (VISUAL) one
+after another, then the others concurrently, each in its own browser context; a suite file run directly
+uses the same harness on its own."""
+from __future__ import annotations
+from pathlib import Path
+from urllib.parse import urlparse, unquote
+import asyncio, importlib, json, mimetypes, sys, time
+from browser_utils import launch_chromium,classic_runtime
+
+ROOT=Path(__file__).resolve().parents[1]
+ASSET_ORIGIN='https://freev.test/'
+# Everything the runtime fetches lives here; other files are read on first request.
+PRELOAD=['masters/clean','symbols']
+SUITES=['browser_visual_regression','v2_4_edge_cases','v2_5_interaction','v2_6_security_runtime']
+# Screenshots taken after timed waits: run alone so a busy CPU cannot shift the captured animation frame.
+VISUAL={'browser_visual_regression','v2_4_edge_cases'}
+TIMING_REPORT=ROOT/'tests/browser-suites-timing.json'
+
+class AssetCache:
+    """Pack files read from disk once, then fulfilled from memory for every context."""
+    def __init__(self,root,preload=()):
+        self.root=Path(root).resolve();self.files={}
+        for rel in preload:
+            for fp in sorted((self.root/rel).rglob('*')):
+                if fp.is_file():self.get(fp.relative_to(self.root).as_posix())
+    def get(self,path):
+        if path not in self.files:
+            fp=(self.root/path).resolve();entry=None
+            try:
+                fp.relative_to(self.root)
+                if fp.is_file():entry=(fp.read_bytes(),mimetypes.guess_type(fp.name)[0] or 'application/octet-stream')
+            except (ValueError,OSError):pass
+            self.files[path]=entry
+        return self.files[path]
+    async def route(self,route):
+        entry=self.get(unquote(urlparse(route.request.url).path).lstrip('/'))
+        if entry is None:
+            await route.fulfill(status=404,body=b'not found',content_type='text/plain');return
+        await route.fulfill(status=200,body=entry[0],content_type=entry[1],headers={'Access-Control-Allow-Origin':'*','Cache-Control':'no-store'})
+
+class BrowserHarness:
+    def __init__(self,browser,assets,runtime):
+        self.browser=browser;self.assets=assets;self.runtime=runtime
+    async def page(self,report,html,viewport=None):
+        """New isolated context + page with the asset route, the runtime and console-error capture."""
+        ctx=await self.browser.new_context(viewport=viewport or {'width':900,'height':500},device_scale_factor=1)
+        await ctx.route(ASSET_ORIGIN+'**',self.assets.route)
+        page=await ctx.new_page()
+        page.on('console',lambda m: report['console_errors'].append(m.text) if m.type=='error' else None)
+        await page.set_content(html)
+        await page.evaluate(f"globalThis.FREEV_ICON_ASSET_BASE='{ASSET_ORIGIN}'")
+        await page.add_script_tag(content=self.runtime)
+        return page
+
+async def _timed(harness,suite):
+    t=time.perf_counter()
+    try:report=await suite.run(harness)
+    except Exception as e:report={'ok':False,'error':f'{type(e).__name__}: {e}'}
+    return report,round(time.perf_counter()-t,2)
+
+async def run_suites(suites):
+    from playwright.async_api import async_playwright
+    assets=AssetCache(ROOT,PRELOAD);runtime=classic_runtime(ROOT)
+    async with async_playwright() as p:
+        browser=await launch_chromium(p,headless=True)
+        try:
+            results={}
+            for s in suites:
+                if Path(s.__file__).stem in VISUAL:results[s]=await _timed(BrowserHarness(browser,assets,runtime),s)
+            rest=[s for s in suites if s not in results]
+            results.update(zip(rest,await asyncio.gather(*(_timed(BrowserHarness(browser,assets,runtime),s) for s in rest))))
+            return [results[s] for s in suites]
+        finally:await browser.close()
+
+def main(suites):
+    t=time.perf_counter();results=asyncio.run(run_suites(suites));timing={}
+    for suite,(report,wall) in zip(suites,results):
+        (ROOT/'tests'/suite.REPORT).write_text(json.dumps(report,indent=2),encoding='utf-8')
+        print(json.dumps(report,indent=2))
+        timing[Path(suite.__file__).stem]={'ok':bool(report.get('ok')),'wall_s':wall}
+    summary={'total_wall_s':round(time.perf_counter()-t,2),'suites':timing}
+    if len(suites)>1:TIMING_REPORT.write_text(json.dumps(summary,indent=2),encoding='utf-8')
+    for name,x in timing.items():print(f"{name}: {'PASS' if x['ok'] else 'FAIL'} in {x['wall_s']} s",file=sys.stderr)
+    return 0 if all(x['ok'] for x in timing.values()) else 1
+
+if __name__=='__main__':
+    sys.exit(main([importlib.import_module(name) for name in SUITES]))
@@ -2,96 +2,154 @@
 from pathlib import Path
 from PIL import Image
 from xml.etree import ElementTree as ET
-import json,hashlib,subprocess,sys,shutil,os
+from concurrent.futures import ProcessPoolExecutor
+import json,hashlib,subprocess,sys,shutil,os,time,argparse,PIL
 ROOT=Path(__file__).resolve().parents[1];sys.path.insert(0,str(ROOT/'tools'))
 from freev_registry import load_registry
-from icon_pipeline import check_all,check_app
-errors=[];warnings=[];stats={}
-def err(x):errors.append(x)
+from icon_pipeline import check_all
+# Verdicts per (path, size, mtime): an unchanged file is not reopened on the next run.
+CACHE_PATH=ROOT/'tests/.final-audit-cache.json'
+CACHE_VERSION=f'1|Pillow {PIL.__version__}'
+FORMATS={'.png':'PNG','.ico':'ICO','.icns':'ICNS','.json':'JSON','.webmanifest':'JSON','.xml':'XML'}
 def sha(p):
  h=hashlib.sha256()
  with open(p,'rb') as f:
   for c in iter(lambda:f.read(1<<20),b''):h.update(c)
  return h.hexdigest()
-for d in ROOT.rglob('__pycache__'):shutil.rmtree(d,ignore_errors=True)
-for p in ROOT.rglob('*.pyc'):p.unlink(missing_ok=True)
-reg=load_registry();apps=reg['apps'];APPS=[a['id'] for a in apps];amap={a['id']:a for a in apps}
-files=[p for p in ROOT.rglob('*') if p.is_file()];stats['file_count']=len(files);stats['size_mb']=round(sum(p.stat().st_size for p in files)/1024/1024,2);stats['app_count']=len(APPS)
-# Mandatory pipeline completeness.
-for x in check_all(True):err(x)
-for a in apps:
- for x in check_app(a['id'],a):err(x)
-# Master identity: original eight use frozen checksums; future additions use their source hash stored in the registry.
-checks=json.loads((ROOT/'tests/original-master-checksums.json').read_text())
-for a in apps:
- p=ROOT/'masters/original-native'/f"{a['id']}.png"
- if not p.exists():err('missing native master '+a['id']);continue
- expected=None
- if a['id'] in checks:
-  v=checks[a['id']];expected=(v.get('sha256') or v.get('native_sha256')) if isinstance(v,dict) else v
- elif a.get('sourceSha256'):expected=a['sourceSha256']
- if expected and sha(p)!=expected:err('master checksum mismatch '+a['id'])
-# Format integrity.
-pngs=list(ROOT.rglob('*.png'));stats['png_count']=len(pngs)
-for p in pngs:
+def verdict(job):
+ """Worker du pool : décode/valide un fichier, renvoie (chemin relatif, erreur ou None, sha256 ou None)."""
+ rel,label,digest=job;p=ROOT/rel
  try:
-  with Image.open(p) as im:im.verify()
- except Exception as e:err(f'PNG invalid {p.relative_to(ROOT)}: {e}')
-for p in ROOT.rglob('*.ico'):
- try:Image.open(p).verify()
- except Exception as e:err(f'ICO invalid {p.relative_to(ROOT)}: {e}')
-for p in ROOT.rglob('*.icns'):
- try:Image.open(p).verify()
- except Exception as e:err(f'ICNS invalid {p.relative_to(ROOT)}: {e}')
-for p in list(ROOT.rglob('*.json'))+list(ROOT.rglob('*.webmanifest')):
- try:json.loads(p.read_text(encoding='utf-8'))
- except Exception as e:err(f'JSON invalid {p.relative_to(ROOT)}: {e}')
-for p in (ROOT/'platform/android').rglob('*.xml'):
- try:ET.parse(p)
- except Exception as e:err(f'XML invalid {p.relative_to(ROOT)}: {e}')
-# Registry generation must contain every app everywhere it matters.
-utf8_env={**os.environ,'PYTHONUTF8':'1','PYTHONIOENCODING':'utf-8'}
-subprocess.run([sys.executable,'tools/generate_registry.py'],cwd=ROOT,check=True,capture_output=True,env=utf8_env)
-for aid in APPS:
- if aid not in (ROOT/'web/generated-apps.js').read_text(encoding='utf-8'):err('generated runtime registry missing '+aid)
- if aid not in (ROOT/'types/freev-icon.d.ts').read_text(encoding='utf-8'):err('TypeScript registry missing '+aid)
- if aid not in (ROOT/'web/index.html').read_text(encoding='utf-8'):err('demo registry missing '+aid)
-# Version synchronization.
-pkg=json.loads((ROOT/'package.json').read_text());manifest=json.loads((ROOT/'docs/manifest.json').read_text())
-if pkg.get('version')!='2.7.0':err('npm version != 2.7.0')
-if manifest.get('version')!='2.7.0':err('manifest version != 2.7.0')
-if 'version = "2.7.0"' not in (ROOT/'pyproject.toml').read_text():err('pyproject version != 2.7.0')
-if 'V2.7 Final' not in (ROOT/'web/index.html').read_text():err('demo version stale')
-if 'V2.7 static exporter' not in (ROOT/'tools/export_icon.py').read_text():err('exporter version stale')
-# Mandatory system source and build gate.
-for rel in ['registry/apps.json','tools/icon_pipeline.py','tools/generate_registry.py','tools/freev_registry.py','incoming/README.md','docs/AUTOMATIC_ICON_ONBOARDING.md','web/generated-apps.js']:
- if not (ROOT/rel).exists():err('mandatory onboarding component missing: '+rel)
-build=(ROOT/'build.mjs').read_text()
-if 'icon_pipeline.py' not in build or 'sync' not in build or '--enforce' not in build:err('build does not enforce automatic icon onboarding')
-# End-to-end toolchain, including a real temporary ninth app import.
-npm_command=shutil.which('npm.cmd') or shutil.which('npm') or 'npm'
-commands={'pipeline_check':[sys.executable,'tools/icon_pipeline.py','check'],'node_check':['node','--check','web/freev-icon.js'],'build':['node','build.mjs'],'ssr':['node','tests/ssr_import.mjs'],'onboarding':[sys.executable,'tests/v2_7_onboarding.py'],'npm_pack':[npm_command,'pack','--dry-run','--json']}
-cmdres={}
-for name,cmd in commands.items():
- r=subprocess.run(cmd,cwd=ROOT,capture_output=True,text=True,encoding='utf-8',errors='replace',timeout=240,env=utf8_env);cmdres[name]={'returncode':r.returncode,'stdout':r.stdout[-2500:],'stderr':r.stderr[-1500:]}
- if r.returncode:err(name+' failed')
-stats['commands']=cmdres
-if '__pycache__' in cmdres.get('npm_pack',{}).get('stdout','') or '.pyc' in cmdres.get('npm_pack',{}).get('stdout',''):err('npm package contains Python cache files')
-# Onboarding test must have restored the repository to its original app count.
-reg2=load_registry()
-if [a['id'] for a in reg2['apps']]!=APPS:err('onboarding test did not restore registry')
-rep=ROOT/'tests/V2_7_ONBOARDING_REPORT.json'
-if not rep.exists() or not json.loads(rep.read_text()).get('ok'):err('V2.7 onboarding report failed')
-# No transient caches in final product.
-for d in ROOT.rglob('__pycache__'):shutil.rmtree(d,ignore_errors=True)
-for p in ROOT.rglob('*.pyc'):p.unlink(missing_ok=True)
-for d in ROOT.rglob('__pycache__'):shutil.rmtree(d,ignore_errors=True)
-for p in ROOT.rglob('*.pyc'):p.unlink(missing_ok=True)
-warnings=['Original FREEV artwork remains raster-based; new raster masters are preserved exactly when supplied as PNG.','Automatic glyph extraction is intentionally fail-closed: low confidence requires a sibling .mask.png instead of silently creating a bad icon.','PWA deployment URLs remain templates and must match the final deployed application.','Package remains UNLICENSED until a distribution license is chosen.']
-score=9.98 if not errors else max(0,10-.45*len(errors));report={'version':'2.7.0','score':score,'status':'PASS' if not errors else 'FAIL','errors':errors,'warnings':warnings,'stats':stats}
-(ROOT/'tests/V2_7_FINAL_AUDIT.json').write_text(json.dumps(report,indent=2,ensure_ascii=False),encoding='utf-8')
-md=['# FREEV Icon System V2.7 — Audit final','',f'**Score : {score}/10 — {report["status"]}**','',f'- Applications enregistrées : {stats["app_count"]}',f'- Fichiers : {stats["file_count"]}',f'- Taille décompressée : {stats["size_mb"]} Mo',f'- PNG validés : {stats["png_count"]}','','## Onboarding automatique obligatoire','- Build gate : '+('PASS' if not any('build does not enforce' in x for x in errors) else 'FAIL'),'- Test réel ajout temporaire : '+('PASS' if rep.exists() and json.loads(rep.read_text()).get('ok') else 'FAIL'),'','## Erreurs']
-md += (['- Aucune.'] if not errors else ['- '+x for x in errors])
-md += ['','## Limites résiduelles']+['- '+x for x in warnings]
-(ROOT/'docs/FINAL_AUDIT_V2_7.md').write_text('\n'.join(md),encoding='utf-8')
-print(json.dumps(report,indent=2,ensure_ascii=False));sys.exit(0 if not errors else 1)
+  if label=='JSON':json.loads(p.read_text(encoding='utf-8'))
+  elif label=='XML':ET.parse(p)
+  else:
+   with Image.open(p) as im:im.verify()
+  error=None
+ except Exception as e:error=f'{label} invalid {rel}: {e}'
+ return rel,error,sha(p) if digest else None
+def walk():
+ """Un seul parcours de l'arborescence : {chemin relatif POSIX: (taille, mtime_ns)}."""
+ files={}
+ for dirpath,_,names in os.walk(ROOT):
+  for n in names:
+   p=Path(dirpath)/n
+   if p==CACHE_PATH:continue
+   st=p.stat();files[p.relative_to(ROOT).as_posix()]=(st.st_size,st.st_mtime_ns)
+ return files
+def clean_caches():
+ for dirpath,dirs,names in os.walk(ROOT):
+  if '__pycache__' in dirs:shutil.rmtree(Path(dirpath)/'__pycache__',ignore_errors=True);dirs.remove('__pycache__')
+  for n in names:
+   if n.endswith('.pyc'):(Path(dirpath)/n).unlink(missing_ok=True)
+def load_cache(enabled):
+ if not enabled:return {}
+ try:
+  data=json.loads(CACHE_PATH.read_text(encoding='utf-8'))
+  return data['entries'] if data.get('version')==CACHE_VERSION else {}
+ except (OSError,ValueError,KeyError):return {}
+def run_commands(commands,env):
+ """Lance les commandes par vagues : les commandes d'une même vague ne modifient pas l'arbre et tournent ensemble.
+
+ build écrit dist/ et le registre généré, onboarding ajoute puis retire une app : chacune reste seule."""
+ waves=[['pipeline_check','node_check'],['build'],['ssr','npm_pack'],['onboarding']];res={};timings={}
+ for wave in waves:
+  procs={name:(subprocess.Popen(commands[name],cwd=ROOT,stdout=subprocess.PIPE,stderr=subprocess.PIPE,text=True,encoding='utf-8',errors='replace',env=env),time.perf_counter()) for name in wave}
+  for name,(proc,t0) in procs.items():
+   try:out,errtxt=proc.communicate(timeout=240)
+   except subprocess.TimeoutExpired:proc.kill();out,errtxt=proc.communicate();errtxt+='\ntimeout after 240 s'
+   timings[name]=round((time.perf_counter()-t0)*1000,1);res[name]={'returncode':proc.returncode,'stdout':out[-2500:],'stderr':errtxt[-1500:]}
+ return {name:res[name] for name in commands},timings
+
+def main():
+ ap=argparse.ArgumentParser();ap.add_argument('--jobs',type=int,default=os.cpu_count() or 1,help='processes for decode/verify');ap.add_argument('--no-cache',action='store_true',help='re-verify every file');args=ap.parse_args()
+ errors=[];warnings=[];stats={};timings={}
+ def err(x):errors.append(x)
+ def timed(name,t0):timings[name]=round((time.perf_counter()-t0)*1000,1);return time.perf_counter()
+ start=t=time.perf_counter()
+ clean_caches();t=timed('cleanup',t)
+ reg=load_registry();apps=reg['apps'];APPS=[a['id'] for a in apps]
+ files=walk();stats['file_count']=len(files);stats['size_mb']=round(sum(s for s,_ in files.values())/1024/1024,2);stats['app_count']=len(APPS);t=timed('walk',t)
+ # Decode/verify jobs from the shared walk; native masters also need their hash.
+ masters={f"masters/original-native/{aid}.png" for aid in APPS}
+ cache=load_cache(not args.no_cache);fresh={};jobs=[]
+ for rel,(size,mtime) in files.items():
+  label=FORMATS.get(Path(rel).suffix.lower())
+  if not label or (label=='XML' and not rel.startswith('platform/android/')):continue
+  hit=cache.get(rel)
+  if hit and hit[0]==size and hit[1]==mtime and (hit[3] or rel not in masters):fresh[rel]=hit
+  else:jobs.append((rel,label,rel in masters))
+ stats['png_count']=sum(1 for rel in files if rel.lower().endswith('.png'));stats['cache']={'hits':len(fresh),'verified':len(jobs)}
+ pool=ProcessPoolExecutor(max_workers=args.jobs) if args.jobs>1 and len(jobs)>1 else None
+ results=pool.map(verdict,jobs,chunksize=max(1,len(jobs)//(args.jobs*4))) if pool else map(verdict,jobs)
+ try:
+  # Mandatory pipeline completeness (check_all already runs check_app for every registered app),
+  # while the pool decodes.
+  for x in check_all(True):err(x)
+  t=timed('pipeline',t)
+  for rel,error,digest in results:size,mtime=files[rel];fresh[rel]=[size,mtime,error,digest]
+ finally:
+  if pool:pool.shutdown()
+ for rel in sorted(fresh):
+  if fresh[rel][2]:err(fresh[rel][2])
+ t=timed('formats',t)
+ if not args.no_cache:CACHE_PATH.write_text(json.dumps({'version':CACHE_VERSION,'entries':fresh},separators=(',',':')),encoding='utf-8')
+ # Master identity: original eight use frozen checksums; future additions use their source hash stored in the registry.
+ checks=json.loads((ROOT/'tests/original-master-checksums.json').read_text())
+ for a in apps:
+  rel=f"masters/original-native/{a['id']}.png"
+  if rel not in fresh:err('missing native master '+a['id']);continue
+  expected=None
+  if a['id'] in checks:
+   v=checks[a['id']];expected=(v.get('sha256') or v.get('native_sha256')) if isinstance(v,dict) else v
+  elif a.get('sourceSha256'):expected=a['sourceSha256']
+  if expected and fresh[rel][3]!=expected:err('master checksum mismatch '+a['id'])
+ t=timed('masters',t)
+ # Registry generation must contain every app everywhere it matters.
+ utf8_env={**os.environ,'PYTHONUTF8':'1','PYTHONIOENCODING':'utf-8'}
+ subprocess.run([sys.executable,'tools/generate_registry.py'],cwd=ROOT,check=True,capture_output=True,env=utf8_env)
+ generated=(ROOT/'web/generated-apps.js').read_text(encoding='utf-8');types=(ROOT/'types/freev-icon.d.ts').read_text(encoding='utf-8');demo=(ROOT/'web/index.html').read_text(encoding='utf-8')
+ for aid in APPS:
+  if aid not in generated:err('generated runtime registry missing '+aid)
+  if aid not in types:err('TypeScript registry missing '+aid)
+  if aid not in demo:err('demo registry missing '+aid)
+ t=timed('registry',t)
+ # Version synchronization.
+ pkg=json.loads((ROOT/'package.json').read_text());manifest=json.loads((ROOT/'docs/manifest.json').read_text())
+ if pkg.get('version')!='2.7.0':err('npm version != 2.7.0')
+ if manifest.get('version')!='2.7.0':err('manifest version != 2.7.0')
+ if 'version = "2.7.0"' not in (ROOT/'pyproject.toml').read_text():err('pyproject version != 2.7.0')
+ if 'V2.7 Final' not in demo:err('demo version stale')
+ if 'V2.7 static exporter' not in (ROOT/'tools/export_icon.py').read_text():err('exporter version stale')
+ # Mandatory system source and build gate.
+ for rel in ['registry/apps.json','tools/icon_pipeline.py','tools/generate_registry.py','tools/freev_registry.py','incoming/README.md','docs/AUTOMATIC_ICON_ONBOARDING.md','web/generated-apps.js']:
+  if not (ROOT/rel).exists():err('mandatory onboarding component missing: '+rel)
+ build=(ROOT/'build.mjs').read_text()
+ if 'icon_pipeline.py' not in build or 'sync' not in build or '--enforce' not in build:err('build does not enforce automatic icon onboarding')
+ t=timed('versions',t)
+ # End-to-end toolchain, including a real temporary ninth app import.
+ npm_command=shutil.which('npm.cmd') or shutil.which('npm') or 'npm'
+ commands={'pipeline_check':[sys.executable,'tools/icon_pipeline.py','check'],'node_check':['node','--check','web/freev-icon.js'],'build':['node','build.mjs'],'ssr':['node','tests/ssr_import.mjs'],'onboarding':[sys.executable,'tests/v2_7_onboarding.py'],'npm_pack':[npm_command,'pack','--dry-run','--json']}
+ cmdres,cmdtimes=run_commands(commands,utf8_env)
+ for name,r in cmdres.items():
+  if r['returncode']:err(name+' failed')
+ stats['commands']=cmdres;t=timed('commands',t);timings['command_ms']=cmdtimes
+ if '__pycache__' in cmdres.get('npm_pack',{}).get('stdout','') or '.pyc' in cmdres.get('npm_pack',{}).get('stdout',''):err('npm package contains Python cache files')
+ # Onboarding test must have restored the repository to its original app count.
+ reg2=load_registry()
+ if [a['id'] for a in reg2['apps']]!=APPS:err('onboarding test did not restore registry')
+ rep=ROOT/'tests/V2_7_ONBOARDING_REPORT.json'
+ onboarding_ok=rep.exists() and json.loads(rep.read_text()).get('ok')
+ if not onboarding_ok:err('V2.7 onboarding report failed')
+ # No transient caches in final product.
+ clean_caches();t=timed('final_cleanup',t);timings['total']=round((time.perf_counter()-start)*1000,1)
+ warnings=['Original FREEV artwork remains raster-based; new raster masters are preserved exactly when supplied as PNG.','Automatic glyph extraction is intentionally fail-closed: low confidence requires a sibling .mask.png instead of silently creating a bad icon.','PWA deployment URLs remain templates and must match the final deployed application.','Package remains UNLICENSED until a distribution license is chosen.']
+ score=9.98 if not errors else max(0,10-.45*len(errors));report={'version':'2.7.0','score':score,'status':'PASS' if not errors else 'FAIL','errors':errors,'warnings':warnings,'stats':stats,'timings_ms':timings}
+ (ROOT/'tests/V2_7_FINAL_AUDIT.json').write_text(json.dumps(report,indent=2,ensure_ascii=False),encoding='utf-8')
+ md=['# FREEV Icon System V2.7 — Audit final','',f'**Score : {score}/10 — {report["status"]}**','',f'- Applications enregistrées : {stats["app_count"]}',f'- Fichiers : {stats["file_count"]}',f'- Taille décompressée : {stats["size_mb"]} Mo',f'- PNG validés : {stats["png_count"]}','','## Onboarding automatique obligatoire','- Build gate : '+('PASS' if not any('build does not enforce' in x for x in errors) else 'FAIL'),'- Test réel ajout temporaire : '+('PASS' if onboarding_ok else 'FAIL'),'','## Erreurs']
+ md += (['- Aucune.'] if not errors else ['- '+x for x in errors])
+ md += ['','## Limites résiduelles']+['- '+x for x in warnings]
+ (ROOT/'docs/FINAL_AUDIT_V2_7.md').write_text('\n'.join(md),encoding='utf-8')
+ print(json.dumps(report,indent=2,ensure_ascii=False));sys.exit(0 if not errors else 1)
+
+# Guard required by the process pool: on Windows/macOS workers re-import this module.
+if __name__=='__main__':main()
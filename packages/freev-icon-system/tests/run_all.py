@@ -3,13 +3,12 @@ import subprocess,sys,shutil
 ROOT=Path(__file__).resolve().parents[1]
 steps=[
  [sys.executable,str(ROOT/'tests/test_pack.py')],
- [sys.executable,str(ROOT/'tests/v2_4_edge_cases.py')],
- [sys.executable,str(ROOT/'tests/v2_5_interaction.py')],
- [sys.executable,str(ROOT/'tests/browser_visual_regression.py')],
+ [sys.executable,str(ROOT/'tests/animation_encoding_report.py')],
  ['node','--check',str(ROOT/'web/freev-icon.js')],
  ['node',str(ROOT/'build.mjs')],
  ['node',str(ROOT/'tests/ssr_import.mjs')],
- [sys.executable,str(ROOT/'tests/v2_6_security_runtime.py')],
+ # One Chromium for all browser suites, screenshot suites one after another, the rest concurrently (per-suite wall time in tests/browser-suites-timing.json).
+ [sys.executable,str(ROOT/'tests/browser_harness.py')],
  [sys.executable,str(ROOT/'tests/v2_7_onboarding.py')],
 ]
 for cmd in steps:
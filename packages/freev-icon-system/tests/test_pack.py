@@ -91,6 +91,17 @@ else:
 r=subprocess.run([sys.executable,str(ROOT/'tools/export_icon.py'),'--app','CodeMaster_V2','--state','loading','--out',str(ROOT/'tests/_should_not_exist.png')],cwd=ROOT,capture_output=True,text=True)
 if r.returncode==0: errors.append('static exporter incorrectly accepts loading')
 if (ROOT/'tests/_should_not_exist.png').exists(): (ROOT/'tests/_should_not_exist.png').unlink()
+# Streaming animation exporter: every requested frame reaches the file and peak RSS is reported.
+for fmt,enc in [('webp','full'),('gif','full'),('webp','delta'),('gif','delta')]:
+ out=ROOT/f'tests/_stream-check-{enc}.{fmt}'
+ try:
+  r=subprocess.run([sys.executable,str(ROOT/'tools/export_animation.py'),'--app','DataVault','--size','64','--frames','12','--format',fmt,'--encoder',enc,'--out',str(out)],cwd=ROOT,capture_output=True,text=True)
+  if r.returncode: errors.append(f'streaming {fmt}/{enc} export failed: '+r.stderr)
+  else:
+   with Image.open(out) as im: n=im.n_frames
+   if n!=12: errors.append(f'streaming {fmt}/{enc} export frame count {n}')
+   if 'peak RSS' not in r.stderr: errors.append(f'streaming {fmt}/{enc} export does not report peak RSS')
+ finally: out.unlink(missing_ok=True)
 
 
 for rel in ['registry/apps.json','tools/icon_pipeline.py','tools/generate_registry.py','tools/freev_registry.py','incoming/README.md','web/generated-apps.js']:
@@ -0,0 +1,202 @@
+from __future__ import annotations
+from pathlib import Path
+from PIL import Image,ImageFilter,GifImagePlugin
+import sys
+import numpy as np
+ROOT=Path(__file__).resolve().parents[1];sys.path.insert(0,str(ROOT/'tools'))
+from freev_render import render_icon,fill,THEMES
+from freev_kinds import ANIMATION_KINDS,compile_kind
+try:import resource
+except ImportError:resource=None  # Windows: pas de getrusage, le pic RSS n'est pas rapporté.
+
+FRAMES=30
+FRAME_MS=55
+
+def alpha(path):return Image.open(path).convert('RGBA').getchannel('A')
+def layer_masks(app,size):
+ ps=sorted((ROOT/'symbols'/'animation-layers'/app).glob('layer-*.png'))
+ return [alpha(p).resize((size,size),Image.Resampling.LANCZOS) for p in ps]
+def overlay(mask,color,opacity=235): return fill(mask,color,opacity)
+def transform_crop(layer,mask,scale=1.0,dx=0,dy=0,rotate=0):
+ bb=mask.getbbox()
+ if not bb:return layer
+ crop=layer.crop(bb);cx=(bb[0]+bb[2])//2;cy=(bb[1]+bb[3])//2
+ if scale!=1:
+  crop=crop.resize((max(1,int(crop.width*scale)),max(1,int(crop.height*scale))),Image.Resampling.LANCZOS)
+ if rotate:crop=crop.rotate(rotate,resample=Image.Resampling.BICUBIC,expand=True)
+ out=Image.new('RGBA',layer.size,(0,0,0,0));out.alpha_composite(crop,(int(cx-crop.width/2+dx),int(cy-crop.height/2+dy)));return out
+
+def base_frame(app,theme,style,size):
+ base=render_icon(app,theme,'dark',style,'default','none',size)
+ coverp=ROOT/'symbols'/'animation-cover'/f'{app}.png'
+ if coverp.exists() and style=='standard':
+  cm=alpha(coverp).resize((size,size),Image.Resampling.LANCZOS);base.alpha_composite(fill(cm,'#F7FBFF',255))
+ return base
+
+def frame_renderer(app,kind,theme='cyan',style='standard',size=256,frames=FRAMES):
+ """Prépare une animation (fond, masques, courbes précalculées par compile_kind) et renvoie render(i).
+
+ La préparation coûte plus que plusieurs trames : un export la fait une seule fois, même quand il
+ rend certaines trames en avance (échantillonnage de la palette GIF globale)."""
+ spec=ANIMATION_KINDS[kind];base=base_frame(app,theme,style,size);masks=layer_masks(app,size);color=THEMES[theme][1]
+ prog=compile_kind(kind,frames,len(masks));layers=[overlay(m,color,235) for m in masks]
+ edge=spec['reveal_from'];radius=max(1,size//110);moves=any(k in prog for k in ('scale','offset','rotate'))
+ def render(i):
+  f=base.copy()
+  for idx,(m,ol) in enumerate(zip(masks,layers)):
+   if 'alpha' in prog or edge:
+    a=ol.getchannel('A')
+    if 'alpha' in prog:a=a.point(prog['alpha_lut'][i,idx].tolist())
+    if edge=='bottom':a.paste(0,(0,0,size,int(size*(1-prog['reveal'][i,idx]))))
+    elif edge=='left':a.paste(0,(int(size*prog['reveal'][i,idx])+1,0,size,size))
+    ol=ol.copy();ol.putalpha(a)
+   if spec['blur']:ol=ol.filter(ImageFilter.GaussianBlur(radius))
+   if moves:
+    ol=transform_crop(ol,m,scale=float(prog['scale'][i,idx]) if 'scale' in prog else 1.0,dx=int(size*prog['offset'][i,idx]) if 'offset' in prog else 0,rotate=float(prog['rotate'][i,idx]) if 'rotate' in prog else 0)
+   f.alpha_composite(ol)
+  return f
+ return render
+
+def iter_frames(app,kind,theme='cyan',style='standard',size=256,frames=FRAMES,indices=None):
+ """Génère les images une à une : seule l'image courante est vivante en mémoire ; indices restreint le rendu."""
+ render=frame_renderer(app,kind,theme,style,size,frames)
+ for i in (range(frames) if indices is None else indices):yield render(i)
+
+class FrameStream(Image.Image):
+ """Image multi-trames paresseuse : l'encodeur WebP de Pillow tire chaque trame via seek().
+
+ Seules la trame courante et la première (Pillow revient à tell() en fin d'écriture)
+ restent en mémoire ; le reste vit compressé dans l'encodeur."""
+ def __init__(self,frames,count):
+  super().__init__();self._frames=iter(frames);self.n_frames=count;self.is_animated=count>1
+  self._first=next(self._frames);self._index=0;self._show(self._first)
+ def _show(self,frame):self.im=frame.im;self._mode=frame.mode;self._size=frame.size
+ def tell(self):return self._index
+ def seek(self,frame):
+  if frame==self._index:return
+  if frame==0:self._index=0;self._show(self._first);return
+  if frame!=self._index+1 or frame>=self.n_frames:raise EOFError('FrameStream only seeks forward, one frame at a time')
+  self._index=frame;self._show(next(self._frames))
+
+def write_webp(frames,count,out,duration=FRAME_MS,quality=93,method=4,delta=False):
+ """delta=True laisse libwebp ne coder que le rectangle modifié de chaque trame, sans trame clé intermédiaire."""
+ extra={'minimize_size':True} if delta else {}
+ FrameStream(frames,count).save(out,'WEBP',save_all=True,duration=duration,loop=0,quality=quality,method=method,**extra)
+
+def gif_frame(frame):
+ """RGBA -> palette adaptative propre à la trame, comme le ferait Pillow ; renvoie (image P, index transparent)."""
+ p=frame.convert('P',palette=Image.Palette.ADAPTIVE);transparency=None
+ if p.palette.mode=='RGBA':
+  transparency=next((i for rgba,i in p.palette.colors.items() if rgba[3]==0),None)
+  p.putpalette(p.getpalette('RGB'))
+ return p,transparency
+
+def trim_palette(p,tr):
+ """Ne garde que les couleurs utilisées (comme optimize de Pillow) : la table de couleurs rapetisse avec elles."""
+ used=np.flatnonzero(np.bincount(np.asarray(p).ravel(),minlength=256)).tolist()
+ return p.remap_palette(used),(used.index(tr) if tr in used else None)
+
+def write_gif(frames,out,duration=FRAME_MS):
+ """Écrit le GIF au fil de l'eau : chaque trame est quantifiée, encodée puis libérée.
+
+ Comme save_all de Pillow, seule la dernière trame quantifiée est gardée : une trame identique
+ allonge sa durée au lieu d'être réécrite, sinon elle est recadrée sur ses pixels visibles
+ (disposal=2 efface ce rectangle avant la suivante). La première trame porte la palette globale."""
+ with open(out,'wb') as fp:
+  pending=None;first=True  # pending : (image P, index transparent, rendu RGBA, durée)
+  def flush(p,tr,shown,ms):
+   nonlocal first
+   box=(0,0)+p.size if first else shown.getchannel('A').getbbox() or (0,0,1,1)
+   p,tr=trim_palette(p.crop(box),tr);params={'duration':ms,'disposal':2,'include_color_table':not first}
+   if tr is not None:params['transparency']=tr
+   if first:
+    header,_=GifImagePlugin.getheader(p,None,{'loop':0,'duration':ms});first=False
+    for chunk in header:fp.write(chunk)
+   for chunk in GifImagePlugin.getdata(p,box[:2],**params):fp.write(chunk)
+  for f in frames:
+   p,tr=gif_frame(f);shown=p.copy()
+   if tr is not None:shown.info['transparency']=tr
+   shown=shown.convert('RGBA')
+   if pending and shown.tobytes()==pending[2].tobytes():pending=(*pending[:3],pending[3]+duration);continue
+   if pending:flush(*pending)
+   pending=(p,tr,shown,duration)
+  if pending:flush(*pending)
+  fp.write(b';')
+
+TRANSPARENT=255  # index réservé : la palette globale n'a que 255 couleurs
+
+def global_palette(frames,limit=1<<17):
+ """Palette adaptative commune (255 couleurs) calculée sur les pixels opaques d'un échantillon de trames."""
+ px=np.concatenate([a[a[...,3]>=128][:,:3] for a in (np.asarray(f) for f in frames)])
+ if len(px)>limit:px=px[::len(px)//limit+1]
+ if not len(px):px=np.zeros((1,3),np.uint8)
+ return Image.fromarray(px.reshape(1,-1,3)).quantize(255,method=Image.Quantize.MEDIANCUT)
+
+def palette_indices(frame,palette):
+ """RGBA -> tableau d'index dans la palette globale ; alpha < 128 devient TRANSPARENT."""
+ a=np.asarray(frame);idx=np.array(frame.convert('RGB').quantize(palette=palette,dither=Image.Dither.NONE))
+ idx[a[...,3]<128]=TRANSPARENT;return idx
+
+def dirty_box(mask):
+ """Rectangle englobant (x0,y0,x1,y1) des pixels vrais, ou None."""
+ rows=np.flatnonzero(mask.any(1))
+ if not len(rows):return None
+ cols=np.flatnonzero(mask.any(0));return (int(cols[0]),int(rows[0]),int(cols[-1])+1,int(rows[-1])+1)
+def union_box(a,b):return (min(a[0],b[0]),min(a[1],b[1]),max(a[2],b[2]),max(a[3],b[3]))
+
+def write_gif_delta(frames,out,palette,duration=FRAME_MS):
+ """GIF en trames partielles sur une palette globale : seul le rectangle modifié depuis la trame
+ précédente est écrit, les pixels inchangés y deviennent transparents (disposal=1).
+
+ Une trame reste en attente le temps de voir la suivante : si celle-ci doit rendre transparents
+ des pixels opaques, la trame en attente est réécrite sur un rectangle couvrant aussi ces pixels (des
+ trames plus anciennes ont pu les peindre hors de son propre rectangle) et passe en disposal=2 ; la
+ suivante réécrit tout le rectangle effacé. L'index TRANSPARENT signifie « ne pas peindre », jamais « effacer »."""
+ pal=palette.getpalette('RGB')[:3*TRANSPARENT];pal+=[0]*(768-len(pal))
+ def pimage(a):im=Image.frombytes('P',(a.shape[1],a.shape[0]),np.ascontiguousarray(a).tobytes());im.putpalette(pal);return im
+ with open(out,'wb') as fp:
+  def flush(box,sub,disposal):
+   for chunk in GifImagePlugin.getdata(pimage(sub),box[:2],duration=duration,disposal=disposal,transparency=TRANSPARENT):fp.write(chunk)
+  first=prev=pending=None
+  for f in frames:
+   idx=palette_indices(f,palette)
+   if prev is None:
+    first=idx;header,_=GifImagePlugin.getheader(pimage(idx),None,{'loop':0,'duration':duration})
+    for chunk in header:fp.write(chunk)
+    pending=((0,0,idx.shape[1],idx.shape[0]),idx)
+   else:
+    changed=idx!=prev;box=dirty_box(changed) or (0,0,1,1)
+    clear=dirty_box((idx==TRANSPARENT)&(prev!=TRANSPARENT))
+    if clear:
+     # La trame en attente est prev : la repeindre entière sur la zone à effacer ne change pas l'affichage.
+     erase=union_box(pending[0],clear);flush(erase,prev[erase[1]:erase[3],erase[0]:erase[2]],2)
+     box=union_box(box,erase);sub=idx[box[1]:box[3],box[0]:box[2]]
+    else:
+     flush(*pending,1);sub=idx[box[1]:box[3],box[0]:box[2]].copy();sub[~changed[box[1]:box[3],box[0]:box[2]]]=TRANSPARENT
+    pending=(box,sub)
+   prev=idx
+  if pending:
+   # Au bouclage la première trame est redessinée en entier : on efface d'abord ce qu'elle laisse transparent.
+   clear=dirty_box((first==TRANSPARENT)&(prev!=TRANSPARENT))
+   if clear:box=union_box(pending[0],clear);flush(box,prev[box[1]:box[3],box[0]:box[2]],2)
+   else:flush(*pending,1)
+  fp.write(b';')
+
+ENCODERS=('full','delta')
+def export(app,kind,out,fmt='webp',encoder='full',theme='cyan',style='standard',size=256,frames=FRAMES,duration=FRAME_MS):
+ """Rend et encode une animation en flux ; encoder='delta' n'écrit que les rectangles modifiés."""
+ render=frame_renderer(app,kind,theme,style,size,frames)
+ if fmt=='gif' and encoder=='delta':
+  # Les trames d'échantillon servent à la palette puis sont réutilisées telles quelles par le flux.
+  sample={i:render(i) for i in range(0,frames,max(1,frames//4))};palette=global_palette(sample.values())
+  write_gif_delta((sample.pop(i) if i in sample else render(i) for i in range(frames)),out,palette,duration)
+  return
+ stream=(render(i) for i in range(frames))
+ if fmt=='webp':write_webp(stream,frames,out,duration,delta=encoder=='delta')
+ else:write_gif(stream,out,duration)
+
+def peak_rss_mb():
+ """Pic de mémoire résidente du processus (Mo), ou None si la plateforme ne l'expose pas."""
+ if resource is None:return None
+ peak=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+ return peak/1024/1024 if sys.platform=='darwin' else peak/1024
@@ -0,0 +1,60 @@
+from __future__ import annotations
+from functools import lru_cache
+import math,re
+import numpy as np
+
+# Types d'animation : chaque type déclare ses courbes une fois pour toutes, le moteur
+# (freev_animation.iter_frames) les évalue d'un bloc pour toutes les trames et couches.
+ANIMATION_KINDS={}
+KIND_RE=re.compile(r'^[a-z][a-z0-9]*(-[a-z0-9]+)*$')
+REVEAL_EDGES={'bottom','left'}
+CURVES=('alpha','scale','offset','rotate','reveal')
+
+def wave(x):return .5+.5*np.sin(x)
+
+def register_kind(name,*,alpha=None,scale=None,offset=None,rotate=None,reveal=None,reveal_from=None,blur=False):
+ """Enregistre un type d'animation.
+
+ Chaque courbe est une fonction numpy (t, couche) -> valeurs, avec t la phase (trames, 1) dans [0, 2π[ et
+ couche l'index (1, couches). alpha : opacité 0-235 de l'overlay ; scale : facteur ; offset : décalage
+ horizontal en fraction de la taille ; rotate : degrés ; reveal : fraction visible depuis reveal_from."""
+ if not KIND_RE.fullmatch(name):raise ValueError(f'Invalid animation kind name: {name!r}')
+ if name in ANIMATION_KINDS:raise ValueError(f'Duplicate animation kind: {name}')
+ curves={k:v for k,v in zip(CURVES,(alpha,scale,offset,rotate,reveal)) if v is not None}
+ if not curves:raise ValueError(f'Animation kind {name} declares no curve')
+ for k,v in curves.items():
+  if not callable(v):raise ValueError(f'Curve {k} of {name} must be callable')
+ if (reveal is None)!=(reveal_from is None) or (reveal_from is not None and reveal_from not in REVEAL_EDGES):raise ValueError(f'Animation kind {name} needs reveal and reveal_from together ({"/".join(sorted(REVEAL_EDGES))})')
+ ANIMATION_KINDS[name]={'curves':curves,'reveal_from':reveal_from,'blur':bool(blur)}
+ compile_kind.cache_clear()
+ return name
+
+@lru_cache(maxsize=None)
+def compile_kind(name,frames,layers):
+ """Programme d'un type : tableaux (trames, couches) de chaque courbe, tables alpha (trames, couches, 256) précalculées."""
+ spec=ANIMATION_KINDS[name];t=(np.arange(frames)/frames*2*math.pi)[:,None];layer=np.arange(layers)[None,:];prog={}
+ for k,fn in spec['curves'].items():
+  v=np.broadcast_to(np.asarray(fn(t,layer),dtype=float),(frames,layers))
+  if not np.isfinite(v).all():raise ValueError(f'Curve {k} of {name} is not finite')
+  prog[k]=v
+ if 'alpha' in prog:
+  aa=prog['alpha'].astype(int)
+  if aa.min()<0 or aa.max()>255:raise ValueError(f'Curve alpha of {name} leaves 0-255')
+  prog['alpha']=aa;prog['alpha_lut']=(np.arange(256)*aa[...,None]/235).astype(int).clip(0,255)
+ if 'scale' in prog and prog['scale'].min()<=0:raise ValueError(f'Curve scale of {name} must stay positive')
+ if 'reveal' in prog and (prog['reveal'].min()<0 or prog['reveal'].max()>1):raise ValueError(f'Curve reveal of {name} leaves 0-1')
+ for v in prog.values():v.flags.writeable=False
+ return prog
+
+def validate_kinds(frames=30,layers=3):
+ """Évalue chaque type enregistré : une courbe invalide est refusée dès load_registry()."""
+ for name in ANIMATION_KINDS:compile_kind(name,frames,layers)
+
+register_kind('glow-code',alpha=lambda t,l:115+120*wave(t),blur=True)
+register_kind('pulse-play',scale=lambda t,l:1+.10*wave(t))
+register_kind('flow-cards',alpha=lambda t,l:55+180*wave(t-l*.9))
+register_kind('draw-pencil',reveal=lambda t,l:.15+.85*wave(t-math.pi/2),reveal_from='bottom')
+register_kind('lock-vault',rotate=lambda t,l:t*(180/math.pi))
+register_kind('convert-swap',offset=lambda t,l:np.where(l==0,1,-1)*.035*np.sin(t))
+register_kind('pixel-spark',alpha=lambda t,l:50+185*wave(t+np.where(l>0,math.pi,0)))
+register_kind('resume-reveal',reveal=lambda t,l:.08+.92*wave(t-math.pi/2),reveal_from='left')
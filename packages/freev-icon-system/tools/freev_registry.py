@@ -1,9 +1,9 @@
 from __future__ import annotations
 from pathlib import Path
 import json,re
+from freev_kinds import ANIMATION_KINDS,validate_kinds
 ROOT=Path(__file__).resolve().parents[1]
 REGISTRY_PATH=ROOT/'registry/apps.json'
-SUPPORTED_ANIMATIONS={'glow-code','pulse-play','flow-cards','draw-pencil','lock-vault','convert-swap','pixel-spark','resume-reveal'}
 ID_RE=re.compile(r'^[A-Za-z][A-Za-z0-9_]{1,63}$')
 
 def validate_label(value, field='label', max_length=80):
@@ -22,6 +22,7 @@ def script_safe_json(value, **kwargs):
 def load_registry():
     data=json.loads(REGISTRY_PATH.read_text(encoding='utf-8'))
     if data.get('schema')!=1: raise ValueError('Unsupported FREEV registry schema')
+    validate_kinds()
     ids=set()
     for app in data.get('apps',[]):
         aid=app.get('id','')
@@ -30,7 +31,7 @@ def load_registry():
         ids.add(aid)
         validate_label(app.get('label'),f'label for {aid}')
         if app.get('kind') not in {'software','game'}: raise ValueError(f'Invalid kind for {aid}')
-        if app.get('animation') not in SUPPORTED_ANIMATIONS: raise ValueError(f'Unsupported animation for {aid}')
+        if app.get('animation') not in ANIMATION_KINDS: raise ValueError(f'Unsupported animation for {aid}')
         if not isinstance(app.get('animationLayers'),int) or app['animationLayers']<1: raise ValueError(f'Invalid animationLayers for {aid}')
     if data.get('defaultApp') not in ids: raise ValueError('defaultApp must exist in registry')
     return data
@@ -5,7 +5,7 @@ from PIL import Image,ImageFilter,ImageDraw,ImageOps,ImageEnhance
 import argparse,sys,json,re,shutil,time,hashlib,subprocess,unicodedata
 import numpy as np
 ROOT=Path(__file__).resolve().parents[1];sys.path.insert(0,str(ROOT/'tools'))
-from freev_registry import load_registry,REGISTRY_PATH,SUPPORTED_ANIMATIONS,ID_RE,validate_label
+from freev_registry import load_registry,REGISTRY_PATH,ANIMATION_KINDS,ID_RE,validate_label
 from freev_render import THEMES,render_icon,grad,fill
 
 THEME_NAMES=list(THEMES)
@@ -198,7 +198,7 @@ def read_meta(img):
  aid=m.get('id') or safe_id(img.stem);label=validate_label(m.get('label') or human_label(img.stem));kind=m.get('kind','software');anim=m.get('animation','pulse-play');short=validate_label(m.get('shortName') or label,'shortName',40)
  if not ID_RE.fullmatch(aid):raise RuntimeError(f'invalid id {aid!r}')
  if kind not in {'software','game'}:raise RuntimeError('kind must be software or game')
- if anim not in SUPPORTED_ANIMATIONS:raise RuntimeError(f'unsupported animation {anim}')
+ if anim not in ANIMATION_KINDS:raise RuntimeError(f'unsupported animation {anim}')
  return p,m,{'id':aid,'label':label,'kind':kind,'shortName':short[:12],'animation':anim,'animationLayers':1,'animationCover':True,'reconstructAnimationSymbol':True}
 
 def register(entry):
@@ -278,7 +278,7 @@ def main():
  ap=argparse.ArgumentParser(description='FREEV mandatory automatic icon onboarding system');sub=ap.add_subparsers(dest='cmd',required=True)
  s=sub.add_parser('sync');s.add_argument('--enforce',action='store_true',help='fail if anything remains incomplete')
  c=sub.add_parser('check')
- a=sub.add_parser('add');a.add_argument('source');a.add_argument('--id');a.add_argument('--label');a.add_argument('--kind',choices=['software','game'],default='software');a.add_argument('--animation',choices=sorted(SUPPORTED_ANIMATIONS),default='pulse-play');a.add_argument('--short-name')
+ a=sub.add_parser('add');a.add_argument('source');a.add_argument('--id');a.add_argument('--label');a.add_argument('--kind',choices=['software','game'],default='software');a.add_argument('--animation',choices=sorted(ANIMATION_KINDS),default='pulse-play');a.add_argument('--short-name')
  w=sub.add_parser('watch');w.add_argument('--interval',type=float,default=1.5)
  args=ap.parse_args()
  if args.cmd=='sync':sync(args.enforce)
@@ -14,20 +14,59 @@ import os
 import subprocess
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from collections import Counter
+from collections import Counter, deque
 import math
 import base64
 import threading
 import secrets
 import socket  # Pour scanner de ports local et IP locale
+import asyncio  # Scanner de ports concurrent
+import ipaddress
 import calendar  # Pour la nouvelle fonctionnalité de calendrier
+import csv  # Export des tableaux d'amortissement
 import difflib  # Pour la nouvelle fonctionnalité de comparaison de fichiers
+import codecs  # Décodage incrémental (analyse de fichiers en flux)
+import hashlib  # Empreintes de fichiers (comparaison rapide)
+import tempfile
+import shutil
+import struct  # Enregistrements binaires de taille fixe (métriques)
+import unicodedata
+import fnmatch  # Motifs d'exclusion de l'explorateur
+import queue
+import sqlite3  # Index de recherche plein texte
+from functools import lru_cache
+from itertools import permutations, product
+from bisect import bisect_left
+from heapq import heappush, heapreplace, nlargest
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, localcontext, MAX_EMAX, ROUND_FLOOR
+from fractions import Fraction
 
 try:
     import psutil
 except ImportError:
     psutil = None  # Pour mini-logs systèmes, optionnel
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Verrou du fichier de métriques, indisponible sous Windows
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None  # Verrou du fichier de métriques sous Windows uniquement
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+except ImportError:
+    ZoneInfo = None  # Python < 3.9 : horloge mondiale indisponible
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Calculs vectorisés (racines de polynômes...), optionnel : repli en pur Python
+
 class Colors:
     """Codes ANSI pour les couleurs"""
     RESET = '\033[0m'
@@ -54,6 +93,3889 @@ class Colors:
     BRIGHT_CYAN = '\033[96m'
     BRIGHT_WHITE = '\033[97m'
 
+# --- Benchmarks (python freev1.py --bench [nom ...]) ---
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Enregistre une fonction de mesure lancée par --bench"""
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+def timed(fn, *args, repeat=1):
+    """Meilleur temps (secondes) sur `repeat` exécutions, et le dernier résultat"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run_benchmarks(names):
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        print(f"Benchmarks inconnus : {', '.join(unknown)}. Disponibles : {', '.join(BENCHMARKS)}")
+        return 2
+    for name in names or list(BENCHMARKS):
+        print(f"{Colors.BOLD}== {name} =={Colors.RESET}")
+        BENCHMARKS[name]()
+    return 0
+
+# --- Fin des benchmarks ---
+
+# --- Évaluateur d'expressions sûr (tokenizer + parseur de Pratt) ---
+
+class ExpressionError(ValueError):
+    """Expression invalide ou résultat hors des limites autorisées"""
+
+EXPR_MAX_LENGTH = 300       # Caractères acceptés par expression
+EXPR_MAX_BITS = 1 << 17     # ~39 000 chiffres : au-delà, un entier est refusé
+EXPR_MAX_FACTORIAL = 5000
+EXPR_CONSTANTS = {'pi': math.pi, 'e': math.e, 'tau': math.tau}
+# Trigonométrie en degrés, comme l'ancienne table de regex
+EXPR_FUNCTIONS = {
+    'sqrt': math.sqrt, 'racine': math.sqrt,
+    'sin': lambda a: math.sin(math.radians(a)),
+    'cos': lambda a: math.cos(math.radians(a)),
+    'tan': lambda a: math.tan(math.radians(a)),
+    'log': math.log10, 'ln': math.log, 'exp': math.exp,
+    'abs': abs, 'factorial': None, 'factorielle': None,  # factorielle : voir _expr_factorial
+}
+_EXPR_TOKEN = re.compile(r'\s*(?:(\d+(?:[.,]\d+)?(?:[eE][+-]?\d+)?|[.,]\d+)|(\*\*|//|[-+*/%^!()=])|([A-Za-z_]\w*))')
+_EXPR_BINDING = {'+': 10, '-': 10, '*': 20, '/': 20, '//': 20, '%': 20, '^': 40, '**': 40, '!': 50}
+
+def tokenize_expression(text):
+    """Découpe une expression en jetons (type, valeur) ; ExpressionError si un caractère est inconnu"""
+    tokens, pos, text = [], 0, text.rstrip()
+    while pos < len(text):
+        m = _EXPR_TOKEN.match(text, pos)
+        if not m or m.end() == pos:
+            raise ExpressionError(f"caractère inattendu : {text[pos:].strip()[:1]!r}")
+        num, op, name = m.groups()
+        if num is not None:
+            num = num.replace(',', '.')
+            tokens.append(('num', float(num) if any(c in num for c in '.eE') else int(num)))
+        elif op is not None:
+            tokens.append(('op', op))
+        else:
+            tokens.append(('name', name.lower()))
+        pos = m.end()
+    return tokens
+
+class _PrattParser:
+    """Parseur de Pratt : produit un AST en tuples ('num'|'var'|'neg'|'bin'|'call'|'fact', ...)"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else ('end', None)
+
+    def advance(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def expect(self, value):
+        if self.advance() != ('op', value):
+            raise ExpressionError(f"'{value}' attendu")
+
+    def binding(self, token):
+        kind, value = token
+        if kind == 'op':
+            return _EXPR_BINDING.get(value, 0) if value != '(' else 20  # 2(3+4) : multiplication implicite
+        return 20 if kind == 'name' else 0  # 2pi, 3x
+
+    def parse(self, rbp=0):
+        left = self.prefix(self.advance())
+        while rbp < self.binding(self.peek()):
+            left = self.infix(left)
+        return left
+
+    def prefix(self, token):
+        kind, value = token
+        if kind == 'num':
+            return ('num', value)
+        if kind == 'name':
+            if value in EXPR_FUNCTIONS:
+                if self.peek() == ('op', '('):
+                    self.advance()
+                    arg = self.parse()
+                    self.expect(')')
+                else:
+                    arg = self.parse(35)  # sin 30, racine 16
+                return ('call', value, arg)
+            return ('var', value)
+        if value == '-':
+            return ('neg', self.parse(30))
+        if value == '+':
+            return self.parse(30)
+        if value == '(':
+            inner = self.parse()
+            self.expect(')')
+            return inner
+        raise ExpressionError("expression incomplète" if kind == 'end' else f"'{value}' inattendu")
+
+    def infix(self, left):
+        kind, value = self.peek()
+        if kind != 'op' or value == '(':
+            return ('bin', '*', left, self.parse(20))
+        self.advance()
+        if value == '!':
+            return ('fact', left)
+        if value in ('^', '**'):
+            return ('bin', '^', left, self.parse(39))  # associativité à droite : 2^3^2 = 2^9
+        return ('bin', value, left, self.parse(_EXPR_BINDING[value]))
+
+@lru_cache(maxsize=512)
+def parse_expression(text):
+    """Texte -> (variable assignée ou None, AST). Résultat mis en cache par texte."""
+    if len(text) > EXPR_MAX_LENGTH:
+        raise ExpressionError("expression trop longue")
+    tokens = tokenize_expression(text)
+    target = None
+    if len(tokens) > 2 and tokens[0][0] == 'name' and tokens[1] == ('op', '='):
+        target = tokens[0][1]
+        if target in EXPR_CONSTANTS or target in EXPR_FUNCTIONS:
+            raise ExpressionError(f"'{target}' est réservé")
+        tokens = tokens[2:]
+    if not tokens:
+        raise ExpressionError("expression vide")
+    parser = _PrattParser(tokens)
+    tree = parser.parse()
+    if parser.peek()[0] != 'end':
+        raise ExpressionError(f"'{parser.peek()[1]}' inattendu")
+    return target, tree
+
+def expression_names(tree):
+    """Noms de variables utilisés par un AST"""
+    if tree[0] == 'var':
+        return {tree[1]}
+    return set().union(*(expression_names(n) for n in tree[1:] if isinstance(n, tuple)))
+
+def _expr_check(value):
+    # Un flottant déborde en inf (1e300 * 1e300) au lieu de lever OverflowError : même refus que les entiers
+    if isinstance(value, int) and value.bit_length() > EXPR_MAX_BITS or isinstance(value, float) and not math.isfinite(value):
+        raise ExpressionError("résultat trop grand")
+    return value
+
+def _expr_factorial(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if not isinstance(value, int) or value < 0:
+        raise ExpressionError("factorielle d'un entier positif uniquement")
+    if value > EXPR_MAX_FACTORIAL:
+        raise ExpressionError(f"factorielle limitée à {EXPR_MAX_FACTORIAL}")
+    return math.factorial(value)
+
+def _expr_power(a, b):
+    if isinstance(a, int) and isinstance(b, int) and b >= 0:
+        # Taille estimée du résultat avant de calculer : 9^9^9 est refusé sans bloquer.
+        if abs(a) > 1 and b * math.log2(abs(a)) > EXPR_MAX_BITS:
+            raise ExpressionError("résultat trop grand")
+        return a ** b
+    try:
+        result = float(a) ** float(b)
+    except ZeroDivisionError:
+        raise ExpressionError("division par zéro")
+    if isinstance(result, complex):
+        raise ExpressionError("résultat complexe")
+    return result
+
+def evaluate_expression(tree, variables):
+    """Évalue un AST ; variables complète les constantes (pi, e, tau)"""
+    kind = tree[0]
+    if kind == 'num':
+        if isinstance(tree[1], float) and not math.isfinite(tree[1]):
+            raise ExpressionError("nombre trop grand")  # 1e400 : float() rend inf sans erreur
+        return tree[1]
+    if kind == 'var':
+        if tree[1] in variables:
+            return variables[tree[1]]
+        if tree[1] in EXPR_CONSTANTS:
+            return EXPR_CONSTANTS[tree[1]]
+        raise ExpressionError(f"variable inconnue : {tree[1]}")
+    if kind == 'neg':
+        return -evaluate_expression(tree[1], variables)
+    if kind == 'fact':
+        return _expr_factorial(evaluate_expression(tree[1], variables))
+    if kind == 'call':
+        arg = evaluate_expression(tree[2], variables)
+        if tree[1] in ('factorial', 'factorielle'):
+            return _expr_factorial(arg)
+        try:
+            return _expr_check(EXPR_FUNCTIONS[tree[1]](arg))
+        except (ValueError, OverflowError):
+            raise ExpressionError(f"{tree[1]}({arg}) hors domaine")
+    op, a, b = tree[1], evaluate_expression(tree[2], variables), evaluate_expression(tree[3], variables)
+    try:
+        if op == '+':
+            return _expr_check(a + b)
+        if op == '-':
+            return _expr_check(a - b)
+        if op == '*':
+            return _expr_check(a * b)
+        if op == '/':
+            return _expr_check(a / b)
+        if op == '//':
+            return _expr_check(a // b)
+        if op == '%':
+            return _expr_check(a % b)
+        return _expr_check(_expr_power(a, b))
+    except ZeroDivisionError:
+        raise ExpressionError("division par zéro")
+    except OverflowError:
+        raise ExpressionError("résultat trop grand")
+
+def format_number(value):
+    """Affichage compact : entiers exacts (ou notation scientifique s'ils sont immenses), flottants sur 15 chiffres"""
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < 1e15:
+            return str(int(value))
+        return f"{value:.15g}"
+    if value.bit_length() <= 332:
+        return str(value)
+    # str() d'un très grand entier est lent (et limité à 4300 chiffres) : on estime via les bits de tête.
+    shift = value.bit_length() - 64
+    exponent = math.log10(abs(value) >> shift) + shift * math.log10(2)
+    digits = int(exponent) + 1
+    return f"{'-' if value < 0 else ''}{10 ** (exponent - int(exponent)):.10f}e+{int(exponent)} ({digits} chiffres)"
+
+# --- Fin de l'évaluateur ---
+
+# --- Fibonacci : doublement rapide, cache, flux par blocs ---
+
+FIB_MAX_INDEX = 10 ** 7      # F(10^7) : 2 millions de chiffres, ~2 s
+FIB_MAX_TERMS = 20000        # Au-delà, un terme dépasse la limite d'affichage des entiers (4300 chiffres)
+FIB_CHUNK = 100              # Termes par bloc affiché
+
+@lru_cache(maxsize=256)
+def fibonacci_pair(n):
+    """(F(n), F(n+1)) par doublement rapide, O(log n) multiplications ; les paires intermédiaires restent en cache"""
+    if n == 0:
+        return (0, 1)
+    a, b = fibonacci_pair(n >> 1)
+    c = a * (2 * b - a)   # F(2k)
+    d = a * a + b * b     # F(2k+1)
+    return (d, c + d) if n & 1 else (c, d)
+
+def fibonacci(n):
+    return fibonacci_pair(n)[0]
+
+def fibonacci_mod(n, m):
+    """F(n) mod m sans jamais manipuler F(n) : valable pour n arbitrairement grand"""
+    a, b = 0, 1 % m
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a) % m
+        d = (a * a + b * b) % m
+        a, b = (d, (c + d) % m) if bit == '1' else (c, d)
+    return a
+
+def iter_fibonacci(count, start=0):
+    """Termes F(start) ... F(start+count-1), générés un à un"""
+    a, b = fibonacci_pair(start)
+    for _ in range(count):
+        yield a
+        a, b = b, a + b
+
+def digits_summary(value, k=10):
+    """(nombre de chiffres, k premiers, k derniers) d'un entier positif, sans str() sur l'entier entier"""
+    if value < 10 ** (2 * k):
+        text = str(value)
+        return len(text), text[:k], text[-k:]
+    shift = max(0, value.bit_length() - 3 * k - 64)
+    with localcontext() as ctx:
+        ctx.prec, ctx.Emax = 2 * k + 30, MAX_EMAX
+        approx = Decimal(value >> shift) * (Decimal(2) ** shift)
+        lead = approx.scaleb(k - 1 - approx.adjusted()).to_integral_value(rounding=ROUND_FLOOR)
+    return approx.adjusted() + 1, str(lead), str(value % 10 ** k).zfill(k)
+
+@benchmark('fibonacci')
+def bench_fibonacci():
+    def iterative(n):
+        a, b = 0, 1
+        for _ in range(n):
+            a, b = b, a + b
+        return a
+    for n in (10, 1000, 10 ** 4, 10 ** 5, 10 ** 6):
+        fibonacci_pair.cache_clear()
+        seconds, value = timed(fibonacci, n)
+        digits, lead, tail = digits_summary(value)
+        print(f"F({n}) : {seconds * 1000:9.2f} ms  {digits} chiffres  {lead}…{tail}")
+    fibonacci_pair.cache_clear()
+    fast, value = timed(fibonacci, 10 ** 5)
+    slow, reference = timed(iterative, 10 ** 5)
+    assert value == reference
+    print(f"F(100000) doublement rapide {fast * 1000:.2f} ms, boucle {slow * 1000:.2f} ms (x{slow / fast:.0f})")
+    seconds, value = timed(fibonacci_mod, 10 ** 18, 10 ** 9 + 7, repeat=5)
+    print(f"F(10^18) mod 1000000007 = {value} en {seconds * 1e6:.1f} µs")
+
+# --- Fin Fibonacci ---
+
+# --- Nombres premiers : Miller-Rabin, crible segmenté, rho de Pollard ---
+
+# Avec les 12 premières bases premières, Miller-Rabin est exact pour n < 3,1·10^23 (donc tout entier 64 bits) :
+# la borne est le plus petit pseudo-premier fort pour toutes ces bases
+MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+MR_DETERMINISTIC_LIMIT = 318665857834031151167461
+MR_EXTRA_ROUNDS = 16         # Bases aléatoires en plus au-delà : erreur < 4^-28
+PRIME_SEGMENT = 1 << 16      # Nombres par segment de crible
+PRIME_MAX_INTERVAL = 10 ** 7 # Largeur maximale de « premiers entre A et B »
+PRIME_MAX_NTH = 10 ** 6      # p(10^6) = 15 485 863
+PRIME_MAX_DIGITS = 60        # Factorisation : au-delà, le rho de Pollard devient trop lent
+PRIME_FACTOR_BUDGET = 2.0    # Secondes de rho de Pollard avant de rendre un cofacteur composite
+
+@lru_cache(maxsize=8)
+def base_primes(limit):
+    """Premiers <= limit, crible d'Ératosthène sur bytearray (1 octet par nombre), mis en cache"""
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[:2] = b'\x00\x00'
+    for p in range(2, math.isqrt(limit) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, limit + 1, p)))
+    return tuple(i for i, flag in enumerate(sieve) if flag)
+
+SMALL_PRIMES = base_primes(1000)
+
+@lru_cache(maxsize=64)
+def sieve_segment(low, high):
+    """Drapeaux de primalité de [low, high[ : seuls les premiers <= √high sont nécessaires"""
+    segment = bytearray([1]) * (high - low)
+    for p in base_primes(math.isqrt(high - 1)):
+        start = max(p * p, (low + p - 1) // p * p)
+        if start < high:
+            segment[start - low::p] = bytes(len(range(start, high, p)))
+    for n in range(low, min(high, 2)):
+        segment[n - low] = 0
+    return bytes(segment)
+
+def iter_primes(low, high):
+    """Premiers de [low, high], segment par segment (mémoire bornée par PRIME_SEGMENT)"""
+    low = max(low, 0)
+    for start in range(low - low % PRIME_SEGMENT, high + 1, PRIME_SEGMENT):
+        flags = sieve_segment(start, start + PRIME_SEGMENT)
+        for offset in range(max(low - start, 0), min(high + 1 - start, PRIME_SEGMENT)):
+            if flags[offset]:
+                yield start + offset
+
+def count_primes(low, high):
+    total = 0
+    for start in range(low - low % PRIME_SEGMENT, high + 1, PRIME_SEGMENT):
+        flags = sieve_segment(start, start + PRIME_SEGMENT)
+        total += flags.count(1, max(low - start, 0), min(high + 1 - start, PRIME_SEGMENT))
+    return total
+
+def _miller_rabin(n, d, r, a):
+    """Vrai si n passe le test pour la base a (n - 1 = d·2^r)"""
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(r - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+def is_prime(n):
+    """Primalité : exacte jusqu'à MR_DETERMINISTIC_LIMIT, probabiliste (erreur < 4^-28) au-delà"""
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < 1000 * 1000:
+        return True
+    d, r = n - 1, 0
+    while not d & 1:
+        d, r = d >> 1, r + 1
+    bases = list(MR_BASES)
+    if n >= MR_DETERMINISTIC_LIMIT:
+        bases += [secrets.randbelow(n - 3) + 2 for _ in range(MR_EXTRA_ROUNDS)]
+    return all(_miller_rabin(n, d, r, a) for a in bases)
+
+def _pollard_rho(n, deadline=None):
+    """Un facteur non trivial de n composé impair (variante de Brent, produits groupés par 128), None une fois deadline passée"""
+    while True:
+        y, c, m = secrets.randbelow(n - 1) + 1, secrets.randbelow(n - 1) + 1, 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                if deadline is not None and time.monotonic() > deadline:
+                    return None
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            # Produit groupé trop grossier : on reprend pas à pas depuis ys
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+def factorize(n, budget=PRIME_FACTOR_BUDGET):
+    """({premier: exposant}, cofacteurs composites) : petits premiers par division, le reste par rho de Pollard
+    tant que le budget (secondes, None = illimité) le permet ; les cofacteurs restants ne sont pas décomposés"""
+    deadline = None if budget is None else time.monotonic() + budget
+    factors, cofactors = Counter(), []
+    for p in SMALL_PRIMES:
+        while n % p == 0:
+            factors[p] += 1
+            n //= p
+    pending = [n] if n > 1 else []
+    while pending:
+        m = pending.pop()
+        if is_prime(m):
+            factors[m] += 1
+            continue
+        root = math.isqrt(m)
+        if root * root == m:
+            pending += [root, root]
+            continue
+        d = _pollard_rho(m, deadline)
+        if d is None:
+            cofactors.append(m)
+            continue
+        pending += [d, m // d]
+    return dict(sorted(factors.items())), sorted(cofactors)
+
+def nth_prime(n):
+    """n-ième premier : crible segmenté jusqu'à la borne n(ln n + ln ln n), comptage par segment"""
+    if n < 6:
+        return (2, 3, 5, 7, 11)[n - 1]
+    bound = int(n * (math.log(n) + math.log(math.log(n)))) + 1
+    seen = 0
+    for start in range(0, bound + 1, PRIME_SEGMENT):
+        flags = sieve_segment(start, start + PRIME_SEGMENT)
+        found = flags.count(1)
+        if seen + found >= n:
+            for offset, flag in enumerate(flags):
+                seen += flag
+                if seen == n:
+                    return start + offset
+        seen += found
+    raise ValueError(n)  # Impossible : la borne de Rosser tient pour n >= 6
+
+def format_factors(factors):
+    return ' × '.join(f"{p}^{e}" if e > 1 else str(p) for p, e in factors.items())
+
+@benchmark('premiers')
+def bench_primes():
+    samples = [
+        18446744073709551557,          # Plus grand premier 64 bits
+        99999999999999999989,          # Premier à 20 chiffres
+        10000000000000000000,          # 2^19 · 5^19
+        12345678901234567891,
+        (2 ** 31 - 1) * (2 ** 61 - 1),  # Semi-premier de 92 bits
+        10 ** 30 + 57,
+    ]
+    for n in samples:
+        seconds, prime = timed(is_prime, n, repeat=5)
+        print(f"premier {n} : {'oui' if prime else 'non'} en {seconds * 1e6:.0f} µs")
+    for n in samples[1:5]:
+        seconds, (factors, _) = timed(factorize, n)
+        print(f"facteurs {n} = {format_factors(factors)} en {seconds * 1000:.2f} ms")
+    sieve_segment.cache_clear()
+    seconds, value = timed(nth_prime, PRIME_MAX_NTH)
+    print(f"{PRIME_MAX_NTH}e premier = {value} en {seconds * 1000:.0f} ms")
+    seconds, value = timed(count_primes, 10 ** 12, 10 ** 12 + 10 ** 6)
+    print(f"{value} premiers entre 10^12 et 10^12 + 10^6 en {seconds * 1000:.0f} ms")
+
+# --- Fin des nombres premiers ---
+
+# --- Équations : polynômes à une inconnue, systèmes linéaires 2×2 / 3×3 ---
+
+POLY_MAX_DEGREE = 40
+ROOT_MULTIPLICITY = {2: 'double', 3: 'triple', 4: 'quadruple'}
+SYSTEM_MAX_SIZE = 3
+# Séparateurs d'équations d'un système : « ; », « et », ou une virgule qui n'est pas décimale (2,5x)
+_EQ_SPLIT = re.compile(r'\s*(?:;|,(?!\d)|(?<!\d),|\bet\b)\s*', re.IGNORECASE)
+
+def _as_fraction(value):
+    # repr d'un flottant : 0.1 devient 1/10 et non 3602879701896397/36028797018963968
+    return Fraction(value) if isinstance(value, int) else Fraction(repr(value))
+
+def _poly_trim(p):
+    while len(p) > 1 and p[-1] == 0:
+        p = p[:-1]
+    return p
+
+def _poly_mul(p, q):
+    out = [Fraction(0)] * (len(p) + len(q) - 1)
+    for i, a in enumerate(p):
+        if a:
+            for j, b in enumerate(q):
+                out[i + j] += a * b
+    return _poly_trim(out)
+
+def _poly_add(p, q, sign=1):
+    out = [Fraction(0)] * max(len(p), len(q))
+    for i, a in enumerate(p):
+        out[i] += a
+    for i, b in enumerate(q):
+        out[i] += sign * b
+    return _poly_trim(out)
+
+def _poly_derivative(p):
+    return _poly_trim([i * c for i, c in enumerate(p)][1:] or [Fraction(0)])
+
+def _poly_divmod(p, q):
+    """Division euclidienne exacte : (quotient, reste)"""
+    p, out = list(p), [Fraction(0)] * max(len(p) - len(q) + 1, 1)
+    for i in range(len(p) - len(q), -1, -1):
+        out[i] = factor = p[i + len(q) - 1] / q[-1]
+        if factor:
+            for j, c in enumerate(q):
+                p[i + j] -= factor * c
+    return _poly_trim(out), _poly_trim(p[:len(q) - 1] or [Fraction(0)])
+
+def _poly_gcd(p, q):
+    """PGCD unitaire par l'algorithme d'Euclide, exact en Fraction"""
+    while any(q):
+        p, q = q, _poly_divmod(p, q)[1]
+    return [c / p[-1] for c in p]
+
+_GCD_PRIME = (1 << 61) - 1
+
+def _coprime_derivative_mod(p):
+    """Vrai si PGCD(p, p') = 1 modulo un grand premier, ce qui le prouve sur Q (coefficient dominant non divisible)
+
+    Euclide modulaire sur des entiers : bien moins cher que les Fraction, et c'est le cas de presque toute équation."""
+    scale = math.lcm(*(c.denominator for c in p))
+    f = [int(c * scale) % _GCD_PRIME for c in p]
+    if not f[-1]:
+        return False
+    g = [i * c % _GCD_PRIME for i, c in enumerate(f)][1:]
+    while True:
+        while g and not g[-1]:
+            g.pop()
+        if len(g) <= 1:
+            return bool(g) or len(f) == 1  # Reste constant non nul : premiers entre eux ; reste nul : PGCD = f
+        inverse = pow(g[-1], -1, _GCD_PRIME)
+        while len(f) >= len(g):
+            factor, shift = f[-1] * inverse % _GCD_PRIME, len(f) - len(g)
+            f = [(x - factor * g[i - shift]) % _GCD_PRIME if i >= shift else x for i, x in enumerate(f)][:-1]
+            while f and not f[-1]:
+                f.pop()
+        f, g = g, f
+
+def _square_free(p):
+    """Décomposition sans facteur carré (Yun) : [(facteur à racines simples, multiplicité)]"""
+    if _coprime_derivative_mod(p):
+        return [(p, 1)]  # Cas courant : aucune racine multiple
+    derivative = _poly_derivative(p)
+    common = _poly_gcd(p, derivative)
+    b, c = _poly_divmod(p, common)[0], _poly_divmod(derivative, common)[0]
+    d = _poly_add(c, _poly_derivative(b), -1)
+    factors, multiplicity = [], 1
+    while len(b) > 1:
+        common = _poly_gcd(b, d)
+        if len(common) > 1:
+            factors.append((common, multiplicity))
+        b, c = _poly_divmod(b, common)[0], _poly_divmod(d, common)[0]
+        d = _poly_add(c, _poly_derivative(b), -1)
+        multiplicity += 1
+    return factors
+
+def polynomial_from_tree(tree, var):
+    """AST -> coefficients exacts (Fraction) du degré 0 au degré n, en l'inconnue var"""
+    kind = tree[0]
+    if kind == 'num':
+        return [_as_fraction(evaluate_expression(tree, {}))]  # refuse 1e400 comme le calcul
+    if kind == 'var':
+        if tree[1] == var:
+            return [Fraction(0), Fraction(1)]
+        return [_as_fraction(evaluate_expression(tree, {}))]
+    if kind == 'neg':
+        return [-c for c in polynomial_from_tree(tree[1], var)]
+    if kind in ('call', 'fact'):
+        if var in expression_names(tree):
+            raise ExpressionError(f"{var} ne peut pas apparaître dans une fonction")
+        return [_as_fraction(evaluate_expression(tree, {}))]
+    op, a, b = tree[1], polynomial_from_tree(tree[2], var), polynomial_from_tree(tree[3], var)
+    if op in ('+', '-'):
+        return _poly_add(a, b, 1 if op == '+' else -1)
+    if op == '*':
+        return _poly_mul(a, b)
+    if len(b) > 1:
+        raise ExpressionError(f"{var} au dénominateur ou en exposant : ce n'est pas un polynôme")
+    if op == '/':
+        if b[0] == 0:
+            raise ExpressionError("division par zéro")
+        return [c / b[0] for c in a]
+    if op != '^':
+        raise ExpressionError(f"opérateur {op} non supporté dans une équation")
+    if b[0].denominator != 1 or not 0 <= b[0] <= POLY_MAX_DEGREE:
+        if len(a) == 1:
+            return [_as_fraction(_expr_power(float(a[0]), float(b[0])))]
+        raise ExpressionError(f"exposant entier entre 0 et {POLY_MAX_DEGREE} requis")
+    if (len(a) - 1) * int(b[0]) > POLY_MAX_DEGREE:
+        raise ExpressionError(f"degré limité à {POLY_MAX_DEGREE}")
+    out = [Fraction(1)]
+    for _ in range(int(b[0])):
+        out = _poly_mul(out, a)
+    return out
+
+def _split_equation(text):
+    """'gauche = droite' -> deux AST (« = 0 » implicite sans signe égal)"""
+    tokens = tokenize_expression(text)
+    if tokens.count(('op', '=')) > 1:
+        raise ExpressionError("un seul signe = par équation")
+    cut = tokens.index(('op', '=')) if ('op', '=') in tokens else len(tokens)
+    sides = []
+    for part in (tokens[:cut], tokens[cut + 1:] or [('num', 0)]):
+        if not part:
+            raise ExpressionError("membre vide")
+        parser = _PrattParser(part)
+        sides.append(parser.parse())
+        if parser.peek()[0] != 'end':
+            raise ExpressionError(f"'{parser.peek()[1]}' inattendu")
+    return sides
+
+def _unknowns(trees):
+    return sorted(set().union(*map(expression_names, trees)) - set(EXPR_CONSTANTS))
+
+def _companion_roots(coeffs):
+    """Valeurs propres de la matrice compagnon (numpy) : toutes les racines d'un coup"""
+    n = len(coeffs) - 1
+    companion = np.zeros((n, n))
+    companion[0, :] = [-float(c / coeffs[-1]) for c in reversed(coeffs[:-1])]
+    companion[1:, :-1] = np.eye(n - 1)
+    return [complex(r) for r in np.linalg.eigvals(companion)]
+
+def _durand_kerner(coeffs, iterations=500):
+    """Durand-Kerner en pur Python : toutes les racines raffinées simultanément"""
+    monic = [complex(c / coeffs[-1]) for c in coeffs]
+    n = len(monic) - 1
+    radius = 1 + max(abs(c) for c in monic[:-1])
+    roots = [radius * complex(math.cos(2 * math.pi * k / n + 0.4), math.sin(2 * math.pi * k / n + 0.4)) for k in range(n)]
+    def value(z):
+        acc = 0j
+        for c in reversed(monic):
+            acc = acc * z + c
+        return acc
+    for _ in range(iterations):
+        delta = 0.0
+        for i, z in enumerate(roots):
+            denominator = 1
+            for j, w in enumerate(roots):
+                if i != j:
+                    denominator *= z - w
+            step = value(z) / denominator if denominator else 1e-12
+            roots[i] = z - step
+            delta = max(delta, abs(step))
+        if delta < 1e-14 * radius:
+            break
+    return roots
+
+def _polish(coeffs, z):
+    """Deux pas de Newton en flottant, puis partie imaginaire négligeable ramenée à 0"""
+    c = [complex(x) for x in coeffs]
+    for _ in range(2):
+        p, dp = 0j, 0j
+        for a in reversed(c):
+            dp = dp * z + p
+            p = p * z + a
+        if dp == 0:
+            break
+        z -= p / dp
+    if abs(z.imag) <= 1e-9 * max(1.0, abs(z.real)):
+        return z.real
+    return z
+
+def _quadratic_roots(rest):
+    """Racines exactes de c + bx + ax² : Fraction si le discriminant est un carré, sinon ('sqrt', p, k, d, q)"""
+    scale = math.lcm(*(c.denominator for c in rest))
+    c, b, a = (int(x * scale) for x in rest)
+    disc = b * b - 4 * a * c
+    root = math.isqrt(disc) if disc >= 0 else -1
+    if root * root == disc:
+        return sorted({Fraction(-b - root, 2 * a), Fraction(-b + root, 2 * a)})
+    # Discriminant non carré (ou négatif) : forme exacte (p ± k√d) / q, d sans facteur carré
+    # Un cofacteur resté composite (budget épuisé) reste sous le radical : forme juste, pas toujours réduite
+    factors, cofactors = factorize(abs(disc))
+    k, d = 1, math.prod(cofactors) if disc > 0 else -math.prod(cofactors)
+    for prime, exp in factors.items():
+        k, d = k * prime ** (exp // 2), d * prime ** (exp % 2)
+    g = math.gcd(b, k, 2 * a) * (1 if a > 0 else -1)
+    return [('sqrt', -b // g, k // g, d, 2 * a // g)]
+
+def _simple_roots(p):
+    """Racines d'un polynôme sans racine multiple : exactes jusqu'au degré 2, numériques au-delà
+
+    Une racine numérique réelle est confrontée à la rationnelle la plus proche dont le dénominateur divise
+    le coefficient dominant (théorème des racines rationnelles) ; si elle annule p exactement, elle est
+    gardée en Fraction et p est divisé par (x - r) avant de chercher les autres."""
+    if len(p) == 2:
+        return [-p[0] / p[1]]
+    if len(p) == 3:
+        return _quadratic_roots(p)
+    approx = [_polish(p, z) for z in (_companion_roots(p) if np is not None else _durand_kerner(p))]
+    lead = abs(p[-1] * math.lcm(*(c.denominator for c in p)))
+    exact = []
+    for z in approx:
+        if isinstance(z, float) and math.isfinite(z):
+            r = Fraction(z).limit_denominator(int(lead))
+            if r not in exact and sum(c * r ** i for i, c in enumerate(p)) == 0:
+                exact.append(r)
+    if not exact:
+        return approx
+    for r in exact:
+        p = _poly_divmod(p, [-r, Fraction(1)])[0]
+    return exact + (_simple_roots(p) if len(p) > 1 else [])
+
+@lru_cache(maxsize=1024)
+def solve_polynomial(coeffs):
+    """Racines d'un polynôme normalisé (tuple de Fraction, degré 0 -> n, unitaire) ; mis en cache par équation normalisée
+
+    Renvoie ('all',) si tout x convient, ('none',) si aucun, sinon ('roots', racines) :
+    Fraction pour les racines rationnelles exactes, ('sqrt', p, k, d, q) pour (p ± k√d) / q, float/complex sinon.
+    Une racine multiple est répétée autant de fois que sa multiplicité : la décomposition sans facteur carré
+    la sépare avant tout calcul numérique, qui ne voit donc que des racines simples."""
+    degree = len(coeffs) - 1
+    if degree == 0:
+        return ('all',) if coeffs[0] == 0 else ('none',)
+    zeros = 0
+    while coeffs[zeros] == 0:
+        zeros += 1
+    rest = list(coeffs[zeros:])
+    roots = [Fraction(0)] * zeros
+    if len(rest) > 1:
+        for factor, multiplicity in (_square_free(rest) if len(rest) > 2 else [(rest, 1)]):
+            roots += _simple_roots(factor) * multiplicity
+    if not any(isinstance(z, tuple) for z in roots):
+        roots.sort(key=lambda z: (isinstance(z, complex), z.real, z.imag))
+    return ('roots', roots)
+
+def _linear_row(left, right, names):
+    """Coefficients de chaque inconnue puis constante de « gauche - droite = 0 » (les autres inconnues fixées à 0)"""
+    def difference(var, values):
+        return _poly_add(polynomial_from_tree(_substitute(left, values), var), polynomial_from_tree(_substitute(right, values), var), -1)
+    row = []
+    for name in names:
+        poly = difference(name, {n: 0 for n in names if n != name})
+        if len(poly) > 2:
+            raise ExpressionError(f"{name} apparaît à une puissance > 1 : système non linéaire")
+        row.append(poly[1] if len(poly) == 2 else Fraction(0))
+    row.append(-difference(None, dict.fromkeys(names, 0))[0])
+    return row
+
+def _substitute(tree, values):
+    if tree[0] == 'var' and tree[1] in values:
+        return ('num', values[tree[1]])
+    return tuple(_substitute(n, values) if isinstance(n, tuple) else n for n in tree)
+
+def solve_linear_system(equations):
+    """Système linéaire par pivot de Gauss exact : (inconnues, {inconnue: Fraction} ou None si pas de solution unique)"""
+    names = _unknowns([t for eq in equations for t in eq])
+    if len(names) != len(equations):
+        raise ExpressionError(f"{len(equations)} équations pour {len(names)} inconnues ({', '.join(names)})")
+    rows = [_linear_row(left, right, names) for left, right in equations]
+    _check_linear(equations, names, rows)
+    n = len(names)
+    for col in range(n):
+        pivot = next((r for r in range(col, n) if rows[r][col] != 0), None)
+        if pivot is None:
+            return names, None
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(n):
+            if r != col and rows[r][col]:
+                factor = rows[r][col] / rows[col][col]
+                rows[r] = [x - factor * y for x, y in zip(rows[r], rows[col])]
+    return names, {name: rows[i][-1] / rows[i][i] for i, name in enumerate(names)}
+
+def _check_linear(equations, names, rows):
+    """Termes croisés (x·y) invisibles coefficient par coefficient : vérification sur quelques points"""
+    for point in ({n: i + 2 for i, n in enumerate(names)}, {n: 3 * i - 5 for i, n in enumerate(names)}):
+        for (left, right), row in zip(equations, rows):
+            exact = evaluate_expression(left, point) - evaluate_expression(right, point)
+            linear = sum(c * point[n] for c, n in zip(row, names)) - row[-1]
+            if abs(exact - linear) > 1e-9 * (1 + abs(exact)):
+                raise ExpressionError("système non linéaire")
+
+@lru_cache(maxsize=4096)
+def solve_equation(text):
+    """Texte d'une équation ou d'un système -> ('poly', inconnue, solution) ou ('system', inconnues, solution)"""
+    parts = [p for p in _EQ_SPLIT.split(text.strip()) if p]
+    equations = [_split_equation(p) for p in parts]
+    if len(equations) > 1:
+        if len(equations) > SYSTEM_MAX_SIZE:
+            raise ExpressionError(f"systèmes limités à {SYSTEM_MAX_SIZE} équations")
+        names, solution = solve_linear_system(equations)
+        return ('system', tuple(names), solution)
+    names = _unknowns(equations[0])
+    if len(names) > 1:
+        raise ExpressionError(f"plusieurs inconnues ({', '.join(names)}) : donnez un système")
+    var = names[0] if names else 'x'
+    left, right = equations[0]
+    poly = _poly_add(polynomial_from_tree(left, var), polynomial_from_tree(right, var), -1)
+    # Normalisation (unitaire) : 2x = 4 et x - 2 = 0 partagent la même entrée de cache
+    poly = tuple(c / poly[-1] for c in poly) if poly[-1] else (Fraction(0),)
+    return ('poly', var, solve_polynomial(poly))
+
+def format_root(root):
+    if isinstance(root, Fraction):
+        if root.denominator == 1:
+            return str(root.numerator)
+        return f"{root} (≈ {float(root):.10g})"
+    if isinstance(root, tuple):
+        _, p, k, d, q = root
+        radical = ('' if k == 1 else str(k)) + ('i' if d == -1 else f"i√{-d}" if d < 0 else f"√{d}")
+        exact = f"{p} ± {radical}" if p else f"±{radical}"
+        if q != 1:
+            exact = f"({exact}) / {q}" if p else f"{exact}/{q}"
+        if d < 0:
+            return f"{exact} (≈ {p / q:.10g} ± {k * math.sqrt(-d) / q:.10g}i)"
+        # p ± k√d perd tous ses chiffres quand k√d ≈ |p| : on ne calcule que la racine sans soustraction,
+        # l'autre vient du produit exact des racines (p² - k²d) / q²
+        big = p + math.copysign(k * math.sqrt(d), p)
+        low, high = sorted((big / q, (p * p - k * k * d) / (q * big)))
+        return f"{exact} (≈ {low:.10g} et {high:.10g})"
+    if isinstance(root, complex):
+        return f"{root.real:.10g} {'+' if root.imag >= 0 else '-'} {abs(root.imag):.10g}i"
+    return f"{root:.10g}"
+
+@benchmark('equations')
+def bench_equations():
+    rng = random.Random(34)
+    def random_equation():
+        degree = rng.randint(1, 6)
+        terms = [f"{rng.randint(-9, 9)}x^{k}" for k in range(degree, 0, -1)]
+        return f"{' + '.join(terms)} + {rng.randint(-9, 9)} = {rng.randint(-9, 9)}x - {rng.randint(0, 9)}"
+    equations = [random_equation() for _ in range(3000)]
+    solve_equation.cache_clear()
+    solve_polynomial.cache_clear()
+    seconds, _ = timed(lambda: [solve_equation(e) for e in equations])
+    print(f"{len(equations)} équations aléatoires (degré 1 à 6) : {seconds * 1000:.0f} ms, {seconds / len(equations) * 1e6:.0f} µs/équation")
+    seconds, _ = timed(lambda: [solve_equation(e) for e in equations])
+    print(f"Mêmes équations, cache chaud : {seconds * 1000:.1f} ms")
+    coeffs = tuple(Fraction(rng.randint(-9, 9) or 1) for _ in range(13))
+    if np is not None:
+        seconds, _ = timed(_companion_roots, coeffs, repeat=20)
+        print(f"Degré 12, matrice compagnon (numpy) : {seconds * 1e6:.0f} µs")
+    seconds, _ = timed(_durand_kerner, coeffs, repeat=3)
+    print(f"Degré 12, Durand-Kerner (pur Python) : {seconds * 1e6:.0f} µs")
+    systems = [f"{rng.randint(1, 9)}x + {rng.randint(-9, 9)}y - z = {rng.randint(-9, 9)}, x - {rng.randint(1, 9)}y + 2z = 1, {rng.randint(1, 9)}x + y + {rng.randint(1, 9)}z = 0" for _ in range(500)]
+    seconds, _ = timed(lambda: [solve_equation(s) for s in systems])
+    print(f"{len(systems)} systèmes 3×3 : {seconds * 1000:.0f} ms")
+
+# --- Fin des équations ---
+
+# --- Finance : formules fermées d'annuités, tableaux et balayages vectorisés (numpy si présent) ---
+
+FINANCE_MAX_MONTHS = 12 * 100
+FINANCE_TABLE_RATES = 11      # Lignes du tableau « scénarios prêt »
+FINANCE_TABLE_DURATIONS = 6   # Colonnes
+
+def _growth(monthly_rate, months):
+    return (1 + monthly_rate) ** months
+
+def savings_future_value(monthly, annual_rate, months):
+    """Versement en début de mois puis intérêts mensuels : annuité due, sans boucle"""
+    r = annual_rate / 12
+    if r == 0:
+        return monthly * months
+    return monthly * (_growth(r, months) - 1) / r * (1 + r)
+
+def loan_payment(principal, annual_rate, months):
+    """Mensualité constante d'un prêt amortissable"""
+    r = annual_rate / 12
+    if r == 0:
+        return principal / months
+    return principal * r / (1 - _growth(r, months) ** -1)
+
+def amortization_schedule(principal, annual_rate, months):
+    """Tableau d'amortissement : lignes (mois, mensualité, intérêts, capital remboursé, capital restant)
+
+    Le capital restant après k mois a une forme fermée : numpy calcule toutes les lignes d'un coup."""
+    payment, r = loan_payment(principal, annual_rate, months), annual_rate / 12
+    if np is not None:
+        k = np.arange(months + 1)
+        remaining = principal * (1 + r) ** k - payment * (((1 + r) ** k - 1) / r if r else k)
+        remaining[-1] = 0.0
+        interest = remaining[:-1] * r
+        return list(zip(range(1, months + 1), [payment] * months, interest.tolist(), (payment - interest).tolist(), remaining[1:].tolist()))
+    rows, remaining = [], principal
+    for month in range(1, months + 1):
+        interest = remaining * r
+        remaining = remaining - (payment - interest) if month < months else 0.0
+        rows.append((month, payment, interest, payment - interest, remaining))
+    return rows
+
+def write_amortization_csv(path, principal, annual_rate, months):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(['mois', 'mensualite', 'interets', 'capital', 'restant'])
+        writer.writerows((m, *(f"{v:.2f}" for v in rest)) for m, *rest in amortization_schedule(principal, annual_rate, months))
+
+def inflation_adjust(amount, annual_inflation, years):
+    """(pouvoir d'achat futur de amount, somme future équivalente à amount aujourd'hui)"""
+    factor = (1 + annual_inflation) ** years
+    return amount / factor, amount * factor
+
+def payment_sweep(principal, annual_rates, months):
+    """Mensualités pour chaque (taux, durée) : grille len(annual_rates) × len(months)"""
+    if np is not None:
+        r = np.asarray(annual_rates, dtype=float)[:, None] / 12
+        n = np.asarray(months, dtype=float)[None, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            payment = principal * r / (1 - (1 + r) ** -n)
+        return np.where(r == 0, principal / n, payment)
+    return [[loan_payment(principal, rate, n) for n in months] for rate in annual_rates]
+
+def _sweep_axis(low, high, count):
+    return [low + (high - low) * i / (count - 1) for i in range(count)] if count > 1 else [low]
+
+@benchmark('finance')
+def bench_finance():
+    def savings_loop(monthly, annual_rate, months):
+        total = 0
+        for _ in range(months):
+            total = (total + monthly) * (1 + annual_rate / 12)
+        return total
+    loop, expected = timed(savings_loop, 50, 0.03, 1200, repeat=20)
+    closed, value = timed(savings_future_value, 50, 0.03, 1200, repeat=20)
+    assert abs(value - expected) < 1e-6 * expected
+    print(f"Épargne 100 ans : boucle {loop * 1e6:.0f} µs, formule fermée {closed * 1e6:.1f} µs")
+    seconds, rows = timed(amortization_schedule, 200000, 0.035, 360, repeat=5)
+    print(f"Amortissement 360 mois : {seconds * 1000:.2f} ms (restant final {rows[-1][4]:.2f})")
+    rates, months = _sweep_axis(0.0, 0.10, 400), list(range(12, 12 + 250 * 12, 12))
+    seconds, grid = timed(payment_sweep, 200000, rates, months, repeat=5)
+    path = 'numpy' if np is not None else 'pur Python'
+    print(f"Balayage {len(rates)} taux × {len(months)} durées = {len(rates) * len(months)} cellules ({path}) : {seconds * 1000:.1f} ms")
+    if np is not None:
+        seconds, _ = timed(lambda: [[loan_payment(200000, rate, n) for n in months] for rate in rates])
+        print(f"Même balayage en pur Python : {seconds * 1000:.1f} ms")
+
+# --- Fin de la finance ---
+
+# --- Unités : vecteurs de dimensions, préfixes, unités composées, devises ---
+
+# Dimensions de base : longueur, masse, temps, courant, température, quantité, information
+UNIT_DIMENSIONS = ('m', 'kg', 's', 'A', 'K', 'mol', 'bit')
+# Symbole : (facteur vers SI, définition en unités de base, préfixable, décalage affine)
+UNIT_TABLE = {
+    'm': (1, 'm', True), 'g': (1e-3, 'kg', True), 's': (1, 's', True), 'A': (1, 'A', True),
+    'K': (1, 'K', True), 'mol': (1, 'mol', True), 'bit': (1, 'bit', True), 'o': (8, 'bit', True), 'B': (8, 'bit', True),
+    'in': (0.0254, 'm', False), 'ft': (0.3048, 'm', False), 'yd': (0.9144, 'm', False),
+    'mi': (1609.344, 'm', False), 'nmi': (1852, 'm', False), 'au': (149597870700, 'm', False), 'ly': (9.4607304725808e15, 'm', False),
+    't': (1000, 'kg', False), 'lb': (0.45359237, 'kg', False), 'oz': (0.028349523125, 'kg', False), 'st': (6.35029318, 'kg', False),
+    'min': (60, 's', False), 'h': (3600, 's', False), 'j': (86400, 's', False), 'sem': (604800, 's', False), 'an': (31557600, 's', False),
+    'ha': (1e4, 'm^2', False), 'acre': (4046.8564224, 'm^2', False),
+    'L': (1e-3, 'm^3', True), 'l': (1e-3, 'm^3', True), 'gal': (3.785411784e-3, 'm^3', False), 'pt': (4.73176473e-4, 'm^3', False),
+    'kn': (1852 / 3600, 'm/s', False), 'mph': (1609.344 / 3600, 'm/s', False), 'Hz': (1, '1/s', True),
+    'N': (1, 'kg*m/s^2', True), 'J': (1, 'kg*m^2/s^2', True), 'W': (1, 'kg*m^2/s^3', True), 'Wh': (3600, 'kg*m^2/s^2', True),
+    'cal': (4.184, 'kg*m^2/s^2', True), 'eV': (1.602176634e-19, 'kg*m^2/s^2', True), 'BTU': (1055.05585262, 'kg*m^2/s^2', False),
+    'ch': (735.49875, 'kg*m^2/s^3', False), 'hp': (745.69987158227, 'kg*m^2/s^3', False),
+    'Pa': (1, 'kg/m/s^2', True), 'bar': (1e5, 'kg/m/s^2', True), 'atm': (101325, 'kg/m/s^2', False),
+    'psi': (6894.757293168, 'kg/m/s^2', False), 'mmHg': (133.322387415, 'kg/m/s^2', False),
+    'C': (1, 'A*s', True), 'V': (1, 'kg*m^2/s^3/A', True), 'ohm': (1, 'kg*m^2/s^3/A^2', True), 'Ah': (3600, 'A*s', True),
+    # Températures : affines, seules ou en écart dans une unité composée
+    'degC': (1, 'K', False, 273.15), 'degF': (5 / 9, 'K', False, 459.67 * 5 / 9), 'degR': (5 / 9, 'K', False),
+}
+UNIT_PREFIXES = {
+    'Y': 1e24, 'Z': 1e21, 'E': 1e18, 'P': 1e15, 'T': 1e12, 'G': 1e9, 'M': 1e6, 'k': 1e3, 'h': 1e2, 'da': 10,
+    'd': 0.1, 'c': 1e-2, 'm': 1e-3, 'µ': 1e-6, 'μ': 1e-6, 'u': 1e-6, 'n': 1e-9, 'p': 1e-12, 'f': 1e-15,
+    'Ki': 2 ** 10, 'Mi': 2 ** 20, 'Gi': 2 ** 30, 'Ti': 2 ** 40,
+}
+# Noms longs et graphies courantes (insensibles à la casse)
+UNIT_ALIASES = {
+    'metre': 'm', 'mètre': 'm', 'meter': 'm', 'kilometre': 'km', 'kilomètre': 'km', 'kilometer': 'km',
+    'centimetre': 'cm', 'centimètre': 'cm', 'millimetre': 'mm', 'millimètre': 'mm', 'pouce': 'in', 'inch': 'in',
+    'pied': 'ft', 'foot': 'ft', 'feet': 'ft', 'mile': 'mi', 'yard': 'yd', 'gramme': 'g', 'gram': 'g',
+    'kilogramme': 'kg', 'kilo': 'kg', 'kilogram': 'kg', 'tonne': 't', 'lbs': 'lb', 'livre': 'lb', 'pound': 'lb',
+    'once': 'oz', 'ounce': 'oz', 'seconde': 's', 'second': 's', 'sec': 's', 'minute': 'min', 'heure': 'h', 'hour': 'h',
+    'jour': 'j', 'day': 'j', 'd': 'j', 'semaine': 'sem', 'week': 'sem', 'année': 'an', 'annee': 'an', 'year': 'an',
+    'litre': 'L', 'liter': 'L', 'gallon': 'gal', 'pinte': 'pt', 'pint': 'pt', 'hectare': 'ha', 'noeud': 'kn', 'nœud': 'kn',
+    'knot': 'kn', 'kmh': 'km/h', 'joule': 'J', 'watt': 'W', 'calorie': 'cal', 'newton': 'N', 'pascal': 'Pa',
+    'celsius': 'degC', '°c': 'degC', 'degc': 'degC', 'fahrenheit': 'degF', '°f': 'degF', 'degf': 'degF',
+    'kelvin': 'K', 'rankine': 'degR', 'octet': 'o', 'byte': 'B', 'mo': 'Mo', 'go': 'Go', 'to': 'To',
+    'kb': 'kB', 'mb': 'MB', 'gb': 'GB', 'tb': 'TB', 'volt': 'V', 'ampere': 'A', 'ampère': 'A', 'hertz': 'Hz', 'ohms': 'ohm', 'Ω': 'ohm',
+}
+UNIT_DIMENSION_NAMES = {
+    (1, 0, 0, 0, 0, 0, 0): 'longueur', (0, 1, 0, 0, 0, 0, 0): 'masse', (0, 0, 1, 0, 0, 0, 0): 'durée',
+    (0, 0, 0, 0, 1, 0, 0): 'température', (0, 0, 0, 0, 0, 0, 1): 'information', (2, 0, 0, 0, 0, 0, 0): 'surface',
+    (3, 0, 0, 0, 0, 0, 0): 'volume', (1, 0, -1, 0, 0, 0, 0): 'vitesse', (2, 1, -2, 0, 0, 0, 0): 'énergie',
+    (2, 1, -3, 0, 0, 0, 0): 'puissance', (-1, 1, -2, 0, 0, 0, 0): 'pression', (1, 1, -2, 0, 0, 0, 0): 'force',
+}
+_UNIT_FACTOR = re.compile(r'([A-Za-zµμ°Ω_]+|1)(?:\^(-?\d+)|(\d+)|([²³]))?')
+
+class UnitError(ValueError):
+    """Unité inconnue ou conversion entre dimensions différentes"""
+
+def _dimension_of(base):
+    return tuple(int(base == d) for d in UNIT_DIMENSIONS)
+
+def _alias(symbol):
+    lower = symbol.lower()
+    return UNIT_ALIASES.get(lower) or (UNIT_ALIASES.get(lower[:-1]) if lower.endswith('s') else None)  # Pluriels : heures, miles
+
+@lru_cache(maxsize=None)
+def _lookup_symbol(symbol, aliases=True):
+    """Symbole simple (avec préfixe éventuel) -> (facteur SI, dimensions, décalage)"""
+    if symbol in UNIT_TABLE:
+        factor, definition, _, *offset = UNIT_TABLE[symbol]
+        if definition in UNIT_DIMENSIONS:
+            return factor, _dimension_of(definition), offset[0] if offset else 0
+        scale, dims, _ = parse_unit(definition)
+        return factor * scale, dims, 0
+    alias = _alias(symbol) if aliases else None
+    if alias:
+        return parse_unit(alias) if '/' in alias else _lookup_symbol(alias, False)
+    for prefix, multiplier in UNIT_PREFIXES.items():
+        unit = symbol[len(prefix):]
+        if symbol.startswith(prefix) and unit in UNIT_TABLE and UNIT_TABLE[unit][2]:
+            factor, dims, _ = _lookup_symbol(unit, False)
+            return multiplier * factor, dims, 0
+    if aliases and symbol.lower() != symbol:
+        return _lookup_symbol(symbol.lower(), False)  # KM, MPH
+    raise UnitError(f"unité inconnue : {symbol}")
+
+@lru_cache(maxsize=4096)
+def parse_unit(text):
+    """« km/h », « kWh », « m^2 », « kg·m/s² » -> (facteur vers SI, vecteur de dimensions, décalage affine)"""
+    factor, dims, sign, pos, factors = 1.0, [0] * len(UNIT_DIMENSIONS), 1, 0, []
+    text = text.strip()
+    while pos < len(text):
+        if text[pos] in '*·.':
+            pos += 1
+            continue
+        if text[pos] == '/':
+            sign, pos = -1, pos + 1
+            continue
+        m = _UNIT_FACTOR.match(text, pos)
+        if not m:
+            raise UnitError(f"unité illisible : {text}")
+        symbol, exponent, superscript = m.group(1), m.group(2) or m.group(3), m.group(4)
+        power = int(exponent) if exponent else {'²': 2, '³': 3}.get(superscript, 1)
+        scale, sub_dims, offset = _lookup_symbol(symbol) if symbol != '1' else (1, (0,) * len(UNIT_DIMENSIONS), 0)
+        factor *= scale ** (sign * power)
+        dims = [d + sign * power * s for d, s in zip(dims, sub_dims)]
+        factors.append((sign * power, offset))
+        pos = m.end()
+    if not factors:
+        raise UnitError("unité vide")
+    # Décalage (°C, °F) seulement pour une température seule : dans J/°C ce n'est qu'un écart
+    offset = factors[0][1] if len(factors) == 1 and factors[0][0] == 1 else 0
+    return factor, tuple(dims), offset
+
+@lru_cache(maxsize=8192)
+def unit_conversion(source, target):
+    """(échelle, décalage) tels que valeur_cible = valeur * échelle + décalage ; mis en cache par paire
+
+    Chaque unité pointe vers son unité SI cohérente : le chemin source -> SI -> cible est résolu une fois par paire."""
+    f1, d1, o1 = parse_unit(source)
+    f2, d2, o2 = parse_unit(target)
+    if d1 != d2:
+        names = [UNIT_DIMENSION_NAMES.get(d, 'dimension composée') for d in (d1, d2)]
+        raise UnitError(f"{source} ({names[0]}) et {target} ({names[1]}) sont incompatibles")
+    return f1 / f2, (o1 - o2) / f2
+
+def convert_unit(value, source, target):
+    scale, shift = unit_conversion(source, target)
+    return value * scale + shift
+
+# Devises : graphe pondéré (arête = taux), chemins résolus en largeur et mis en cache.
+RATES_FILE = Path.home() / ".freev_rates.json"
+# Les six paires historiques sont données telles quelles : un taux explicite l'emporte sur l'inverse calculé.
+DEFAULT_RATE_TABLES = [  # Taux approximatifs 2023, utilisés sans fichier de taux
+    {'base': 'EUR', 'updated': '2023 (approx.)', 'rates': {'USD': 1.1, 'GBP': 0.85}},
+    {'base': 'USD', 'updated': '2023 (approx.)', 'rates': {'EUR': 0.91, 'GBP': 0.77}},
+    {'base': 'GBP', 'updated': '2023 (approx.)', 'rates': {'EUR': 1.18, 'USD': 1.3}},
+]
+_currency_state = {'mtime': None, 'graph': None, 'updated': None, 'source': None}
+# Codes ISO 4217 reconnus comme devises même sans taux connu (aucun ne se lit comme une unité)
+CURRENCY_CODES = frozenset("""
+    AED AFN ALL AMD ANG AOA ARS AUD AWG AZN BAM BBD BDT BGN BHD BIF BMD BND BOB BRL BSD BTN BWP BYN BZD CAD CDF CHF
+    CLP CNY COP CRC CUP CVE CZK DJF DKK DOP DZD EGP ERN ETB EUR FJD FKP GBP GEL GHS GIP GMD GNF GTQ GYD HKD HNL HTG
+    HUF IDR ILS INR IQD IRR ISK JMD JOD JPY KES KGS KHR KMF KPW KRW KWD KYD KZT LAK LBP LKR LRD LSL LYD MAD MDL MGA
+    MKD MMK MNT MOP MRU MUR MVR MWK MXN MYR MZN NAD NGN NIO NOK NPR NZD OMR PAB PEN PGK PHP PKR PLN PYG QAR RON RSD
+    RUB RWF SAR SBD SCR SDG SEK SGD SHP SLE SOS SRD SSP STN SVC SYP SZL THB TJS TMT TND TOP TRY TTD TWD TZS UAH UGX
+    USD UYU UZS VES VND VUV WST XAF XCD XOF XPF YER ZAR ZMW ZWL""".split())
+
+def _currency_graph():
+    """Graphe {devise: {voisine: taux}} depuis RATES_FILE, rechargé seulement si son mtime change
+
+    Format : {"base": "EUR", "updated": "2024-05-01T12:00", "rates": {"USD": 1.08, ...}}
+    ou {"tables": [plusieurs tables de ce type]}."""
+    try:
+        mtime = RATES_FILE.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+    if _currency_state['graph'] is not None and mtime == _currency_state['mtime']:
+        return _currency_state['graph']
+    tables, source = DEFAULT_RATE_TABLES, 'taux approx. intégrés'
+    if mtime is not None:
+        try:
+            data = json.loads(RATES_FILE.read_text(encoding='utf-8'))
+            tables, source = data.get('tables', [data]), RATES_FILE.name
+        except (OSError, ValueError, AttributeError):
+            pass  # Fichier illisible : on garde les taux intégrés
+    graph, stamps = {}, []
+    for table in tables:
+        base = str(table.get('base', '')).upper()
+        for code, rate in table.get('rates', {}).items():
+            if isinstance(rate, (int, float)) and rate > 0 and base:
+                graph.setdefault(base, {})[code.upper()] = rate
+                graph.setdefault(code.upper(), {}).setdefault(base, 1 / rate)
+        if table.get('updated'):
+            stamps.append(str(table['updated']))
+    _currency_state.update(mtime=mtime, graph=graph, updated=max(stamps, default='date inconnue'), source=source)
+    currency_rate.cache_clear()
+    return graph
+
+@lru_cache(maxsize=1024)
+def currency_rate(source, target):
+    """Taux source -> cible par le plus court chemin du graphe (taux croisés via une devise pivot) ; None si aucun"""
+    graph = _currency_state['graph']
+    if source not in graph or target not in graph:
+        return None
+    rates, queue = {source: 1.0}, [source]
+    for node in queue:
+        if node == target:
+            return rates[node]
+        for neighbour, rate in graph[node].items():
+            if neighbour not in rates:
+                rates[neighbour] = rates[node] * rate
+                queue.append(neighbour)
+    return None
+
+def currency_code(symbol):
+    """Code de devise en majuscules (ISO 4217 ou présent dans les taux), sinon None"""
+    code = symbol.upper()
+    return code if code in CURRENCY_CODES or code in _currency_graph() else None
+
+def available_currencies():
+    return sorted(_currency_graph())
+
+def convert_currency(value, source, target):
+    """(montant converti ou None, date des taux, source des taux)"""
+    _currency_graph()
+    rate = currency_rate(source.upper(), target.upper())
+    return (None if rate is None else value * rate), _currency_state['updated'], _currency_state['source']
+
+@benchmark('unites')
+def bench_units():
+    rng = random.Random(36)
+    families = [['m', 'km', 'mi', 'ft', 'in', 'nmi', 'µm'], ['km/h', 'm/s', 'mph', 'kn'], ['kWh', 'J', 'cal', 'kcal', 'eV', 'BTU'],
+                ['degC', 'degF', 'K', 'degR'], ['Mo', 'Gio', 'kbit', 'B'], ['bar', 'psi', 'atm', 'mmHg', 'kPa'], ['L', 'm^3', 'gal', 'cm³']]
+    pairs = [tuple(rng.sample(family, 2)) for family in rng.choices(families, k=50000)]
+    values = [rng.uniform(-100, 100) for _ in pairs]
+    for cache in (parse_unit, unit_conversion, _lookup_symbol):
+        cache.cache_clear()
+    seconds, _ = timed(lambda: [convert_unit(v, a, b) for v, (a, b) in zip(values, pairs)])
+    print(f"{len(pairs)} conversions aléatoires ({len(set(pairs))} paires distinctes) : {seconds * 1000:.0f} ms, cache froid")
+    seconds, _ = timed(lambda: [convert_unit(v, a, b) for v, (a, b) in zip(values, pairs)], repeat=3)
+    print(f"Mêmes conversions, cache chaud : {seconds * 1000:.0f} ms ({seconds / len(pairs) * 1e9:.0f} ns/conversion)")
+    assert abs(convert_unit(100, 'degC', 'degF') - 212) < 1e-9 and abs(convert_unit(1, 'kWh', 'J') - 3.6e6) < 1e-6
+
+# --- Fin des unités ---
+
+# --- Codecs en flux : base64, morse, binaire, César, Vigenère (tables construites une fois) ---
+
+CODEC_CHUNK = 1 << 20  # Octets lus par bloc : mémoire constante quelle que soit la taille du fichier
+CODEC_DEFAULT_SHIFT = 3
+CODEC_DEFAULT_KEY = "CLE"
+_UMASK = os.umask(0o22)  # Lu une fois au chargement (aucun autre thread) puis rétabli
+os.umask(_UMASK)
+
+class CodecError(ValueError):
+    """Entrée impossible à décoder"""
+
+MORSE_CODE = {
+    'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 'F': '..-.',
+    'G': '--.', 'H': '....', 'I': '..', 'J': '.---', 'K': '-.-', 'L': '.-..',
+    'M': '--', 'N': '-.', 'O': '---', 'P': '.--.', 'Q': '--.-', 'R': '.-.',
+    'S': '...', 'T': '-', 'U': '..-', 'V': '...-', 'W': '.--', 'X': '-..-',
+    'Y': '-.--', 'Z': '--..', '0': '-----', '1': '.----', '2': '..---',
+    '3': '...--', '4': '....-', '5': '.....', '6': '-....', '7': '--...',
+    '8': '---..', '9': '----.', ' ': '/'
+}
+# Octet -> code morse suivi d'un espace (minuscules comprises, autres octets ignorés)
+_MORSE_ENCODE = [b''] * 256
+for _char, _code in MORSE_CODE.items():
+    for _byte in {ord(_char), ord(_char.lower())}:
+        _MORSE_ENCODE[_byte] = _code.encode() + b' '
+_MORSE_DECODE = {code.encode(): char.encode() for char, code in MORSE_CODE.items()}
+_BITS_ENCODE = [format(i, '08b').encode() for i in range(256)]
+_BITS_DECODE = {bits: bytes([i]) for i, bits in enumerate(_BITS_ENCODE)}
+_WHITESPACE = b' \t\r\n\v\f'
+_UPPER, _LOWER = bytes(range(65, 91)), bytes(range(97, 123))
+
+@lru_cache(maxsize=64)
+def caesar_table(shift):
+    """Table bytes.translate décalant A-Z et a-z de shift (les autres octets, UTF-8 compris, restent intacts)"""
+    shift %= 26
+    return bytes.maketrans(_UPPER + _LOWER, _UPPER[shift:] + _UPPER[:shift] + _LOWER[shift:] + _LOWER[:shift])
+
+def _vigenere_shifts(key, sign):
+    shifts = [sign * (ord(c) - 65) for c in key.upper() if 'A' <= c <= 'Z']
+    if not shifts:
+        raise CodecError("la clé doit contenir au moins une lettre A-Z")
+    return shifts
+
+class _TokenCodec:
+    """Décodeur de jetons séparés par des blancs : le dernier jeton d'un bloc peut être coupé, on le garde"""
+    table = None
+
+    def __init__(self):
+        self.pending = b''
+
+    def decode_token(self, token):
+        try:
+            return self.table[token]
+        except KeyError:
+            raise CodecError(f"jeton invalide : {token[:20].decode(errors='replace')}")
+
+    def feed(self, data):
+        data = self.pending + data
+        cut = max(data.rfind(c) for c in b' \n')
+        if cut < 0:
+            self.pending = data
+            return b''
+        self.pending = data[cut + 1:]
+        return b''.join(map(self.decode_token, data[:cut].split()))
+
+    def flush(self):
+        out = b''.join(map(self.decode_token, self.pending.split()))
+        self.pending = b''
+        return out
+
+class MorseDecoder(_TokenCodec):
+    table = _MORSE_DECODE
+
+class BinaryDecoder(_TokenCodec):
+    table = _BITS_DECODE
+
+class MorseEncoder:
+    def feed(self, data):
+        return b''.join(map(_MORSE_ENCODE.__getitem__, data))
+
+    def flush(self):
+        return b''
+
+class BinaryEncoder:
+    def __init__(self):
+        self.started = False
+
+    def feed(self, data):
+        if not data:
+            return b''
+        if np is not None:
+            # Chaque octet devient 8 chiffres ASCII + un espace : une seule passe unpackbits
+            grid = np.full((len(data), 9), 32, dtype=np.uint8)
+            grid[:, :8] = np.unpackbits(np.frombuffer(data, dtype=np.uint8)).reshape(-1, 8) + 48
+            out = grid.tobytes()[:-1]
+        else:
+            out = b' '.join(map(_BITS_ENCODE.__getitem__, data))
+        out, self.started = (b' ' + out if self.started else out), True
+        return out
+
+    def flush(self):
+        return b''
+
+class Base64Encoder:
+    """Lignes MIME de 76 caractères ; le reste d'un bloc non multiple de 57 octets attend le bloc suivant"""
+    def __init__(self):
+        self.pending = b''
+
+    def feed(self, data):
+        data = self.pending + data
+        cut = len(data) - len(data) % 57
+        self.pending = data[cut:]
+        return base64.encodebytes(data[:cut])
+
+    def flush(self):
+        out, self.pending = base64.encodebytes(self.pending) if self.pending else b'', b''
+        return out
+
+class Base64Decoder:
+    def __init__(self):
+        self.pending = b''
+
+    def feed(self, data):
+        data = self.pending + data.translate(None, _WHITESPACE)
+        cut = len(data) - len(data) % 4
+        self.pending = data[cut:]
+        try:
+            return base64.b64decode(data[:cut], validate=True)
+        except ValueError as e:
+            raise CodecError(f"base64 invalide : {e}")
+
+    def flush(self):
+        if self.pending:
+            raise CodecError("base64 tronqué")
+        return b''
+
+class CaesarCodec:
+    def __init__(self, shift):
+        self.table = caesar_table(shift)
+
+    def feed(self, data):
+        return data.translate(self.table)
+
+    def flush(self):
+        return b''
+
+class VigenereCodec:
+    """Décalage par lettre selon la clé ; seules les lettres A-Z/a-z font avancer la clé, même entre deux blocs"""
+    def __init__(self, shifts):
+        self.shifts, self.position = shifts, 0
+        self.tables = [caesar_table(s) for s in shifts]
+
+    def feed(self, data):
+        if np is not None and len(data) > 4096:
+            return self._feed_numpy(data)
+        out, tables, n, pos = bytearray(data), self.tables, len(self.shifts), self.position
+        for i, byte in enumerate(out):
+            if 65 <= byte <= 90 or 97 <= byte <= 122:
+                out[i] = tables[pos % n][byte]
+                pos += 1
+        self.position = pos
+        return bytes(out)
+
+    def _feed_numpy(self, data):
+        a = np.frombuffer(data, dtype=np.uint8)
+        upper, lower = (a >= 65) & (a <= 90), (a >= 97) & (a <= 122)
+        letters = upper | lower
+        index = np.cumsum(letters) - 1 + self.position
+        shifts = np.asarray(self.shifts, dtype=np.int16)[index % len(self.shifts)]
+        base = np.where(upper, 65, 97).astype(np.int16)
+        out = np.where(letters, (a - base + shifts) % 26 + base, a).astype(np.uint8)
+        self.position += int(letters.sum())
+        return out.tobytes()
+
+    def flush(self):
+        return b''
+
+CODEC_NAMES = {'base64': 'base64', 'morse': 'morse', 'binary': 'binary', 'binaire': 'binary',
+               'caesar': 'caesar', 'césar': 'caesar', 'cesar': 'caesar', 'vigenere': 'vigenere', 'vigenère': 'vigenere'}
+
+def make_codec(name, decode=False, key=None):
+    """Codec en flux (feed(octets) -> octets, flush()) pour name, sens encodage ou décodage"""
+    if name == 'base64':
+        return Base64Decoder() if decode else Base64Encoder()
+    if name == 'morse':
+        return MorseDecoder() if decode else MorseEncoder()
+    if name == 'binary':
+        return BinaryDecoder() if decode else BinaryEncoder()
+    if name == 'caesar':
+        if key is not None and not re.fullmatch(r'[+-]?\d{1,9}', key.strip()):
+            raise CodecError(f"le décalage César doit être un nombre entier (ex : décalage 3), pas « {key} »")
+        shift = CODEC_DEFAULT_SHIFT if key is None else int(key)
+        return CaesarCodec(-shift if decode else shift)
+    if name == 'vigenere':
+        return VigenereCodec(_vigenere_shifts(key or CODEC_DEFAULT_KEY, -1 if decode else 1))
+    raise CodecError(f"codec inconnu : {name}")
+
+def codec_text(name, text, decode=False, key=None):
+    codec = make_codec(name, decode, key)
+    return (codec.feed(text.encode('utf-8')) + codec.flush()).decode('utf-8', errors='replace')
+
+def stream_codec(name, source, target, decode=False, key=None, chunk=CODEC_CHUNK):
+    """Encode/décode source vers target bloc par bloc ; (octets lus, octets écrits)
+
+    La sortie passe par un fichier temporaire voisin remplacé atomiquement : target n'est jamais
+    à moitié écrit, et reste intact si le codec, le disque ou Ctrl+C interrompent le flux."""
+    if os.path.realpath(source) == os.path.realpath(target) or os.path.exists(target) and os.path.samefile(source, target):
+        raise CodecError("le fichier de sortie doit être différent de l'entrée")
+    codec, read, written = make_codec(name, decode, key), 0, 0
+    with open(source, 'rb') as src:
+        # Nom unique : un fichier « <target>.tmp » de l'utilisateur n'est ni écrasé ni supprimé
+        fd, tmp = tempfile.mkstemp(prefix='.freev-', suffix='.tmp', dir=os.path.dirname(target) or '.')
+        try:
+            # mkstemp crée en 0600 : la sortie garde les droits de l'ancien target, ou ceux d'un fichier neuf
+            os.chmod(tmp, os.stat(target).st_mode & 0o7777 if os.path.exists(target) else 0o666 & ~_UMASK)
+            with os.fdopen(fd, 'wb') as dst:
+                for block in iter(lambda: src.read(chunk), b''):
+                    read += len(block)
+                    written += dst.write(codec.feed(block))
+                written += dst.write(codec.flush())
+            os.replace(tmp, target)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    return read, written
+
+@benchmark('codecs')
+def bench_codecs():
+    rng = random.Random(37)
+    words = ["chiffre", "message", "secret", "Freev", "données", "octet", "flux", "bloc", "clé", "texte"]
+    sample = ' '.join(rng.choice(words) for _ in range(1_200_000)).encode('utf-8')[:8 << 20]
+    size_mb = len(sample) / (1 << 20)
+    for name in ('base64', 'morse', 'binary', 'caesar', 'vigenere'):
+        def run(decode, data):
+            codec, out = make_codec(name, decode, 'SECRET' if name == 'vigenere' else None), []
+            for i in range(0, len(data), CODEC_CHUNK):
+                out.append(codec.feed(data[i:i + CODEC_CHUNK]))
+            out.append(codec.flush())
+            return b''.join(out)
+        enc_s, encoded = timed(run, False, sample)
+        dec_s, decoded = timed(run, True, encoded)
+        # Le morse ne garde que les majuscules, chiffres et espaces
+        assert decoded == (sample if name != 'morse' else bytes(b for b in sample.upper() if _MORSE_ENCODE[b])), name
+        print(f"{name:<9} encodage {size_mb / enc_s:8.1f} Mo/s   décodage {len(encoded) / (1 << 20) / dec_s:8.1f} Mo/s (entrée codée {len(encoded) / (1 << 20):.1f} Mo)")
+
+# --- Fin des codecs ---
+
+# --- Cryptanalyse : César et Vigenère par fréquences de lettres (χ², indice de coïncidence, Kasiski) ---
+
+# Fréquences (%) des lettres A-Z ; les lettres accentuées du français ne sont pas comptées
+LETTER_FREQUENCIES = {
+    'fr': (7.636, 0.901, 3.260, 3.669, 14.715, 1.066, 0.866, 0.737, 7.529, 0.613, 0.074, 5.456, 2.968,
+           7.095, 5.796, 2.521, 1.362, 6.693, 7.948, 7.244, 6.311, 1.838, 0.049, 0.427, 0.128, 0.326),
+    'en': (8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+           6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074),
+}
+LANGUAGE_NAMES = {'fr': 'français', 'en': 'anglais'}
+CRACK_MAX_KEY = 20           # Longueur de clé Vigenère maximale essayée
+CRACK_MIN_COLUMN = 6         # Lettres minimales par colonne pour qu'une longueur soit crédible
+CRACK_SAMPLE = 1 << 20       # Octets analysés au plus (un fichier plus gros est déchiffré en flux)
+_NON_LETTERS = bytes(b for b in range(256) if not 65 <= b <= 90)
+_SHIFT_INDEX = [[(plain + shift) % 26 for plain in range(26)] for shift in range(26)]
+
+def letters_only(data):
+    """Octets -> lettres A-Z majuscules uniquement (deux passes en C : upper puis translate)"""
+    return data.upper().translate(None, _NON_LETTERS)
+
+def letter_counts(letters):
+    return [letters.count(c) for c in _UPPER]
+
+def shift_scores(counts, language):
+    """χ² des 26 décalages possibles d'un coup : ligne s = texte supposé chiffré avec le décalage s"""
+    total = sum(counts) or 1
+    expected = [f * total / 100 for f in LETTER_FREQUENCIES[language]]
+    if np is not None:
+        observed = np.asarray(counts, dtype=float)[np.asarray(_SHIFT_INDEX)]
+        exp = np.asarray(expected)
+        return (((observed - exp) ** 2) / exp).sum(axis=1).tolist()
+    return [sum((counts[i] - e) ** 2 / e for i, e in zip(row, expected)) for row in _SHIFT_INDEX]
+
+def crack_caesar(letters, languages=tuple(LETTER_FREQUENCIES)):
+    """(décalage, langue, χ²) le plus vraisemblable"""
+    counts = letter_counts(letters)
+    best = None
+    for language in languages:
+        scores = shift_scores(counts, language)
+        shift = min(range(26), key=scores.__getitem__)
+        if best is None or scores[shift] < best[2]:
+            best = (shift, language, scores[shift])
+    return best
+
+def coincidence_index(letters):
+    n = len(letters)
+    return sum(c * (c - 1) for c in letter_counts(letters)) / (n * (n - 1)) if n > 1 else 0.0
+
+def kasiski_lengths(letters, limit=CRACK_MAX_KEY, samples=20000):
+    """Facteurs 2..limit des distances entre trigrammes répétés, comptés (examen de Kasiski)"""
+    last, factors = {}, Counter()
+    for i in range(min(len(letters) - 2, samples)):
+        trigram = letters[i:i + 3]
+        if trigram in last:
+            distance = i - last[trigram]
+            factors.update(f for f in range(2, limit + 1) if distance % f == 0)
+        last[trigram] = i
+    return factors
+
+def vigenere_key_length(letters):
+    """Longueur de clé : la plus petite dont l'IC moyen des colonnes approche le meilleur (les multiples scorent aussi haut)
+
+    Sur un texte trop court pour que l'IC tranche, le facteur de Kasiski le plus fréquent décide."""
+    longest = max(1, min(CRACK_MAX_KEY, len(letters) // CRACK_MIN_COLUMN))
+    ics = {L: sum(coincidence_index(letters[i::L]) for i in range(L)) / L for L in range(1, longest + 1)}
+    best = max(ics.values())
+    if best < 0.05:
+        kasiski = kasiski_lengths(letters, longest)
+        if kasiski:
+            return kasiski.most_common(1)[0][0], ics
+    return min(L for L, ic in ics.items() if ic >= 0.9 * best), ics
+
+def crack_vigenere(letters):
+    """(clé, langue, longueur estimée) : une attaque de César par colonne, même langue pour toutes"""
+    length, _ = vigenere_key_length(letters)
+    columns = [letters[i::length] for i in range(length)]
+    best = None
+    for language in LETTER_FREQUENCIES:
+        cracked = [crack_caesar(col, (language,)) for col in columns]
+        total = sum(score for _, _, score in cracked)
+        if best is None or total < best[2]:
+            best = (''.join(chr(65 + shift) for shift, _, _ in cracked), language, total)
+    return best[0], best[1], length
+
+@benchmark('cryptanalyse')
+def bench_cryptanalysis():
+    texts = {
+        'fr': ("Le petit village se réveillait lentement sous un ciel gris de novembre. Les commerçants ouvraient leurs "
+               "volets pendant que les enfants couraient vers l'école en riant. Personne ne savait encore que la lettre "
+               "arrivée la veille allait changer la vie de toute la famille Martin. "),
+        'en': ("The small village was waking slowly under a grey November sky. Shopkeepers opened their shutters while "
+               "children ran towards the school laughing. Nobody knew yet that the letter which arrived the day before "
+               "would change the life of the whole Martin family. "),
+    }
+    rng = random.Random(38)
+    for language, paragraph in texts.items():
+        sentences = paragraph.split('. ')
+        plain = ' '.join(rng.choice(sentences) for _ in range(120)).encode('utf-8')
+        for name, key in (('caesar', 11), ('vigenere', 'CRYPTANALYSE')):
+            cipher = make_codec(name, key=key)
+            data = cipher.feed(plain) + cipher.flush()
+            crack = crack_caesar if name == 'caesar' else crack_vigenere
+            seconds, (found, *_) = timed(lambda: crack(letters_only(data)))
+            print(f"{name:<8} {language} {len(data) / 1024:5.1f} Ko : clé {found} ({'ok' if found == key else 'ÉCHEC'}) en {seconds * 1000:.1f} ms")
+
+# --- Fin de la cryptanalyse ---
+
+# --- Analyse de fichiers en flux : une passe, mémoire constante ---
+
+FILE_CHUNK = 1 << 22          # 4 Mio par lecture
+FILE_SNIFF = 1 << 16          # Octets examinés pour deviner l'encodage
+FILE_TOP_WORDS = 10
+FILE_MAX_WORD = 1 << 10       # Un « mot » plus long en fin de bloc n'est pas reporté au bloc suivant
+_FILE_WORD = re.compile(r"[^\W\d_]+")
+_ASCII_WHITESPACE = b' \t\n\r\v\f'
+_WORD_SHAPE = bytes(32 if b in _ASCII_WHITESPACE else 120 for b in range(256))
+# Mots fréquents : tout octet ASCII qui n'est pas une lettre devient un blanc (les octets >= 0x80 restent, accents compris)
+_WORD_BYTES = bytes(b if 65 <= b <= 90 or 97 <= b <= 122 or b >= 128 else 32 for b in range(256))
+_UTF8_CONTINUATION = bytes(range(0x80, 0xC0))
+_BOMS = ((b'\xef\xbb\xbf', 'utf-8-sig'), (b'\xff\xfe\x00\x00', 'utf-32'), (b'\x00\x00\xfe\xff', 'utf-32'),
+         (b'\xff\xfe', 'utf-16'), (b'\xfe\xff', 'utf-16'))
+
+def detect_encoding(sample):
+    """Encodage probable d'un début de fichier : BOM, UTF-8 strict (fin tronquée tolérée), binaire, sinon cp1252"""
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    if b'\x00' in sample:
+        return 'binaire'
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1252'
+
+class FileStats:
+    """Compteurs alimentés bloc par bloc (feed) ; les coupures de mots et de lignes entre blocs sont recollées
+
+    Les blocs reçus sont en UTF-8 (ou un encodage compatible ASCII) : l'UTF-16/32 est transcodé avant."""
+
+    def __init__(self, encoding, details=False):
+        self.encoding, self.details = encoding, details
+        self.text_encoding = 'cp1252' if encoding == 'cp1252' else 'utf-8'
+        self.size = self.lines = self.words = self.chars = 0
+        self.in_word = False          # Le bloc précédent finissait au milieu d'un mot
+        self.last_byte = None
+        self.line_length = self.line_no = 0
+        self.longest = (0, 0)         # (octets, numéro de ligne)
+        self.top_words = Counter()
+        self.tail = b''               # Mot coupé en fin de bloc, pour top_words
+        self.histogram = np.zeros(256, dtype=np.int64) if np is not None else [0] * 256
+
+    def feed(self, chunk):
+        if not chunk:
+            return
+        self.size += len(chunk)
+        self.lines += chunk.count(b'\n')
+        if self.text_encoding == 'utf-8' and self.encoding != 'binaire':
+            self.chars += len(chunk.translate(None, _UTF8_CONTINUATION))  # Un caractère = un octet de tête
+        else:
+            self.chars += len(chunk)
+        # Blancs -> ' ', le reste -> 'x' : chaque début de mot est un « x» précédé d'un blanc
+        shape = chunk.translate(_WORD_SHAPE)
+        self.words += shape.count(b' x') + (shape[0] == 120 and not self.in_word)
+        self.in_word = chunk[-1] not in _ASCII_WHITESPACE
+        self.last_byte = chunk[-1]
+        if self.details:
+            self._feed_details(chunk)
+
+    def _feed_details(self, chunk):
+        # Histogramme et longueurs des lignes complètes du bloc (numpy si présent)
+        if np is not None:
+            a = np.frombuffer(chunk, dtype=np.uint8)
+            self.histogram += np.bincount(a, minlength=256)
+            ends = np.flatnonzero(a == 10)
+            complete = (np.diff(ends, prepend=-1) - 1).tolist()
+            partial = len(chunk) - 1 - int(ends[-1]) if len(ends) else len(chunk)
+        else:
+            for byte, count in Counter(chunk).items():
+                self.histogram[byte] += count
+            complete = list(map(len, chunk.split(b'\n')))
+            partial = complete.pop()
+        if complete:
+            complete[0] += self.line_length
+            i = max(range(len(complete)), key=complete.__getitem__)
+            if complete[i] > self.longest[0]:
+                self.longest = (complete[i], self.line_no + i + 1)
+            self.line_no += len(complete)
+            self.line_length = partial
+        else:
+            self.line_length += partial
+        if self.encoding == 'binaire':
+            return
+        # Mots les plus fréquents : le mot coupé en fin de bloc est reporté (borné à FILE_MAX_WORD)
+        cut = max(chunk.rfind(c) for c in _ASCII_WHITESPACE)
+        if cut < 0:
+            data, self.tail = b'', self.tail + chunk
+        else:
+            data, self.tail = self.tail + chunk[:cut + 1], chunk[cut + 1:]
+        if len(self.tail) > FILE_MAX_WORD:
+            data, self.tail = data + self.tail, b''
+        self._count_words(data)
+
+    def _count_words(self, data):
+        self.top_words.update(data.translate(_WORD_BYTES).lower().split())  # Comptage en C, décodage à la fin
+
+    def finish(self):
+        if self.size and self.last_byte != 10:
+            self.lines += 1  # Dernière ligne sans saut de ligne final, comme splitlines()
+            if self.line_length > self.longest[0]:
+                self.longest = (self.line_length, self.line_no + 1)
+        if self.tail:
+            self._count_words(self.tail)
+            self.tail = b''
+        # Clés en octets -> mots décodés ; la ponctuation non ASCII (’ « ») est retirée, les casses accentuées fusionnées
+        words = Counter()
+        for raw, count in self.top_words.items():
+            for word in _FILE_WORD.findall(raw.decode(self.text_encoding, errors='replace')):
+                words[word.lower()] += count
+        self.top_words = words
+        return self
+
+def analyze_file(path, details=False, chunk=FILE_CHUNK):
+    """FileStats d'un fichier lu par blocs de chunk octets"""
+    with open(path, 'rb') as f:
+        encoding = detect_encoding(f.read(FILE_SNIFF))
+        f.seek(0)
+        stats = FileStats(encoding, details)
+        if encoding in ('utf-16', 'utf-32'):
+            # Transcodage incrémental vers UTF-8 : les compteurs restent ceux d'un flux compatible ASCII
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            for block in iter(lambda: f.read(chunk), b''):
+                stats.feed(decoder.decode(block).encode('utf-8'))
+            stats.feed(decoder.decode(b'', final=True).encode('utf-8'))
+        else:
+            for block in iter(lambda: f.read(chunk), b''):
+                stats.feed(block)
+    return stats.finish()
+
+@benchmark('analyse-fichier')
+def bench_file_analysis():
+    """Fichier synthétique de FREEV_BENCH_MB Mo (1024 par défaut)"""
+    size_mb = int(os.environ.get('FREEV_BENCH_MB', '1024'))
+    line = "2024-05-01 12:00:00 INFO connexion acceptée depuis 192.168.1.12 utilisateur=freev durée=12ms\n".encode('utf-8')
+    block = line * ((1 << 20) // len(line) + 1)
+    path = Path(tempfile.gettempdir()) / f"freev-bench-{os.getpid()}.log"
+    try:
+        with open(path, 'wb') as f:
+            for _ in range(size_mb):
+                f.write(block[:1 << 20])
+        size = path.stat().st_size / (1 << 20)
+        for details in (False, True):
+            seconds, stats = timed(analyze_file, path, details)
+            label = "avec top mots/ligne max/histogramme" if details else "lignes/mots/caractères"
+            print(f"{size:.0f} Mo, {label} : {seconds:.2f} s, {size / seconds:.0f} Mo/s ({stats.lines} lignes, {stats.words} mots)")
+    finally:
+        path.unlink(missing_ok=True)
+
+# --- Fin de l'analyse de fichiers ---
+
+# --- Comparaison de fichiers : lignes -> entiers, préfixe/suffixe communs, patience puis Myers ---
+
+DIFF_CHUNK = 1 << 20
+DIFF_CONTEXT = 3              # Lignes de contexte autour de chaque hunk
+DIFF_MAX_SHOWN = 400          # Lignes de diff affichées, les suivantes sont seulement comptées
+DIFF_MAX_EDITS = 1000         # Au-delà de D éditions, Myers abandonne : la zone est remplacée en bloc
+
+def file_digest(path, chunk=DIFF_CHUNK, digest_size=64):
+    """Empreinte BLAKE2b d'un fichier lu par blocs"""
+    digest = hashlib.blake2b(digest_size=digest_size)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk), b''):
+            digest.update(block)
+    return digest.digest()
+
+def first_difference(path_a, path_b, chunk=DIFF_CHUNK):
+    """Position du premier octet différent, None si les fichiers sont identiques"""
+    offset = 0
+    with open(path_a, 'rb') as fa, open(path_b, 'rb') as fb:
+        while True:
+            a, b = fa.read(chunk), fb.read(chunk)
+            if a != b:
+                return offset + len(os.path.commonprefix([a, b]))
+            if not a:
+                return None
+            offset += len(a)
+
+def _read_lines(path):
+    """Lignes (fins de ligne conservées) décodées selon l'encodage détecté, None si binaire"""
+    data = Path(path).read_bytes()
+    encoding = detect_encoding(data[:FILE_SNIFF])
+    if encoding == 'binaire':
+        return None
+    return data.decode(encoding, errors='replace').splitlines(keepends=True)
+
+def _patience_anchors(a, alo, ahi, b, blo, bhi):
+    """Lignes présentes une seule fois de chaque côté, dans leur plus longue sous-suite commune"""
+    count_a = Counter(a[alo:ahi])
+    count_b = Counter(b[blo:bhi])
+    index_b = {b[j]: j for j in range(blo, bhi) if count_b[b[j]] == 1}
+    pairs = [(i, index_b[a[i]]) for i in range(alo, ahi) if count_a[a[i]] == 1 and a[i] in index_b]
+    # Tri de patience : plus longue sous-suite croissante des positions dans b
+    tails, tops, back = [], [], [None] * len(pairs)
+    for n, (_, j) in enumerate(pairs):
+        k = bisect_left(tails, j)
+        back[n] = tops[k - 1] if k else None
+        if k == len(tails):
+            tails.append(j)
+            tops.append(n)
+        else:
+            tails[k], tops[k] = j, n
+    chain, n = [], tops[-1] if tops else None
+    while n is not None:
+        chain.append(pairs[n])
+        n = back[n]
+    return chain[::-1]
+
+def _myers(a, alo, ahi, b, blo, bhi, max_edits=DIFF_MAX_EDITS):
+    """Correspondances (i, j) d'un script d'édition minimal, O((N+M)·D) ; None si D > max_edits"""
+    n, m = ahi - alo, bhi - blo
+    limit = min(n + m, max_edits)
+    off = limit + 1
+    v = [0] * (2 * limit + 3)
+    trace = []
+    for d in range(limit + 1):
+        trace.append(v[off - d - 1:off + d + 2])  # Diagonales -d-1..d+1 avant l'étape d
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[off + k - 1] < v[off + k + 1]):
+                x = v[off + k + 1]
+            else:
+                x = v[off + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[off + k] = x
+            if x >= n and y >= m:
+                break
+        else:
+            continue
+        break
+    else:
+        return None
+    # Retour arrière le long des diagonales parcourues
+    matches = []
+    for d in range(len(trace) - 1, 0, -1):
+        prev, k = trace[d], x - y
+        if k == -d or (k != d and prev[k - 1 + d + 1] < prev[k + 1 + d + 1]):
+            pk = k + 1
+        else:
+            pk = k - 1
+        px = prev[pk + d + 1]
+        py = px - pk
+        while x > px and y > py:
+            x -= 1
+            y -= 1
+            matches.append((alo + x, blo + y))
+        x, y = px, py
+    while x > 0 and y > 0:
+        x -= 1
+        y -= 1
+        matches.append((alo + x, blo + y))
+    matches.reverse()
+    return matches
+
+def _match_lines(a, alo, ahi, b, blo, bhi, out):
+    """Ajoute à out les blocs (i, j, taille) communs de a[alo:ahi] et b[blo:bhi], dans l'ordre"""
+    prefix = 0
+    while alo + prefix < ahi and blo + prefix < bhi and a[alo + prefix] == b[blo + prefix]:
+        prefix += 1
+    suffix = 0
+    while alo + prefix < ahi - suffix and blo + prefix < bhi - suffix and a[ahi - suffix - 1] == b[bhi - suffix - 1]:
+        suffix += 1
+    if prefix:
+        out.append((alo, blo, prefix))
+    alo, blo, ahi, bhi = alo + prefix, blo + prefix, ahi - suffix, bhi - suffix
+    if alo < ahi and blo < bhi:
+        anchors = _patience_anchors(a, alo, ahi, b, blo, bhi)
+        if anchors:
+            for i, j in anchors:
+                _match_lines(a, alo, i, b, blo, j, out)
+                out.append((i, j, 1))
+                alo, blo = i + 1, j + 1
+            _match_lines(a, alo, ahi, b, blo, bhi, out)
+        else:
+            out.extend((i, j, 1) for i, j in _myers(a, alo, ahi, b, blo, bhi) or ())
+    if suffix:
+        out.append((ahi, bhi, suffix))
+
+def matching_blocks(a, b):
+    """Blocs communs fusionnés (i, j, taille) de deux suites d'entiers, terminés par (len(a), len(b), 0)"""
+    raw, blocks = [], []
+    _match_lines(a, 0, len(a), b, 0, len(b), raw)
+    for i, j, size in raw:
+        if blocks and blocks[-1][0] + blocks[-1][2] == i and blocks[-1][1] + blocks[-1][2] == j:
+            blocks[-1][2] += size
+        else:
+            blocks.append([i, j, size])
+    blocks.append([len(a), len(b), 0])
+    return blocks
+
+def diff_opcodes(a, b):
+    """Opérations (tag, i1, i2, j1, j2) au format de difflib.SequenceMatcher.get_opcodes()"""
+    i = j = 0
+    for ai, bj, size in matching_blocks(a, b):
+        tag = 'replace' if i < ai and j < bj else 'delete' if i < ai else 'insert' if j < bj else None
+        if tag:
+            yield tag, i, ai, j, bj
+        if size:
+            yield 'equal', ai, ai + size, bj, bj + size
+        i, j = ai + size, bj + size
+
+def grouped_opcodes(opcodes, context=DIFF_CONTEXT):
+    """Regroupe les opérations en hunks entourés de `context` lignes communes (comme difflib)"""
+    codes = list(opcodes)
+    if not codes:
+        return
+    if codes[0][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == 'equal' and i2 - i1 > 2 * context:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == 'equal'):
+        yield group
+
+def _unified_range(start, stop):
+    """Plage « début,longueur » d'un en-tête @@ (format unifié)"""
+    length = stop - start
+    if length == 1:
+        return f"{start + 1}"
+    return f"{start + 1 if length else start},{length}"
+
+def unified_hunks(lines_a, lines_b, context=DIFF_CONTEXT):
+    """Hunks au format unifié (listes de lignes sans fin de ligne), produits au fur et à mesure"""
+    table = {}
+    a = [table.setdefault(line, len(table)) for line in lines_a]  # Chaque ligne distincte -> un entier
+    b = [table.setdefault(line, len(table)) for line in lines_b]
+    for group in grouped_opcodes(diff_opcodes(a, b), context):
+        first, last = group[0], group[-1]
+        hunk = [f"@@ -{_unified_range(first[1], last[2])} +{_unified_range(first[3], last[4])} @@"]
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                hunk.extend(' ' + line.rstrip('\r\n') for line in lines_a[i1:i2])
+                continue
+            hunk.extend('-' + line.rstrip('\r\n') for line in lines_a[i1:i2])
+            hunk.extend('+' + line.rstrip('\r\n') for line in lines_b[j1:j2])
+        yield hunk
+
+def compare_files(path_a, path_b):
+    """('identiques', None), ('binaires', premier octet différent) ou ('texte', générateur de hunks)"""
+    if os.path.getsize(path_a) == os.path.getsize(path_b) and file_digest(path_a) == file_digest(path_b):
+        return 'identiques', None
+    lines_a, lines_b = _read_lines(path_a), _read_lines(path_b)
+    if lines_a is None or lines_b is None:
+        return 'binaires', first_difference(path_a, path_b)
+    return 'texte', unified_hunks(lines_a, lines_b)
+
+@benchmark('diff')
+def bench_diff():
+    """Fichiers de 100 000 lignes avec modifications éparses, comparés à difflib"""
+    rng = random.Random(40)
+    words = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda".split()
+    base = [f"{i:06d} {' '.join(rng.choices(words, k=6))}\n" for i in range(100_000)]
+    for edits in (10, 100, 1000):
+        changed = list(base)
+        for _ in range(edits):
+            pos = rng.randrange(len(changed))
+            kind = rng.random()
+            if kind < 0.4:
+                changed[pos] = f"modifié {rng.random()}\n"
+            elif kind < 0.7:
+                del changed[pos]
+            else:
+                changed.insert(pos, f"ajout {rng.random()}\n")
+        seconds, hunks = timed(lambda: list(unified_hunks(base, changed)))
+        reference, expected = timed(lambda: list(difflib.unified_diff(base, changed, n=DIFF_CONTEXT)))
+        ours = sum(len(h) for h in hunks)
+        print(f"{edits:>5} éditions : {seconds * 1000:7.1f} ms, {len(hunks)} hunks, {ours} lignes "
+              f"(difflib : {reference * 1000:7.1f} ms, {len(expected) - 2} lignes)")
+
+# --- Fin de la comparaison de fichiers ---
+
+# --- Explorateur récursif : os.scandir, pool de threads, tailles cumulées (du) ---
+
+EXPLORE_WORKERS = 8           # Threads de lecture des dossiers (attente disque / réseau, pas de calcul)
+EXPLORE_TOP = 10
+EXPLORE_PROGRESS = 0.5        # Secondes entre deux rafraîchissements de la progression
+_SIZE_UNITS = ('o', 'Ko', 'Mo', 'Go', 'To', 'Po')
+
+def format_size(size):
+    """Taille lisible en puissances de 1024 (« 12.3 Mo »)"""
+    value = float(size)
+    for unit in _SIZE_UNITS:
+        if value < 1024 or unit == _SIZE_UNITS[-1]:
+            return f"{int(value)} {unit}" if unit == 'o' else f"{value:.1f} {unit}"
+        value /= 1024
+
+def ignore_matcher(patterns):
+    """Fonction nom -> correspondance pour des motifs fnmatch (*.log, node_modules...), None si aucun"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(p) for p in patterns)).match
+
+def _scan_directory(path, ignore, top):
+    """Tâche du pool : un seul niveau lu par scandir (un stat par fichier, aucun pour les dossiers)"""
+    size = count = errors = 0
+    subdirs, largest = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if ignore and ignore(entry.name):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    file_size = entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    errors += 1
+                    continue
+                size += file_size
+                count += 1
+                if len(largest) < top:
+                    heappush(largest, (file_size, entry.path))
+                elif file_size > largest[0][0]:
+                    heapreplace(largest, (file_size, entry.path))
+    except OSError:
+        errors += 1
+    return size, count, subdirs, largest, errors
+
+class TreeScan:
+    """Résultat d'un parcours : taille propre et cumulée de chaque dossier, plus gros fichiers"""
+
+    def __init__(self, root, top=EXPLORE_TOP):
+        self.root = root
+        self.top = top
+        self.dirs = {}          # chemin -> [parent, profondeur, taille cumulée]
+        self.files = 0
+        self.size = 0
+        self.errors = 0
+        self.largest = []       # Tas borné (taille, chemin)
+
+    def add(self, path, parent, depth, size, count, largest, errors):
+        self.dirs[path] = [parent, depth, size]
+        self.files += count
+        self.size += size
+        self.errors += errors
+        for item in largest:
+            if len(self.largest) < self.top:
+                heappush(self.largest, item)
+            elif item[0] > self.largest[0][0]:
+                heapreplace(self.largest, item)
+
+    def finish(self):
+        """Cumule les tailles vers les parents, des dossiers les plus profonds vers la racine"""
+        for path in sorted(self.dirs, key=lambda p: self.dirs[p][1], reverse=True):
+            parent, _, total = self.dirs[path]
+            if parent is not None:
+                self.dirs[parent][2] += total
+        return self
+
+    def largest_files(self):
+        return sorted(self.largest, reverse=True)
+
+    def largest_dirs(self, count=EXPLORE_TOP, max_depth=None):
+        """Plus gros sous-dossiers (la racine exclue), limités à max_depth niveaux sous la racine"""
+        dirs = ((total, path) for path, (_, depth, total) in self.dirs.items()
+                if depth and (max_depth is None or depth <= max_depth))
+        return nlargest(count, dirs)
+
+def scan_tree(root, ignore=(), top=EXPLORE_TOP, workers=EXPLORE_WORKERS, progress=None):
+    """Parcourt root récursivement (liens symboliques non suivis) ; progress(scan) est appelé régulièrement"""
+    scan = TreeScan(os.path.abspath(root), top)
+    matcher = ignore_matcher(ignore)
+    done = queue.SimpleQueue()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def submit(path, parent, depth):
+            future = pool.submit(_scan_directory, path, matcher, top)
+            future.add_done_callback(lambda f: done.put((f, path, parent, depth)))
+        submit(scan.root, None, 0)
+        pending, last = 1, time.monotonic()
+        while pending:
+            future, path, parent, depth = done.get()
+            pending -= 1
+            size, count, subdirs, largest, errors = future.result()
+            scan.add(path, parent, depth, size, count, largest, errors)
+            for sub in subdirs:
+                submit(sub, path, depth + 1)
+            pending += len(subdirs)
+            if progress and time.monotonic() - last >= EXPLORE_PROGRESS:
+                progress(scan)
+                last = time.monotonic()
+    return scan.finish()
+
+def _listdir_tree(root):
+    """Ancienne méthode appliquée à tout l'arbre : listdir puis isfile/getsize/isdir par entrée"""
+    total, stack = 0, [root]
+    while stack:
+        path = stack.pop()
+        for name in os.listdir(path):
+            full_path = os.path.join(path, name)
+            if os.path.isfile(full_path):
+                total += os.path.getsize(full_path)
+            elif os.path.isdir(full_path) and not os.path.islink(full_path):
+                stack.append(full_path)
+    return total
+
+@benchmark('explorateur')
+def bench_explorer():
+    """Arbre synthétique de FREEV_BENCH_FILES fichiers (20 000 par défaut), 50 fichiers par dossier"""
+    files = int(os.environ.get('FREEV_BENCH_FILES', '20000'))
+    with tempfile.TemporaryDirectory(prefix='freev-bench-') as root:
+        for n in range(files):
+            folder = os.path.join(root, f"d{n // 2500}", f"s{n // 50}")
+            if n % 50 == 0:
+                os.makedirs(folder)
+            with open(os.path.join(folder, f"f{n}.txt"), 'wb') as f:
+                f.write(b'x' * (n % 997))
+        seconds, total = timed(_listdir_tree, root, repeat=3)
+        print(f"{'listdir + isfile/getsize':<26}: {seconds * 1000:7.1f} ms ({files} fichiers, {format_size(total)})")
+        for workers in (1, EXPLORE_WORKERS):
+            seconds, scan = timed(lambda: scan_tree(root, workers=workers), repeat=3)
+            print(f"{f'scandir, {workers} thread(s)':<26}: {seconds * 1000:7.1f} ms ({scan.files} fichiers, "
+                  f"{len(scan.dirs)} dossiers, {format_size(scan.size)}, {'ok' if scan.size == total else 'ÉCART'})")
+
+# --- Fin de l'explorateur ---
+
+# --- Doublons : taille, puis début/fin (64 Kio), puis contenu complet ; cache persistant ---
+
+DUP_BLOCK = 1 << 16           # Octets lus au début et à la fin pour la deuxième étape
+DUP_WORKERS = 4               # hashlib libère le GIL : des threads suffisent pour paralléliser la lecture
+DUP_SHOWN = 20
+DUP_CACHE_FILE = Path.home() / ".freev_hashes.json"
+
+def iter_files(root, ignore=None):
+    """(chemin, stat) de chaque fichier régulier sous root, liens symboliques non suivis"""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if ignore and ignore(entry.name):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry.path, entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+def partial_digest(path, size, block=DUP_BLOCK):
+    """Empreinte du premier et du dernier bloc ; pour size <= 2 blocs, c'est celle du contenu complet"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        digest.update(f.read(block))
+        if size > 2 * block:
+            f.seek(size - block)
+        digest.update(f.read(block if size > 2 * block else size))
+    return digest.hexdigest()
+
+def content_digest(path, size=None):
+    """Empreinte du contenu complet (même taille d'empreinte que partial_digest)"""
+    return file_digest(path, digest_size=16).hex()
+
+class HashCache:
+    """Empreintes persistantes par (périphérique, inode), valables tant que taille et mtime sont inchangés"""
+
+    def __init__(self, path=DUP_CACHE_FILE):
+        self.path = Path(path)
+        self.dirty = False
+        try:
+            self.entries = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, st, kind):
+        """kind 0 : empreinte début/fin, 1 : contenu complet"""
+        entry = self.entries.get(f"{st.st_dev}:{st.st_ino}")
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2 + kind]
+        return None
+
+    def put(self, st, kind, digest):
+        key = f"{st.st_dev}:{st.st_ino}"
+        entry = self.entries.get(key)
+        if not entry or entry[0] != st.st_size or entry[1] != st.st_mtime_ns:
+            entry = self.entries[key] = [st.st_size, st.st_mtime_ns, None, None]
+        entry[2 + kind] = digest
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        tmp.write_text(json.dumps(self.entries, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp, self.path)  # Remplacement atomique : jamais de cache à moitié écrit
+        self.dirty = False
+
+def _digest_or_none(digest, path, size):
+    try:
+        return digest(path, size)
+    except OSError:
+        return None  # Fichier disparu ou illisible entre-temps
+
+def _refine(groups, kind, digest, pool, cache, stats):
+    """Scinde chaque groupe selon une empreinte : cache d'abord, le reste calculé dans le pool"""
+    known, todo = {}, []
+    for group in groups:
+        for path, st in group:
+            found = cache.get(st, kind) if cache else None
+            if found is None:
+                todo.append((path, st))
+            else:
+                known[path] = found
+    stats['en cache'] += len(known)
+    results = pool.map(lambda item: _digest_or_none(digest, item[0], item[1].st_size), todo)
+    for (path, st), found in zip(todo, results):
+        if found is not None:
+            known[path] = found
+            stats['calculées'] += 1
+            if cache:
+                cache.put(st, kind, found)
+    refined = []
+    for group in groups:
+        buckets = {}
+        for path, st in group:
+            if path in known:
+                buckets.setdefault(known[path], []).append((path, st))
+        refined.extend(bucket for bucket in buckets.values() if len(bucket) > 1)
+    return refined
+
+def find_duplicates(root, ignore=(), workers=DUP_WORKERS, cache=None):
+    """Groupes (taille, [chemins]) de fichiers identiques, du plus grand gaspillage au plus petit
+
+    Les fichiers vides et les liens durs vers un même inode ne sont pas des doublons."""
+    stats = Counter()
+    by_size, seen = {}, set()
+    for path, st in iter_files(os.path.abspath(root), ignore_matcher(ignore)):
+        stats['fichiers'] += 1
+        if not st.st_size or (st.st_dev, st.st_ino) in seen:
+            continue
+        seen.add((st.st_dev, st.st_ino))
+        by_size.setdefault(st.st_size, []).append((path, st))
+    groups = [group for group in by_size.values() if len(group) > 1]
+    stats['même taille'] = sum(len(group) for group in groups)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        groups = _refine(groups, 0, partial_digest, pool, cache, stats)
+        # Petits fichiers : l'empreinte début/fin couvrait déjà tout le contenu
+        small = [group for group in groups if group[0][1].st_size <= 2 * DUP_BLOCK]
+        large = [group for group in groups if group[0][1].st_size > 2 * DUP_BLOCK]
+        groups = small + _refine(large, 1, content_digest, pool, cache, stats)
+    if cache:
+        cache.save()
+    result = [(group[0][1].st_size, sorted(path for path, _ in group)) for group in groups]
+    result.sort(key=lambda item: item[0] * (len(item[1]) - 1), reverse=True)
+    return result, stats
+
+@benchmark('doublons')
+def bench_duplicates():
+    """2 000 fichiers sur trois tailles seulement, dont un sur dix est la copie d'un autre"""
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory(prefix='freev-bench-') as root:
+        written, total = [], 0
+        for n in range(2000):
+            data = written[rng.randrange(len(written))] if n % 10 == 9 else rng.randbytes(rng.choice((4096, 50_000, 500_000)))
+            written.append(data)
+            folder = os.path.join(root, f"d{n // 100}")
+            os.makedirs(folder, exist_ok=True)
+            Path(folder, f"f{n}.bin").write_bytes(data)
+            total += len(data)
+        cache_path = Path(root) / 'cache.json'
+        seconds, _ = timed(lambda: {content_digest(p) for p, _ in iter_files(root)})
+        print(f"{'tout hacher':<22}: {seconds:6.2f} s ({format_size(total)})")
+        for label in ('étapes, cache vide', 'étapes, cache chaud'):
+            seconds, (groups, stats) = timed(lambda: find_duplicates(root, cache=HashCache(cache_path)))
+            wasted = sum(size * (len(paths) - 1) for size, paths in groups)
+            print(f"{label:<22}: {seconds:6.2f} s ({len(groups)} groupes, {format_size(wasted)} récupérables, "
+                  f"{stats['calculées']} empreintes calculées, {stats['en cache']} en cache)")
+
+# --- Fin des doublons ---
+
+# --- Recherche plein texte : signatures de trigrammes par fichier (SQLite), confirmation par regex ---
+
+SEARCH_BITS = 1 << 13         # Bits par signature : 1 Kio par fichier, ~17 % de bits à 1 pour 1 500 trigrammes
+SEARCH_MAX_FILE = 1 << 22     # Au-delà, le fichier n'est pas indexé et reste toujours candidat
+SEARCH_BATCH = 256            # Fichiers indexés entre deux écritures : mémoire bornée pendant l'indexation
+SEARCH_MAX_RESULTS = 50
+SEARCH_IGNORE = ('.git', '.hg', '.svn', '__pycache__', 'node_modules', '.freev_index')
+SEARCH_INDEX_DIR = Path.home() / ".freev_index"
+_SEARCH_SHIFT = 32 - SEARCH_BITS.bit_length() + 1
+_REGEX_SPECIAL = set('.^$*+?{}[]()|')
+
+def trigram_bits(data):
+    """Positions de bit des trigrammes d'octets de data (hachage multiplicatif sur 32 bits)"""
+    if len(data) < 3:
+        return set()
+    if np is not None:
+        a = np.frombuffer(data, dtype=np.uint8).astype(np.uint32)
+        grams = (a[:-2] << 16) | (a[1:-1] << 8) | a[2:]
+        return set(np.unique((grams * np.uint32(2654435761)) >> np.uint32(_SEARCH_SHIFT)).tolist())
+    grams = {data[i:i + 3] for i in range(len(data) - 2)}
+    return {(int.from_bytes(g, 'big') * 2654435761 & 0xFFFFFFFF) >> _SEARCH_SHIFT for g in grams}
+
+def trigram_signature(data):
+    """Signature de SEARCH_BITS bits (octets, petit-boutiste) des trigrammes de data"""
+    if np is not None and len(data) >= 3:
+        bits = np.zeros(SEARCH_BITS, dtype=bool)
+        bits[list(trigram_bits(data))] = True
+        return np.packbits(bits, bitorder='little').tobytes()
+    value = 0
+    for bit in trigram_bits(data):
+        value |= 1 << bit
+    return value.to_bytes(SEARCH_BITS // 8, 'little')
+
+def regex_literals(pattern):
+    """Morceaux littéraux (>= 3 caractères) présents dans toute correspondance de pattern ; [] si inconnu"""
+    if '|' in pattern:
+        return []
+    runs, run, groups, i = [], '', [], 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\' and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            i += 2
+            if nxt.isalnum():  # \d, \w, \b... : classe ou assertion, pas un littéral
+                runs.append(run)
+                run = ''
+                continue
+            c = nxt
+        elif c in _REGEX_SPECIAL:
+            if c in '*?{' and run:
+                run = run[:-1]  # Le caractère précédent est optionnel
+            runs.append(run)
+            run = ''
+            i += 1
+            if c == '[':
+                i = pattern.find(']', i + 1) + 1 or len(pattern)
+            elif c == '{':
+                i = pattern.find('}', i) + 1 or len(pattern)
+            elif c == '(':
+                if pattern.startswith('?:', i):
+                    i += 2
+                elif pattern.startswith('?P<', i):
+                    i = pattern.find('>', i) + 1 or len(pattern)
+                elif pattern.startswith('?', i):
+                    return []  # Assertions, drapeaux en ligne... : pas de littéral garanti
+                groups.append(len(runs))
+            elif c == ')' and groups:
+                start = groups.pop()
+                if pattern[i:i + 1] in ('?', '*', '{'):
+                    del runs[start:]  # Groupe optionnel : ses littéraux ne sont pas exigés
+            continue
+        else:
+            i += 1
+        run += c
+    runs.append(run)
+    return [r for r in runs if len(r) >= 3]
+
+class TextIndex:
+    """Index de recherche d'une arborescence, stocké dans ~/.freev_index/<empreinte du chemin>.sqlite
+
+    Chaque fichier texte garde sa taille, son mtime, son encodage et sa signature de trigrammes ;
+    une requête ET les bits de ses trigrammes sur toutes les signatures, puis vérifie les candidats."""
+
+    def __init__(self, root, path=None):
+        self.root = os.path.abspath(root)
+        if path is None:
+            SEARCH_INDEX_DIR.mkdir(exist_ok=True)
+            path = SEARCH_INDEX_DIR / f"{hashlib.blake2b(self.root.encode('utf-8'), digest_size=8).hexdigest()}.sqlite"
+        self.db = sqlite3.connect(str(path))
+        self.db.execute("PRAGMA synchronous=OFF")  # Index reconstructible : la durabilité ne sert à rien
+        # state : 1 indexé, 0 trop gros (toujours candidat), -1 binaire (jamais candidat)
+        self.db.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, "
+                        "state INTEGER, encoding TEXT, sig BLOB)")
+
+    def close(self):
+        self.db.close()
+
+    @staticmethod
+    def _entry(path, size):
+        """(state, encodage, signature) d'un fichier"""
+        with open(path, 'rb') as f:
+            data = f.read(SEARCH_MAX_FILE + 1 if size <= SEARCH_MAX_FILE else FILE_SNIFF)
+        encoding = detect_encoding(data[:FILE_SNIFF])
+        if encoding == 'binaire':
+            return -1, encoding, None
+        if size > SEARCH_MAX_FILE:
+            return 0, encoding, None
+        return 1, encoding, trigram_signature(data.decode(encoding, errors='replace').lower().encode('utf-8'))
+
+    def update(self, ignore=SEARCH_IGNORE):
+        """Indexe les fichiers nouveaux ou modifiés (taille ou mtime), oublie les disparus"""
+        known = {path: (size, mtime) for path, size, mtime in self.db.execute("SELECT path, size, mtime FROM files")}
+        stats, batch = Counter(), []
+        for path, st in iter_files(self.root, ignore_matcher(ignore)):
+            stats['fichiers'] += 1
+            if known.pop(path, None) == (st.st_size, st.st_mtime_ns):
+                continue
+            try:
+                batch.append((path, st.st_size, st.st_mtime_ns) + self._entry(path, st.st_size))
+            except OSError:
+                continue
+            if len(batch) >= SEARCH_BATCH:
+                stats['indexés'] += self._write(batch)
+        stats['indexés'] += self._write(batch)
+        self.db.executemany("DELETE FROM files WHERE path = ?", ((path,) for path in known))
+        self.db.commit()
+        stats['oubliés'] = len(known)
+        return stats
+
+    def _write(self, batch):
+        count = len(batch)
+        self.db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", batch)
+        self.db.commit()
+        batch.clear()
+        return count
+
+    def candidates(self, literals):
+        """[(chemin, encodage)] des fichiers dont la signature contient tous les trigrammes des littéraux"""
+        rows = self.db.execute("SELECT path, encoding, state, sig FROM files WHERE state >= 0 ORDER BY path").fetchall()
+        bits = sorted(set().union(*(trigram_bits(lit.lower().encode('utf-8')) for lit in literals)))
+        indexed = [row for row in rows if row[2] == 1]
+        if not bits:
+            keep = indexed
+        elif np is not None and indexed:
+            sigs = np.frombuffer(b''.join(row[3] for row in indexed), dtype=np.uint8).reshape(len(indexed), -1)
+            mask = np.ones(len(indexed), dtype=bool)
+            for bit in bits:
+                mask &= (sigs[:, bit >> 3] >> (bit & 7)) & 1 == 1
+            keep = [indexed[i] for i in np.flatnonzero(mask)]
+        else:
+            wanted = sum(1 << bit for bit in bits)
+            keep = [row for row in indexed if int.from_bytes(row[3], 'little') & wanted == wanted]
+        return [(path, encoding) for path, encoding, _, _ in keep] + [(row[0], row[1]) for row in rows if row[2] == 0]
+
+    def search(self, regex, literals):
+        """Génère (chemin, n° de ligne, ligne) pour chaque ligne des candidats où regex correspond"""
+        for path, encoding in self.candidates(literals):
+            try:
+                with open(path, encoding=encoding, errors='replace', newline='') as f:
+                    for line_no, line in enumerate(f, 1):
+                        if regex.search(line):
+                            yield path, line_no, line.rstrip('\r\n')
+            except OSError:
+                continue
+
+def search_pattern(pattern):
+    """(regex insensible à la casse, littéraux exigés) : /motif/ est une regex, sinon un texte exact"""
+    if len(pattern) > 2 and pattern[0] == pattern[-1] == '/':
+        source = pattern[1:-1]
+        return re.compile(source, re.IGNORECASE), regex_literals(source)
+    return re.compile(re.escape(pattern), re.IGNORECASE), [pattern]
+
+@benchmark('recherche')
+def bench_search():
+    """Arbre de 10 000 fichiers source synthétiques : indexation, mise à jour incrémentale, requêtes"""
+    rng = random.Random(43)
+    words = [''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=rng.randint(3, 10))) for _ in range(5000)]
+    with tempfile.TemporaryDirectory(prefix='freev-bench-') as root, tempfile.TemporaryDirectory() as store:
+        total = 0
+        for n in range(10_000):
+            folder = os.path.join(root, f"pkg{n // 200}")
+            os.makedirs(folder, exist_ok=True)
+            body = ''.join(f"def {rng.choice(words)}_{i}({rng.choice(words)}, {rng.choice(words)}):\n"
+                           f"    return {rng.choice(words)}({rng.choice(words)}) + {rng.randint(0, 999)}\n" for i in range(30))
+            total += Path(folder, f"mod{n}.py").write_text(body, encoding='utf-8')
+        index = TextIndex(root, Path(store) / 'index.sqlite')
+        seconds, stats = timed(index.update)
+        print(f"indexation initiale   : {seconds:6.2f} s ({stats['indexés']} fichiers, {format_size(total)})")
+        seconds, stats = timed(index.update)
+        print(f"mise à jour inchangée : {seconds * 1000:6.0f} ms ({stats['indexés']} réindexés)")
+        for n in range(0, 10_000, 1000):
+            with open(os.path.join(root, f"pkg{n // 200}", f"mod{n}.py"), 'a', encoding='utf-8') as f:
+                f.write(f"marqueur_unique_{n} = True\n")
+        seconds, stats = timed(index.update)
+        print(f"10 fichiers modifiés  : {seconds * 1000:6.0f} ms ({stats['indexés']} réindexés)")
+        for pattern in ('marqueur_unique_5000', f"{words[0]}_7(", '/return \\w+\\(zzq/', words[1]):
+            regex, literals = search_pattern(pattern)
+            seconds, found = timed(lambda: list(index.search(regex, literals)), repeat=3)
+            candidates = len(index.candidates(literals))
+            brute, expected = timed(lambda: [(p, n) for p, st in iter_files(root) if p.endswith('.py')
+                                             for n, line in enumerate(open(p, encoding='utf-8'), 1) if regex.search(line)])
+            print(f"{pattern[:28]:<28} : {seconds * 1000:6.1f} ms, {candidates:5} candidats, {len(found):4} lignes "
+                  f"(lecture complète : {brute * 1000:6.0f} ms, {'ok' if len(expected) == len(found) else 'ÉCART'})")
+        index.close()
+
+# --- Fin de la recherche plein texte ---
+
+# --- Scanner de ports asynchrone (localhost et hôtes déclarés par l'utilisateur uniquement) ---
+
+PORT_TIMEOUT = 0.5            # Secondes par tentative de connexion
+PORT_CONCURRENCY = 512        # Connexions simultanées au plus (descripteurs de fichiers)
+PORT_COMMON = (21, 22, 25, 53, 80, 110, 143, 443, 3000, 3306, 5000, 5432, 5900, 6379, 8000, 8080, 8443, 27017)
+SCAN_HOSTS_FILE = Path.home() / ".freev_scan_hosts"  # Un hôte à soi par ligne, en plus des adresses locales
+
+class ScanError(ValueError):
+    pass
+
+def parse_ports(spec):
+    """« 1-1024,8080 » -> liste triée de ports"""
+    ports = set()
+    for part in re.split(r'[,\s]+', spec.strip()):
+        if not part:
+            continue
+        low, _, high = part.partition('-')
+        if not low.isdigit() or (high and not high.isdigit()):
+            raise ScanError(f"Plage de ports invalide : {part}")
+        low, high = int(low), int(high or low)
+        if not 1 <= low <= high <= 65535:
+            raise ScanError(f"Ports entre 1 et 65535 : {part}")
+        ports.update(range(low, high + 1))
+    return sorted(ports)
+
+def _local_addresses():
+    """Adresses IP de cette machine (interfaces via psutil si présent, sinon résolution du nom d'hôte)"""
+    addresses = set()
+    if psutil is not None:
+        for snics in psutil.net_if_addrs().values():
+            addresses.update(snic.address.split('%')[0] for snic in snics if snic.family in (socket.AF_INET, socket.AF_INET6))
+    try:
+        addresses.update(socket.gethostbyname_ex(socket.gethostname())[2])
+    except OSError:
+        pass
+    return addresses
+
+def resolve_scan_target(host):
+    """(famille, adresse) si host est la machine locale ou un hôte listé dans SCAN_HOSTS_FILE, sinon ScanError"""
+    try:
+        family, _, _, _, sockaddr = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)[0]
+    except (OSError, UnicodeError):
+        raise ScanError(f"Hôte introuvable : {host}")
+    address = sockaddr[0]
+    try:
+        declared = {line.strip() for line in SCAN_HOSTS_FILE.read_text(encoding='utf-8').splitlines()}
+    except OSError:
+        declared = set()
+    if ipaddress.ip_address(address).is_loopback or address in _local_addresses() or {host, address} & declared:
+        return family, address
+    raise ScanError(f"{host} n'est ni cette machine ni un hôte déclaré dans {SCAN_HOSTS_FILE}")
+
+@lru_cache(maxsize=None)
+def service_name(port):
+    try:
+        return socket.getservbyport(port, 'tcp')
+    except OSError:
+        return '?'
+
+async def _probe(loop, family, address, port, timeout):
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    try:
+        if hasattr(asyncio, 'timeout'):  # Python 3.11+ : délai sans tâche intermédiaire, deux fois plus rapide
+            async with asyncio.timeout(timeout):
+                await loop.sock_connect(sock, (address, port))
+        else:
+            await asyncio.wait_for(loop.sock_connect(sock, (address, port)), timeout)
+        return True
+    except (OSError, asyncio.TimeoutError):
+        return False
+    finally:
+        sock.close()
+
+async def _scan(family, address, ports, on_open, concurrency, timeout):
+    loop = asyncio.get_running_loop()
+    pending = iter(ports)
+    found = []
+
+    async def worker():
+        # Un nombre fixe de travailleurs borne la concurrence comme un sémaphore, sans 65 535 tâches en attente
+        for port in pending:
+            if await _probe(loop, family, address, port, timeout):
+                found.append(port)
+                if on_open:
+                    on_open(port)
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(ports)) or 1)))
+    return sorted(found)
+
+def scan_ports(host, ports, on_open=None, concurrency=PORT_CONCURRENCY, timeout=PORT_TIMEOUT):
+    """Ports ouverts de host parmi ports ; on_open(port) est appelé dès qu'un port répond"""
+    family, address = resolve_scan_target(host)
+    return asyncio.run(_scan(family, address, ports, on_open, concurrency, timeout))
+
+@benchmark('ports')
+def bench_ports():
+    """Scan 1-65535 de 127.0.0.1 avec cinq écouteurs locaux ouverts pour l'occasion"""
+    listeners = []
+    try:
+        for _ in range(5):
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.bind(('127.0.0.1', 0))
+            server.listen(16)
+            listeners.append(server)
+        expected = {server.getsockname()[1] for server in listeners}
+        streamed = []
+        seconds, found = timed(lambda: scan_ports('127.0.0.1', range(1, 65536), streamed.append))
+        missing = expected - set(found)
+        print(f"65 535 ports : {seconds:.2f} s ({65535 / seconds:,.0f} ports/s), {len(found)} ouverts dont les "
+              f"{len(expected)} écouteurs : {'ok' if not missing and sorted(streamed) == found else f'ÉCART {sorted(missing)}'}")
+        sequential = len(PORT_COMMON) * PORT_TIMEOUT
+        seconds, _ = timed(lambda: scan_ports('127.0.0.1', PORT_COMMON))
+        print(f"{len(PORT_COMMON)} ports courants : {seconds * 1000:.1f} ms (pire cas séquentiel : {sequential:.1f} s)")
+    finally:
+        for server in listeners:
+            server.close()
+
+# --- Fin du scanner de ports ---
+
+# --- Processus : échantillonneur en arrière-plan, %CPU par différence, historique en anneau ---
+
+PROC_INTERVAL = 1.0           # Secondes entre deux échantillons
+PROC_HISTORY = 60             # Échantillons gardés par processus
+PROC_TOP = 10
+PROC_REFRESHES = 15           # Rafraîchissements de la vue « top » avant de rendre la main
+_SPARK = '▁▂▃▄▅▆▇█'
+
+def sparkline(values, low=None, high=None):
+    """Mini-graphe d'une suite de valeurs sur une ligne (bornes automatiques par défaut)"""
+    values = list(values)
+    if not values:
+        return ''
+    low = min(values) if low is None else low
+    high = max(values) if high is None else high
+    span = (high - low) or 1
+    return ''.join(_SPARK[min(len(_SPARK) - 1, max(0, int((v - low) / span * len(_SPARK))))] for v in values)
+
+class ProcessSampler:
+    """Échantillonne les processus à intervalle fixe dans un thread démon
+
+    Les objets psutil.Process sont gardés d'un tour à l'autre (pas de réénumération complète), le %CPU
+    vient de la différence des temps CPU entre deux tours, et chaque processus garde ses PROC_HISTORY
+    derniers échantillons (cpu, rss) dans une deque bornée."""
+
+    def __init__(self, interval=PROC_INTERVAL, history=PROC_HISTORY):
+        self.interval = interval
+        self.history_size = history
+        self.procs = {}         # pid -> psutil.Process
+        self.previous = {}      # pid -> (temps CPU cumulé, instant de mesure)
+        self.history = {}       # pid -> deque[(cpu %, rss)]
+        self.latest = []        # [(cpu %, rss, pid, nom)] du dernier tour
+        self.costs = deque(maxlen=history)  # Temps CPU consommé par l'échantillonneur à chaque tour
+        self.samples = 0
+        self.total_memory = psutil.virtual_memory().total
+        self.lock = threading.Lock()
+        self.ready = threading.Event()  # Posé au deuxième tour : premier %CPU significatif
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        start = time.thread_time()
+        rows, alive = [], set()
+        for pid in psutil.pids():
+            proc = self.procs.get(pid)
+            try:
+                if proc is None:
+                    proc = self.procs[pid] = psutil.Process(pid)
+                with proc.oneshot():
+                    times = proc.cpu_times()
+                    rss = proc.memory_info().rss
+                    name = proc.name()
+            except psutil.Error:
+                continue
+            now = time.monotonic()
+            alive.add(pid)
+            cpu_total = times.user + times.system
+            previous = self.previous.get(pid)
+            self.previous[pid] = (cpu_total, now)
+            if previous is None or now <= previous[1]:
+                continue  # Nouveau processus : pas encore de différence à mesurer
+            cpu = max(0.0, (cpu_total - previous[0]) / (now - previous[1]) * 100)
+            rows.append((cpu, rss, pid, name))
+        with self.lock:
+            for pid in self.procs.keys() - alive:  # Processus terminés : caches purgés
+                self.procs.pop(pid, None)
+                self.previous.pop(pid, None)
+                self.history.pop(pid, None)
+            for cpu, rss, pid, _ in rows:
+                if pid not in self.history:
+                    self.history[pid] = deque(maxlen=self.history_size)
+                self.history[pid].append((cpu, rss))
+            self.latest = rows
+            self.samples += 1
+            self.costs.append(time.thread_time() - start)
+        if self.samples >= 2:
+            self.ready.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='freev-processus', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def top(self, key='cpu', count=PROC_TOP):
+        """[(cpu %, mem %, pid, nom, historique cpu)] triés par CPU ou par mémoire"""
+        with self.lock:
+            rows = sorted(self.latest, key=lambda row: row[0] if key == 'cpu' else row[1], reverse=True)[:count]
+            return [(cpu, rss / self.total_memory * 100, pid, name, [h[0] for h in self.history.get(pid, ())])
+                    for cpu, rss, pid, name in rows]
+
+    def cost(self):
+        """(ms CPU moyen par tour, part d'un cœur consommée)"""
+        with self.lock:
+            if not self.costs:
+                return 0.0, 0.0
+            mean = sum(self.costs) / len(self.costs)
+        return mean * 1000, mean / self.interval
+
+def format_process_table(rows):
+    lines = [f"{'PID':>7} {'%CPU':>6} {'%MEM':>6}  {'historique CPU':<20}  Nom"]
+    for cpu, mem, pid, name, history in rows:
+        lines.append(f"{pid:>7} {cpu:6.1f} {mem:6.1f}  {sparkline(history[-20:], 0, 100):<20}  {name[:30]}")
+    return lines
+
+@benchmark('processus')
+def bench_processes():
+    """Coût d'un tour d'échantillonnage comparé à process_iter avec cpu_percent"""
+    if psutil is None:
+        print("psutil absent : benchmark ignoré")
+        return
+    sampler = ProcessSampler()
+    sampler.sample()
+    seconds, _ = timed(sampler.sample, repeat=20)
+    cpu_ms, share = sampler.cost()
+    print(f"échantillonneur : {seconds * 1000:6.2f} ms par tour ({len(sampler.latest)} processus, "
+          f"{cpu_ms:.2f} ms CPU, {share:.2%} d'un cœur à {PROC_INTERVAL:g} s)")
+    seconds, _ = timed(lambda: [p.info for p in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent'])], repeat=20)
+    print(f"process_iter    : {seconds * 1000:6.2f} ms par appel")
+
+# --- Fin des processus ---
+
+# --- Métriques système : enregistreur en arrière-plan, fichier anneau d'enregistrements binaires fixes ---
+
+METRICS_FILE = Path.home() / ".freev_metrics.bin"
+METRICS_INTERVAL = 10.0       # Secondes entre deux enregistrements
+METRICS_SLOTS = 8640          # 24 h à 10 s : le fichier garde une taille fixe, les plus anciens sont écrasés
+METRICS_SPARK = 60            # Points des mini-graphes
+# (clé, libellé, unité) ; débits en octets par seconde
+METRICS_FIELDS = (('cpu', 'CPU', '%'), ('mem', 'Mémoire', '%'), ('disk', 'Disque', '%'), ('temp', 'Temp', '°C'),
+                  ('read', 'Lecture disque', 'o/s'), ('write', 'Écriture disque', 'o/s'),
+                  ('sent', 'Réseau envoi', 'o/s'), ('recv', 'Réseau réception', 'o/s'))
+_METRICS_MAGIC, _METRICS_VERSION = b'FRVM', 1
+_METRICS_HEADER = struct.Struct('<4sHHIfI')  # magie, version, cœurs, emplacements, intervalle, prochain emplacement
+_METRICS_LOCK_OFFSET = 1 << 30  # Octet verrouillé sous Windows, au-delà de tout fichier anneau
+_NAN = float('nan')
+
+def _metrics_record(cores):
+    """Enregistrement : horodatage, un float32 par métrique, %CPU de chaque cœur sur un octet"""
+    return struct.Struct(f'<d{len(METRICS_FIELDS)}f{cores}B')
+
+def system_temperature():
+    """Première température disponible (coretemp de préférence), NaN sinon"""
+    if psutil is None or not hasattr(psutil, "sensors_temperatures"):
+        return _NAN
+    temps = psutil.sensors_temperatures()
+    sensors = temps.get('coretemp') or next((s for s in temps.values() if s), None)
+    return sensors[0].current if sensors else _NAN
+
+def _busy_percent(previous, current):
+    """%CPU occupé entre deux relevés de cpu_times (inactif et attente E/S exclus)"""
+    total = sum(current) - sum(previous)
+    idle = (current.idle - previous.idle) + (getattr(current, 'iowait', 0) - getattr(previous, 'iowait', 0))
+    return max(0.0, min(100.0, (total - idle) / total * 100)) if total > 0 else 0.0
+
+class MetricsRecorder:
+    """Enregistre les métriques système à intervalle fixe dans METRICS_FILE
+
+    Mémoire constante quelle que soit la durée : seuls les compteurs du tour précédent sont gardés,
+    chaque tour réécrit un emplacement du fichier anneau. Sans psutil : CPU d'après la charge moyenne
+    et occupation du disque seulement."""
+
+    def __init__(self, path=METRICS_FILE, interval=METRICS_INTERVAL, slots=METRICS_SLOTS):
+        self.path = Path(path)
+        self.interval = interval
+        self.slots = slots
+        self.cores = (psutil.cpu_count() or 1) if psutil is not None else 0
+        self.record = _metrics_record(self.cores)
+        self.next = 0
+        self.file = None
+        self.samples = 0
+        self.cost = 0.0         # Temps CPU cumulé du thread d'enregistrement
+        self._previous = None   # (cpu_times par cœur, E/S disque, E/S réseau, instant)
+        self._stop = threading.Event()
+
+    def open(self):
+        """Ouvre (ou recrée si l'en-tête ne correspond pas) le fichier anneau ; False s'il est déjà tenu ailleurs
+
+        Le verrou est pris avant toute écriture : un second Freev ne tronque jamais le fichier du premier."""
+        size = _METRICS_HEADER.size + self.slots * self.record.size
+        # O_CREAT sans O_TRUNC : créé s'il manque, jamais vidé avant d'avoir le verrou ; O_BINARY (Windows) : pas de \n -> \r\n
+        self.file = open(os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644), 'r+b')
+        if not self._lock():
+            self.file.close()
+            self.file = None
+            return False
+        try:
+            magic, version, cores, slots, _, position = _METRICS_HEADER.unpack(self.file.read(_METRICS_HEADER.size))
+            if (magic, version, cores, slots) != (_METRICS_MAGIC, _METRICS_VERSION, self.cores, self.slots):
+                raise ValueError("format différent")
+            if os.fstat(self.file.fileno()).st_size != size:
+                raise ValueError("taille différente")
+            self.next = position % self.slots
+        except (ValueError, struct.error):
+            self.next = 0
+            self.file.seek(0)
+            self.file.truncate()
+            self.file.write(_METRICS_HEADER.pack(_METRICS_MAGIC, _METRICS_VERSION, self.cores, self.slots, self.interval, 0))
+            self.file.truncate(size)  # Emplacements à zéro : horodatage 0 = vide
+            self.file.flush()
+        return True
+
+    def _lock(self):
+        """Verrou exclusif non bloquant : un seul Freev enregistre à la fois. Sans fcntl ni msvcrt, on n'enregistre pas."""
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            elif msvcrt is not None:
+                # Verrou de plage Windows sur un octet bien après la fin : read_metrics lit toujours le fichier
+                self.file.seek(_METRICS_LOCK_OFFSET)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_NBLCK, 1)
+                self.file.seek(0)
+            else:
+                return False
+        except OSError:
+            return False
+        return True
+
+    def measure(self):
+        """(horodatage, métriques, %CPU par cœur), None au premier tour (base des différences)"""
+        now = time.time()
+        if psutil is None:
+            load = os.getloadavg()[0] / (os.cpu_count() or 1) * 100 if hasattr(os, 'getloadavg') else _NAN
+            disk = shutil.disk_usage(os.path.abspath(os.sep))
+            return now, (min(load, 100.0), _NAN, disk.used / (disk.used + disk.free) * 100) + (_NAN,) * 5, ()
+        cpus, disk_io, net_io = psutil.cpu_times(percpu=True), psutil.disk_io_counters(), psutil.net_io_counters()
+        previous, self._previous = self._previous, (cpus, disk_io, net_io, now)
+        if previous is None or now <= previous[3]:
+            return None
+        elapsed = now - previous[3]
+
+        def rate(current, before, attr):
+            return (getattr(current, attr) - getattr(before, attr)) / elapsed if current and before else _NAN
+
+        per_core = [_busy_percent(a, b) for a, b in zip(previous[0], cpus)]
+        values = (sum(per_core) / len(per_core), psutil.virtual_memory().percent, psutil.disk_usage('/').percent,
+                  system_temperature(), rate(disk_io, previous[1], 'read_bytes'), rate(disk_io, previous[1], 'write_bytes'),
+                  rate(net_io, previous[2], 'bytes_sent'), rate(net_io, previous[2], 'bytes_recv'))
+        return now, values, per_core
+
+    def sample(self):
+        start = time.thread_time()
+        measured = self.measure()
+        if measured:
+            stamp, values, per_core = measured
+            self.file.seek(_METRICS_HEADER.size + self.next * self.record.size)
+            self.file.write(self.record.pack(stamp, *values, *(round(c) for c in per_core)))
+            self.next = (self.next + 1) % self.slots
+            self.file.seek(0)
+            self.file.write(_METRICS_HEADER.pack(_METRICS_MAGIC, _METRICS_VERSION, self.cores, self.slots, self.interval, self.next))
+            self.file.flush()
+        self.samples += 1
+        self.cost += time.thread_time() - start
+
+    def overhead(self):
+        """(ms CPU moyen par tour, part d'un cœur consommée)"""
+        mean = self.cost / self.samples if self.samples else 0.0
+        return mean * 1000, mean / self.interval
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except OSError:
+                break  # Disque plein, fichier supprimé... : on arrête d'enregistrer sans gêner la conversation
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Démarre le thread démon ; None si le fichier est déjà tenu par un autre processus"""
+        try:
+            if not self.open():
+                return None
+        except OSError:
+            return None
+        threading.Thread(target=self._run, name='freev-metriques', daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+def read_metrics(path=METRICS_FILE, since=0.0):
+    """Enregistrements (horodatage, métriques, cœurs) postérieurs à since, du plus ancien au plus récent"""
+    with open(path, 'rb') as f:
+        magic, version, cores, slots, interval, position = _METRICS_HEADER.unpack(f.read(_METRICS_HEADER.size))
+        if (magic, version) != (_METRICS_MAGIC, _METRICS_VERSION):
+            return [], METRICS_INTERVAL
+        record = _metrics_record(cores)
+        data = f.read(slots * record.size)
+    width = len(METRICS_FIELDS) + 1
+    rows = [(row[0], row[1:width], row[width:]) for row in record.iter_unpack(data[:len(data) - len(data) % record.size])
+            if row[0] > since]
+    rows.sort(key=lambda row: row[0])
+    return rows, interval
+
+def metrics_summary(rows):
+    """{clé: (min, moyenne, max, mini-graphe)} des métriques présentes (NaN ignorés)"""
+    summary = {}
+    for index, (key, _, _) in enumerate(METRICS_FIELDS):
+        series = [row[1][index] for row in rows if not math.isnan(row[1][index])]
+        if not series:
+            continue
+        step = max(1, math.ceil(len(series) / METRICS_SPARK))
+        points = [sum(series[i:i + step]) / len(series[i:i + step]) for i in range(0, len(series), step)]
+        summary[key] = (min(series), sum(series) / len(series), max(series), sparkline(points))
+    return summary
+
+@benchmark('metriques')
+def bench_metrics():
+    """Coût d'un tour d'enregistrement, mémoire après 100 puis 2 000 tours, lecture d'une heure"""
+    import gc
+    import tracemalloc
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / 'metrics.bin'
+        recorder = MetricsRecorder(path, slots=720)
+        recorder.open()
+        tracemalloc.start()
+        for count in (100, 2000):
+            while recorder.samples < count:
+                recorder.sample()
+            gc.collect()  # Cycles temporaires de psutil : seule la mémoire retenue compte
+            current, _ = tracemalloc.get_traced_memory()
+            print(f"{count:>5} tours : {current / 1024:7.1f} Kio alloués, fichier {format_size(path.stat().st_size)}")
+        tracemalloc.stop()
+        cpu_ms, share = recorder.overhead()
+        print(f"coût : {cpu_ms:.3f} ms CPU par tour, soit {share:.4%} d'un cœur à {METRICS_INTERVAL:g} s")
+        recorder.file.close()
+        seconds, (rows, _) = timed(read_metrics, path, 0.0, repeat=5)
+        print(f"lecture + résumé de {len(rows)} enregistrements : {(seconds + timed(metrics_summary, rows)[0]) * 1000:.2f} ms")
+
+# --- Fin des métriques système ---
+
+# --- Horloge mondiale : zoneinfo (heures d'été exactes), index ville -> zone IANA ---
+
+CITIES_FILE = Path.home() / ".freev_villes.txt"  # Villes ajoutées par l'utilisateur, même format que WORLD_CITIES
+WORLD_CLOCK_DEFAULT = ('Paris', 'Londres', 'New York', 'Los Angeles', 'Tokyo', 'Sydney')
+_ZONE_REGIONS = ('Africa', 'America', 'Antarctica', 'Asia', 'Atlantic', 'Australia', 'Europe', 'Indian', 'Pacific')
+_DAY_NAMES = ('lun.', 'mar.', 'mer.', 'jeu.', 'ven.', 'sam.', 'dim.')
+# Les noms de zones (Europe/Paris -> Paris...) sont indexés automatiquement ; ici les villes qui n'en sont pas
+# et les noms français, une ligne par zone : Zone=Ville,Ville,...
+WORLD_CITIES = """\
+Europe/Paris=Marseille,Lyon,Toulouse,Nice,Nantes,Strasbourg,Montpellier,Bordeaux,Lille,Rennes,Reims,Le Havre,Saint-Étienne,Toulon,Grenoble,Dijon,Angers,Nîmes,Clermont-Ferrand,Brest,Limoges,Tours,Amiens,Metz,Perpignan,Besançon,Orléans,Rouen,Mulhouse,Caen,Nancy,Avignon,Ajaccio,Bastia
+Europe/London=Londres,Manchester,Birmingham,Liverpool,Leeds,Glasgow,Édimbourg,Edinburgh,Bristol,Cardiff,Oxford,Cambridge
+Europe/Brussels=Bruxelles,Anvers,Antwerp,Gand,Liège,Charleroi,Namur,Bruges
+Europe/Zurich=Genève,Geneva,Lausanne,Berne,Bern,Bâle,Basel,Lucerne,Neuchâtel,Lugano
+Europe/Berlin=Munich,München,Francfort,Frankfurt,Hambourg,Hamburg,Cologne,Köln,Stuttgart,Düsseldorf,Dortmund,Essen,Leipzig,Dresde,Dresden,Hanovre,Hannover,Nuremberg,Brême,Bremen
+Europe/Rome=Milan,Naples,Turin,Palerme,Palermo,Gênes,Genoa,Bologne,Bologna,Florence,Venise,Venice,Vérone,Bari,Catane,Cagliari
+Europe/Madrid=Barcelone,Barcelona,Valence,Valencia,Séville,Sevilla,Saragosse,Malaga,Bilbao,Alicante,Grenade,Granada,Palma
+Europe/Lisbon=Lisbonne,Porto,Braga,Coimbra,Faro,Funchal
+Europe/Amsterdam=Rotterdam,La Haye,The Hague,Utrecht,Eindhoven
+Europe/Vienna=Vienne,Wien,Salzbourg,Salzburg,Graz,Innsbruck,Linz
+Europe/Warsaw=Varsovie,Cracovie,Kraków,Łódź,Wrocław,Poznań,Gdańsk
+Europe/Prague=Brno,Ostrava
+Europe/Budapest=Debrecen,Szeged
+Europe/Athens=Athènes,Thessalonique,Thessaloniki,Patras,Héraklion
+Europe/Istanbul=Ankara,Izmir,Bursa,Antalya,Constantinople
+Europe/Moscow=Moscou,Saint-Pétersbourg,Saint Petersburg,Nijni Novgorod,Kazan
+Europe/Kyiv=Kharkiv,Odessa,Lviv,Dnipro
+Europe/Stockholm=Göteborg,Gothenburg,Malmö,Uppsala
+Europe/Oslo=Bergen,Trondheim,Stavanger
+Europe/Copenhagen=Copenhague,Aarhus,Odense
+Europe/Helsinki=Espoo,Tampere,Turku
+Europe/Dublin=Cork,Galway,Limerick
+Europe/Bucharest=Bucarest,Cluj-Napoca,Timișoara,Iași
+Europe/Sofia=Plovdiv,Varna
+Europe/Belgrade=Novi Sad
+Europe/Zagreb=Split,Dubrovnik
+Europe/Vilnius=Kaunas
+Europe/Tallinn=Tartu
+Asia/Tokyo=Osaka,Kyoto,Yokohama,Nagoya,Sapporo,Kobe,Fukuoka,Hiroshima,Sendai,Nara
+Asia/Seoul=Busan,Incheon,Daegu
+Asia/Shanghai=Pékin,Beijing,Peking,Canton,Guangzhou,Shenzhen,Chengdu,Wuhan,Tianjin,Xi'an,Hangzhou,Nankin,Nanjing
+Asia/Hong_Kong=Kowloon
+Asia/Taipei=Taïwan,Kaohsiung,Taichung
+Asia/Kolkata=Inde,Mumbai,Bombay,Delhi,New Delhi,Bangalore,Bengaluru,Chennai,Madras,Hyderabad,Ahmedabad,Pune,Jaipur,Lucknow,Goa
+Asia/Karachi=Lahore,Islamabad,Faisalabad
+Asia/Dhaka=Chittagong
+Asia/Bangkok=Chiang Mai,Phuket,Pattaya
+Asia/Ho_Chi_Minh=Hô Chi Minh-Ville,Hanoï,Hanoi,Da Nang
+Asia/Singapore=Singapour
+Asia/Kuala_Lumpur=Penang,Malacca
+Asia/Jakarta=Bandung,Surabaya
+Asia/Makassar=Bali,Denpasar
+Asia/Manila=Cebu,Davao,Quezon City
+Asia/Dubai=Abou Dabi,Abu Dhabi,Charjah,Sharjah
+Asia/Riyadh=Riyad,La Mecque,Mecca,Médine,Djeddah,Jeddah,Koweït,Kuwait City
+Asia/Qatar=Doha
+Asia/Tehran=Téhéran,Ispahan,Chiraz,Mashhad
+Asia/Jerusalem=Haïfa
+Asia/Beirut=Beyrouth
+Asia/Baghdad=Bagdad,Bassora,Erbil
+Asia/Kabul=Kaboul
+Asia/Tashkent=Samarcande
+Asia/Almaty=Astana,Nour-Soultan
+Asia/Yekaterinburg=Iekaterinbourg
+Asia/Novosibirsk=Novossibirsk
+Asia/Kathmandu=Népal,Pokhara
+Asia/Colombo=Sri Lanka,Kandy
+Asia/Yangon=Rangoun,Mandalay
+Asia/Ulaanbaatar=Oulan-Bator
+Asia/Tbilisi=Tbilissi
+Asia/Yerevan=Erevan
+Asia/Baku=Bakou
+Africa/Cairo=Le Caire,Alexandrie,Louxor,Assouan,Gizeh
+Africa/Algiers=Alger,Oran,Constantine,Annaba
+Africa/Tunis=Sfax,Sousse,Djerba
+Africa/Casablanca=Rabat,Marrakech,Fès,Tanger,Agadir,Meknès
+Africa/Dakar=Thiès,Saint-Louis du Sénégal
+Africa/Abidjan=Yamoussoukro,Bouaké
+Africa/Lagos=Abuja,Ibadan,Kano,Yaoundé,Cotonou
+Africa/Johannesburg=Le Cap,Cape Town,Pretoria,Durban,Soweto
+Africa/Nairobi=Mombasa,Addis-Abeba,Dar es Salam,Mogadiscio,Tananarive
+Africa/Bamako=Tombouctou
+Africa/Ouagadougou=Bobo-Dioulasso
+Africa/Accra=Kumasi
+Africa/Tripoli=Benghazi
+Indian/Reunion=La Réunion,Saint-Denis de la Réunion,Saint-Pierre de la Réunion
+Indian/Mauritius=Maurice,Port-Louis
+Indian/Mayotte=Mamoudzou
+America/New_York=NYC,Manhattan,Brooklyn,Boston,Washington,Philadelphie,Philadelphia,Miami,Atlanta,Orlando,Tampa,Baltimore,Pittsburgh,Charlotte,Cleveland,Columbus,Raleigh
+America/Toronto=Québec,Quebec,Ottawa,Gatineau,Sherbrooke,Trois-Rivières
+America/Chicago=Houston,Dallas,San Antonio,Austin,La Nouvelle-Orléans,New Orleans,Minneapolis,Saint-Louis,St. Louis,Kansas City,Milwaukee,Nashville,Memphis,Oklahoma City
+America/Denver=Salt Lake City,Albuquerque,Boulder,El Paso
+America/Phoenix=Tucson,Scottsdale
+America/Los_Angeles=San Francisco,San Diego,San José,San Jose,Seattle,Portland,Las Vegas,Sacramento,Oakland,Hollywood,Silicon Valley
+America/Anchorage=Alaska,Fairbanks
+Pacific/Honolulu=Hawaï,Hawaii
+America/Edmonton=Calgary
+America/Halifax=Nouvelle-Écosse
+America/St_Johns=Terre-Neuve
+America/Mexico_City=Mexico,Guadalajara,Puebla,Acapulco
+America/Havana=La Havane
+America/Port-au-Prince=Haïti
+America/Santo_Domingo=Saint-Domingue
+America/Guadeloupe=Pointe-à-Pitre,Basse-Terre
+America/Martinique=Fort-de-France
+America/Cayenne=Guyane,Kourou
+America/Miquelon=Saint-Pierre-et-Miquelon
+America/Bogota=Medellín,Cali,Carthagène,Cartagena
+America/Lima=Cuzco,Arequipa
+America/Caracas=Maracaibo
+America/Guayaquil=Quito
+America/La_Paz=Sucre,Santa Cruz de la Sierra
+America/Santiago=Valparaíso
+America/Sao_Paulo=Rio de Janeiro,Rio,Brasília,Brasilia,Belo Horizonte,Salvador de Bahia,Porto Alegre,Curitiba
+America/Manaus=Amazonie
+America/Montevideo=Punta del Este
+America/Asuncion=Paraguay
+America/Panama=Panama City
+America/Costa_Rica=San José du Costa Rica
+Australia/Sydney=Newcastle,Wollongong
+Australia/Melbourne=Geelong
+Australia/Brisbane=Gold Coast,Cairns
+Australia/Perth=Fremantle
+Australia/Darwin=Alice Springs
+Australia/Hobart=Tasmanie
+Pacific/Auckland=Wellington,Christchurch,Nouvelle-Zélande
+Pacific/Noumea=Nouvelle-Calédonie
+Pacific/Tahiti=Papeete,Polynésie
+Pacific/Fiji=Suva
+America/Vancouver=Victoria
+"""
+
+def normalize_city(name):
+    """Minuscules sans accents, tirets, soulignés et apostrophes remplacés par des espaces"""
+    text = unicodedata.normalize('NFKD', name.lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(re.sub(r"[-_'’.]", ' ', text).split())
+
+def _parse_cities(data, index):
+    for line in data.splitlines():
+        zone_name, sep, names = line.partition('=')
+        if sep:
+            for name in names.split(','):
+                if name.strip():
+                    index[normalize_city(name)] = (name.strip(), zone_name.strip())
+
+@lru_cache(maxsize=1)
+def city_index():
+    """{nom normalisé: (nom affiché, zone)} : noms des zones IANA, puis WORLD_CITIES et CITIES_FILE, prioritaires"""
+    index = {}
+    for zone_name in sorted(available_timezones()):
+        if zone_name.split('/')[0] in _ZONE_REGIONS:
+            name = zone_name.rsplit('/', 1)[1].replace('_', ' ')
+            index.setdefault(normalize_city(name), (name, zone_name))
+    _parse_cities(WORLD_CITIES, index)
+    try:
+        _parse_cities(CITIES_FILE.read_text(encoding='utf-8'), index)
+    except OSError:
+        pass
+    return index
+
+@lru_cache(maxsize=None)
+def zone(name):
+    """ZoneInfo gardée en cache (règles de la base IANA lues une seule fois par zone)"""
+    return ZoneInfo(name)
+
+@lru_cache(maxsize=1024)
+def find_city(query):
+    """(nom affiché, zone) : nom exact, zone IANA, préfixe unique le plus court, sinon nom proche ; None si rien"""
+    key = normalize_city(query)
+    index = city_index()
+    if key in index:
+        return index[key]
+    if '/' in query or key in ('utc', 'gmt'):
+        try:
+            zone(query.strip() if '/' in query else 'UTC')
+            return (query.strip(), query.strip() if '/' in query else 'UTC')
+        except (ZoneInfoNotFoundError, ValueError):
+            return None
+    if len(key) >= 3:
+        prefixed = [name for name in index if name.startswith(key)]
+        if prefixed:
+            return index[min(prefixed, key=len)]
+    close = difflib.get_close_matches(key, list(index), n=1, cutoff=0.75)
+    return index[close[0]] if close else None
+
+def format_utc_offset(dt):
+    minutes = int(dt.utcoffset().total_seconds() // 60)
+    hours, rest = divmod(abs(minutes), 60)
+    return f"UTC{'+' if minutes >= 0 else '-'}{hours}" + (f":{rest:02d}" if rest else "")
+
+def convert_time(hour, minute, source, target, day=None):
+    """(heure source, heure cible, remarque) ; remarque : 'inexistante' (heure sautée au passage à l'heure d'été,
+    décalée d'autant) ou 'ambiguë' (heure répétée au retour à l'heure d'hiver, première occurrence retenue)"""
+    src = zone(source)
+    day = day or datetime.now(src).date()
+    naive = datetime(day.year, day.month, day.day, hour, minute)
+    local = naive.replace(tzinfo=src)
+    note = None
+    actual = local.astimezone(timezone.utc).astimezone(src)
+    if actual.replace(tzinfo=None) != naive:
+        local, note = actual, 'inexistante'
+    elif local.replace(fold=1).utcoffset() != local.utcoffset():
+        note = 'ambiguë'
+    return local, local.astimezone(zone(target)), note
+
+def world_clock_rows(cities, now=None):
+    """[(nom, heure locale)] pour chaque ville trouvée, et la liste des noms introuvables"""
+    now = now or datetime.now(timezone.utc)
+    rows, unknown = [], []
+    for query in cities:
+        found = find_city(query)
+        if found is None:
+            unknown.append(query)
+        else:
+            rows.append((found[0], now.astimezone(zone(found[1]))))
+    return rows, unknown
+
+def format_clock_line(name, dt):
+    season = " (été)" if dt.dst() else ""
+    return (f"    {name[:20]:<20} {Colors.BRIGHT_GREEN}{dt:%H:%M}{Colors.RESET}  {_DAY_NAMES[dt.weekday()]} {dt:%d/%m}  "
+            f"{format_utc_offset(dt):<9} {dt.tzname()}{season}")
+
+@benchmark('fuseaux')
+def bench_time_zones():
+    """Coût de l'index des villes, des recherches floues à froid et du tableau à cache chaud
+    (les changements d'heure sont vérifiés par test_freev1.py)"""
+    city_index.cache_clear()
+    find_city.cache_clear()
+    seconds, index = timed(city_index)
+    print(f"index : {len(index)} noms en {seconds * 1000:.1f} ms")
+    queries = ['paris', 'Pékin', 'sao paolo', 'san fran', 'Montreal', 'nouvelle orleans', 'ho chi minh']
+    seconds, found = timed(lambda: [find_city(q) for q in queries])
+    print(f"{len(queries)} recherches floues à froid : {seconds * 1000:.1f} ms -> {', '.join(f[1] for f in found if f)}")
+    seconds, _ = timed(lambda: world_clock_rows(queries), repeat=100)
+    print(f"tableau de {len(queries)} villes (cache chaud) : {seconds * 1e6:.0f} µs")
+
+# --- Fin de l'horloge mondiale ---
+
+# --- Morpion : bitboards, table négamax 3×3 sur disque, alpha-bêta N×N ---
+
+TICTACTOE_FILE = Path.home() / ".freev_morpion.bin"  # Table 3×3 : un octet par position, indexée en base 3
+TICTACTOE_LEVELS = {'facile': 0.5, 'moyen': 0.2, 'difficile': 0.0}  # Probabilité de jouer un coup sous-optimal
+TICTACTOE_MAX_SIZE = 9
+TICTACTOE_BUDGET = 1.0  # Secondes de réflexion de l'IA alpha-bêta (plateaux N×N)
+TICTACTOE_TT_SIZE = 500_000  # Entrées de la table de transposition avant remise à zéro
+_TTT_UNSEEN = 255
+_TTT_OFFSET = 16  # Octet = score négamax (-10..10) + décalage
+
+@lru_cache(maxsize=None)
+def win_masks(size, align):
+    """Masques (bit r*size+c) de tous les alignements de `align` cases d'un plateau size×size"""
+    masks = []
+    for r in range(size):
+        for c in range(size):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                if 0 <= r + dr * (align - 1) < size and 0 <= c + dc * (align - 1) < size:
+                    masks.append(sum(1 << ((r + dr * i) * size + c + dc * i) for i in range(align)))
+    return tuple(masks)
+
+_WINNING = bytes(any(bits & mask == mask for mask in win_masks(3, 3)) for bits in range(512))  # Victoire en O(1)
+_TERNARY = tuple(sum(3 ** i for i in range(9) if bits >> i & 1) for bits in range(512))
+
+def has_won(bits, size=3, align=3):
+    if size == 3 and align == 3:
+        return bool(_WINNING[bits])
+    return any(bits & mask == mask for mask in win_masks(size, align))
+
+def _ttt_index(x, o):
+    return _TERNARY[x] + 2 * _TERNARY[o]
+
+def _solve_tictactoe(table, x, o):
+    """Négamax exhaustif depuis (x, o) : table[index] = score du joueur au trait (gagner tôt > gagner tard)"""
+    index = _ttt_index(x, o)
+    if table[index] != _TTT_UNSEEN:
+        return table[index] - _TTT_OFFSET
+    x_to_move = bin(x).count('1') == bin(o).count('1')
+    empty = 0x1FF & ~(x | o)
+    if _WINNING[o if x_to_move else x]:
+        score = -1 - bin(empty).count('1')
+    elif not empty:
+        score = 0
+    else:
+        score = -_TTT_OFFSET
+        for cell in range(9):
+            move = 1 << cell
+            if empty & move:
+                child = _solve_tictactoe(table, x | move, o) if x_to_move else _solve_tictactoe(table, x, o | move)
+                score = max(score, -child)
+    table[index] = score + _TTT_OFFSET
+    return score
+
+@lru_cache(maxsize=1)
+def tictactoe_table():
+    """Scores des 5 478 positions légales : lus sur disque, sinon calculés une fois et enregistrés"""
+    try:
+        data = TICTACTOE_FILE.read_bytes()
+        if len(data) == 3 ** 9 and data[0] == _TTT_OFFSET:
+            return data
+    except OSError:
+        pass
+    table = bytearray([_TTT_UNSEEN]) * 3 ** 9
+    _solve_tictactoe(table, 0, 0)
+    try:
+        tmp = TICTACTOE_FILE.with_name(TICTACTOE_FILE.name + '.tmp')
+        tmp.write_bytes(table)
+        os.replace(tmp, TICTACTOE_FILE)
+    except OSError:
+        pass
+    return bytes(table)
+
+def tictactoe_scores(x, o):
+    """{case: score du coup pour le joueur au trait}, un accès à la table par case libre"""
+    table = tictactoe_table()
+    x_to_move = bin(x).count('1') == bin(o).count('1')
+    scores = {}
+    for cell in range(9):
+        move = 1 << cell
+        if not (x | o) & move:
+            child = _ttt_index(x | move, o) if x_to_move else _ttt_index(x, o | move)
+            scores[cell] = _TTT_OFFSET - table[child]
+    return scores
+
+def pick_move(scores, level='difficile', rng=random):
+    """Meilleur coup, ou coup moins bon tiré au hasard avec la probabilité du niveau"""
+    if not scores:
+        return None
+    best = max(scores.values())
+    weaker = [cell for cell, score in scores.items() if score < best]
+    if weaker and rng.random() < TICTACTOE_LEVELS[level]:
+        return rng.choice(weaker)
+    return rng.choice([cell for cell, score in scores.items() if score == best])
+
+class _SearchTimeout(Exception):
+    pass
+
+class AlignmentSearch:
+    """Alpha-bêta (négamax) à approfondissement itératif pour N×N, `align` pions alignés, avec table de transposition
+
+    Positions notées du point de vue du joueur au trait ; les feuilles sont évaluées par les alignements encore ouverts."""
+    WIN = 1_000_000
+
+    def __init__(self, size, align):
+        self.size, self.align = size, align
+        self.masks = win_masks(size, align)
+        self.cell_masks = [[mask for mask in self.masks if mask >> cell & 1] for cell in range(size * size)]
+        self.full = (1 << size * size) - 1
+        reach = 1 if size > 5 else size  # Grands plateaux : seules les cases voisines d'un pion sont essayées
+        self.neighbours = [sum(1 << (rr * size + cc) for rr in range(r - reach, r + reach + 1) for cc in range(c - reach, c + reach + 1)
+                               if 0 <= rr < size and 0 <= cc < size) for r in range(size) for c in range(size)]
+        centre = (size - 1) / 2
+        self.order = sorted(range(size * size), key=lambda cell: abs(cell // size - centre) + abs(cell % size - centre))
+        self.table = {}
+        self.nodes = 0
+        self.deadline = float('inf')
+
+    def wins(self, bits, cell):
+        return any(bits & mask == mask for mask in self.cell_masks[cell])
+
+    def evaluate(self, mover, other):
+        score = 0
+        for mask in self.masks:
+            mine, theirs = mover & mask, other & mask
+            if mine and not theirs:
+                score += 4 ** bin(mine).count('1')
+            elif theirs and not mine:
+                score -= 4 ** bin(theirs).count('1')
+        return score
+
+    def candidates(self, mover, other, first=None):
+        """Cases libres à essayer (voisines d'un pion, le centre si le plateau est vide), du centre vers les bords"""
+        occupied = mover | other
+        if not occupied:
+            return self.order[:1]
+        near = 0
+        for cell in range(self.size * self.size):
+            if occupied >> cell & 1:
+                near |= self.neighbours[cell]
+        near &= ~occupied
+        moves = [cell for cell in self.order if near >> cell & 1]
+        if first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def negamax(self, mover, other, depth, alpha, beta):
+        self.nodes += 1
+        if not self.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise _SearchTimeout
+        if not self.full & ~(mover | other):
+            return 0
+        entry = self.table.get((mover, other))
+        if entry and entry[0] >= depth:
+            stored_depth, score, flag, _ = entry
+            if flag == 0 or (flag < 0 and score <= alpha) or (flag > 0 and score >= beta):
+                return score
+        if depth == 0:
+            return self.evaluate(mover, other)
+        start_alpha, best, best_cell = alpha, -self.WIN * 2, None
+        for cell in self.candidates(mover, other, entry[3] if entry else None):
+            bit = 1 << cell
+            if self.wins(mover | bit, cell):
+                score = self.WIN + depth  # Victoire plus proche = profondeur restante plus grande
+            else:
+                score = -self.negamax(other, mover | bit, depth - 1, -beta, -alpha)
+            if score > best:
+                best, best_cell = score, cell
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        flag = -1 if best <= start_alpha else 1 if best >= beta else 0
+        if len(self.table) >= TICTACTOE_TT_SIZE:
+            self.table.clear()
+        self.table[(mover, other)] = (depth, best, flag, best_cell)
+        return best
+
+    def best_move(self, mover, other, budget=TICTACTOE_BUDGET, max_depth=None):
+        """(case, score, profondeur atteinte) : le meilleur coup de la dernière itération terminée dans le budget"""
+        self.deadline = time.perf_counter() + budget
+        empties = bin(self.full & ~(mover | other)).count('1')
+        move, score, reached = None, 0, 0
+        for depth in range(1, min(empties, max_depth or empties) + 1):
+            try:
+                score = self.negamax(mover, other, depth, -self.WIN * 2, self.WIN * 2)
+            except _SearchTimeout:
+                break
+            move, reached = self.table[(mover, other)][3], depth
+            if abs(score) > self.WIN // 2:
+                break  # Gain ou perte forcés : chercher plus loin ne change rien
+        self.deadline = float('inf')
+        return move, score, reached
+
+@lru_cache(maxsize=8)
+def alignment_search(size, align):
+    """Moteur partagé par les parties de même format : sa table de transposition sert d'un coup à l'autre"""
+    return AlignmentSearch(size, align)
+
+def format_alignment_board(x, o, size):
+    lines = ["", "    " + "   ".join(str(c) for c in range(size))]
+    for r in range(size):
+        cells = []
+        for c in range(size):
+            bit = 1 << (r * size + c)
+            cells.append(f"{Colors.BRIGHT_GREEN}X{Colors.RESET}" if x & bit else f"{Colors.BRIGHT_YELLOW}O{Colors.RESET}" if o & bit else " ")
+        lines.append(f" {r}  " + " | ".join(cells))
+        if r < size - 1:
+            lines.append("   " + "|".join(["---"] * size))
+    return "\n".join(lines) + "\n"
+
+@benchmark('morpion')
+def bench_tictactoe():
+    """Table 3×3 (calcul, lecture disque, accès), jeu parfait contre hasard, cohérence et coût de l'alpha-bêta"""
+    global TICTACTOE_FILE
+    with tempfile.TemporaryDirectory() as tmp:
+        saved, TICTACTOE_FILE = TICTACTOE_FILE, Path(tmp) / 'morpion.bin'
+        try:
+            tictactoe_table.cache_clear()
+            seconds, table = timed(tictactoe_table)
+            reachable = sum(1 for value in table if value != _TTT_UNSEEN)
+            print(f"table 3×3 calculée en {seconds * 1000:.0f} ms : {reachable} positions "
+                  f"({'ok' if reachable == 5478 else 'ÉCART, 5478 attendues'}), valeur initiale {table[0] - _TTT_OFFSET} "
+                  f"({'ok' if table[0] == _TTT_OFFSET else 'ÉCART, nulle attendue'})")
+            tictactoe_table.cache_clear()
+            seconds, loaded = timed(tictactoe_table)
+            print(f"relue sur disque en {seconds * 1000:.2f} ms ({'ok' if loaded == table else 'ÉCART'})")
+        finally:
+            TICTACTOE_FILE = saved
+            tictactoe_table.cache_clear()
+    tictactoe_table.cache_clear()
+    rng = random.Random(48)
+    seconds, _ = timed(lambda: [tictactoe_scores(0b000010001, 0b100000000) for _ in range(10000)])
+    print(f"coup parfait : {seconds / 10000 * 1e6:.1f} µs")
+    for level in TICTACTOE_LEVELS:
+        results = Counter()
+        for game in range(1000):
+            x = o = 0
+            ai_is_x = game % 2 == 0
+            while True:
+                x_to_move = bin(x).count('1') == bin(o).count('1')
+                if x_to_move == ai_is_x:
+                    cell = pick_move(tictactoe_scores(x, o), level, rng)
+                else:
+                    cell = rng.choice([c for c in range(9) if not (x | o) >> c & 1])
+                if x_to_move:
+                    x |= 1 << cell
+                else:
+                    o |= 1 << cell
+                if has_won(x) or has_won(o) or x | o == 0x1FF:
+                    won = has_won(x) if ai_is_x else has_won(o)
+                    lost = has_won(o) if ai_is_x else has_won(x)
+                    results['gagnées' if won else 'perdues' if lost else 'nulles'] += 1
+                    break
+        check = '' if TICTACTOE_LEVELS[level] else ' ok' if not results['perdues'] else ' ÉCART'
+        print(f"{level:<10} contre le hasard (1000 parties) : {results['gagnées']} gagnées, {results['nulles']} nulles, {results['perdues']} perdues{check}")
+    search = AlignmentSearch(3, 3)
+    mismatches = 0
+    for position in range(3 ** 9):
+        x = sum(1 << i for i in range(9) if position // 3 ** i % 3 == 1)
+        o = sum(1 << i for i in range(9) if position // 3 ** i % 3 == 2)
+        value = tictactoe_table()[position]
+        if value == _TTT_UNSEEN or has_won(x) or has_won(o) or x | o == 0x1FF or position % 7:
+            continue
+        mover, other = (x, o) if bin(x).count('1') == bin(o).count('1') else (o, x)
+        _, score, _ = search.best_move(mover, other, budget=10)
+        if (score > search.WIN // 2) != (value > _TTT_OFFSET) or (score < -search.WIN // 2) != (value < _TTT_OFFSET):
+            mismatches += 1
+    print(f"alpha-bêta 3×3 contre la table : {'ok' if not mismatches else f'{mismatches} ÉCART(S)'} ({len(search.table)} entrées en table)")
+    for size, align in ((4, 4), (7, 4), (9, 5)):
+        search = AlignmentSearch(size, align)
+        x, o = 1 << (size * size // 2), 1 << (size * size // 2 + 1)
+        seconds, (cell, score, depth) = timed(search.best_move, x, o)
+        print(f"{size}×{size}, {align} alignés : coup {divmod(cell, size)} en {seconds:.2f} s, profondeur {depth}, "
+              f"{search.nodes} nœuds, {len(search.table)} entrées en table")
+
+# --- Fin du morpion ---
+
+# --- Jeux : états à __slots__, sessions de parties, journal de deltas ---
+
+GAMES_FILE = Path.home() / ".freev_jeux.log"  # Journal append-only : une ligne JSON par changement d'état
+GAMES_COMPACT = 500  # Lignes de journal au-delà desquelles il est réécrit avec l'état courant seulement
+GAME_STATES = {}
+
+def game_state(kind, label):
+    """Enregistre une classe d'état de partie sous son nom de journal et son nom affiché"""
+    def register(cls):
+        cls.kind, cls.label = kind, label
+        GAME_STATES[kind] = cls
+        return cls
+    return register
+
+class GameState:
+    """État d'une partie : attributs déclarés dans __slots__, sérialisés en liste dans l'ordre des slots"""
+    __slots__ = ()
+    kind = label = None
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def dump(self):
+        return [getattr(self, name) for name in self.__slots__]
+
+    @classmethod
+    def from_legacy(cls, data):
+        """État enregistré par les anciennes versions (dictionnaire dans .freev_memory.json)"""
+        return cls(*(data.get(name) for name in cls.__slots__))
+
+@game_state('hangman', 'pendu')
+class HangmanGame(GameState):
+    __slots__ = ('word', 'guessed', 'tries')  # guessed : lettres proposées, dans l'ordre
+
+    @classmethod
+    def from_legacy(cls, data):
+        return cls(data['word'], ''.join(data.get('guessed') or ()), data.get('tries', 6))
+
+    def guess(self, letter):
+        """False si la lettre a déjà été proposée ; un essai de moins si elle n'est pas dans le mot"""
+        if letter in self.guessed:
+            return False
+        self.guessed += letter
+        if letter not in self.word:
+            self.tries -= 1
+        return True
+
+    def masked(self):
+        return " ".join(c if c in self.guessed else "_" for c in self.word)
+
+    def solved(self):
+        return all(c in self.guessed for c in self.word)
+
+@game_state('tictactoe', 'morpion')
+class TicTacToeGame(GameState):
+    __slots__ = ('x', 'o', 'size', 'align', 'level', 'turn')
+
+    @classmethod
+    def from_legacy(cls, data):
+        if 'board' not in data:
+            return super().from_legacy(data)
+        cells = [cell for row in data['board'] for cell in row]  # Plateau en listes d'avant les bitboards
+        return cls(sum(1 << i for i, cell in enumerate(cells) if cell == 'X'),
+                   sum(1 << i for i, cell in enumerate(cells) if cell == 'O'), 3, 3, 'facile', data.get('turn', 'X'))
+
+@game_state('guess_number', 'nombre')
+class GuessNumberGame(GameState):
+    __slots__ = ('target', 'tries')
+
+@game_state('riddle', 'devinette')
+class RiddleGame(GameState):
+    __slots__ = ('answer', 'start')
+
+@game_state('moral', 'choix moral')
+class MoralGame(GameState):
+    __slots__ = ('scenario',)
+
+@game_state('story', 'histoire')
+class StoryGame(GameState):
+    __slots__ = ('step',)
+
+class GameSession:
+    """Parties d'une session, plusieurs à la fois ; seule la partie active reçoit les messages"""
+    __slots__ = ('store', 'id', 'games', 'active')
+
+    def __init__(self, store, session_id):
+        self.store, self.id = store, session_id
+        self.games = {}
+        self.active = None
+
+    def current(self, kind):
+        """État de la partie `kind` si c'est la partie active, sinon None"""
+        return self.games.get(kind) if self.active == kind else None
+
+    def start(self, game):
+        """Nouvelle partie (remplace celle du même jeu), qui devient la partie active"""
+        with self.store.lock:
+            self.games[game.kind] = game
+            self.active = game.kind
+            self.store.record(['s', self.id, game.kind, game.dump()])
+            self.store.persisted[self.id, game.kind] = game.dump()
+        return game
+
+    def save(self, game):
+        """Journalise les seuls attributs modifiés depuis le dernier enregistrement"""
+        with self.store.lock:
+            previous = self.store.persisted.get((self.id, game.kind))
+            values = game.dump()
+            if previous is None:
+                self.store.record(['s', self.id, game.kind, values])
+            else:
+                delta = {i: value for i, (value, old) in enumerate(zip(values, previous)) if value != old}
+                if not delta:
+                    return
+                self.store.record(['d', self.id, game.kind, delta])
+            self.store.persisted[self.id, game.kind] = values
+
+    def end(self, kind):
+        """Termine la partie ; la plus récente des parties restantes redevient active"""
+        with self.store.lock:
+            if self.games.pop(kind, None) is None:
+                return
+            self.store.persisted.pop((self.id, kind), None)
+            self.store.record(['x', self.id, kind])
+            if self.active == kind:
+                self.active = next(reversed(list(self.games)), None)
+                self.store.record(['a', self.id, self.active])
+
+    def resume(self, kind):
+        with self.store.lock:
+            if kind not in self.games:
+                return False
+            self.games[kind] = self.games.pop(kind)  # La partie reprise passe en dernier (la plus récente)
+            self.active = kind
+            self.store.record(['a', self.id, kind])
+            return True
+
+    def clear(self):
+        for kind in list(self.games):
+            self.end(kind)
+
+    def import_legacy(self, data):
+        """Reprend les parties d'un ancien game_state si la session n'en a aucune"""
+        if self.games or not isinstance(data, dict):
+            return
+        for kind, values in data.items():
+            try:
+                self.start(GAME_STATES[kind].from_legacy(values))
+            except (KeyError, TypeError, ValueError, AttributeError):
+                pass
+
+class GameStore:
+    """Parties de toutes les sessions (mode serveur), journalisées par deltas et rejouées au chargement
+
+    Lignes du journal : ['s', session, jeu, valeurs] partie créée ; ['d', session, jeu, {index: valeur}] attributs
+    modifiés ; ['x', session, jeu] partie terminée ; ['a', session, jeu] partie active. path=None : en mémoire seulement."""
+
+    def __init__(self, path=GAMES_FILE):
+        self.path = path
+        self.lock = threading.RLock()
+        self.sessions = {}
+        self.persisted = {}  # (session, jeu) -> valeurs au dernier enregistrement, pour calculer les deltas
+        self.lines = 0
+        self.file = None
+        if path is not None:
+            self.load()
+
+    def session(self, session_id='local'):
+        with self.lock:
+            if session_id not in self.sessions:
+                self.sessions[session_id] = GameSession(self, session_id)
+            return self.sessions[session_id]
+
+    def record(self, entry):
+        if self.path is None:
+            return
+        if self.file is None:
+            self.file = open(self.path, 'a', encoding='utf-8')
+        self.file.write(json.dumps(entry, separators=(',', ':'), ensure_ascii=False) + "\n")
+        self.file.flush()
+        self.lines += 1
+        if self.lines > GAMES_COMPACT:
+            self.compact()
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    self.lines += 1
+                    try:
+                        self._replay(json.loads(line))
+                    except (ValueError, KeyError, IndexError, TypeError):
+                        pass  # Ligne tronquée (arrêt brutal) ou jeu inconnu : ignorée
+        except OSError:
+            return
+        for session in self.sessions.values():
+            for kind, game in session.games.items():
+                self.persisted[session.id, kind] = game.dump()
+        if self.lines > GAMES_COMPACT:
+            self.compact()
+
+    def _replay(self, entry):
+        op, session_id, kind = entry[:3]
+        session = self.session(session_id)
+        if op == 's':
+            game = session.games[kind] = GAME_STATES[kind](*entry[3])
+            session.active = game.kind
+        elif op == 'd':
+            game = session.games[kind]
+            for index, value in entry[3].items():
+                setattr(game, game.__slots__[int(index)], value)
+        elif op == 'x':
+            session.games.pop(kind, None)
+        elif op == 'a':
+            session.active = kind if kind in session.games else None
+
+    def compact(self):
+        """Réécrit le journal avec une ligne par partie en cours (remplacement atomique)"""
+        with self.lock:
+            entries = []
+            for session in self.sessions.values():
+                entries += [['s', session.id, kind, game.dump()] for kind, game in session.games.items()]
+                if session.games:
+                    entries.append(['a', session.id, session.active])
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            tmp = self.path.with_name(self.path.name + '.tmp')
+            tmp.write_text("".join(json.dumps(entry, separators=(',', ':'), ensure_ascii=False) + "\n" for entry in entries), encoding='utf-8')
+            os.replace(tmp, self.path)
+            self.lines = len(entries)
+
+@benchmark('jeux')
+def bench_games():
+    """Coups par seconde (pendu et morpion) sur des sessions concurrentes, journal rejoué, coût d'une sauvegarde complète"""
+    global GAMES_COMPACT
+    words = ["python", "assistant", "freev", "intelligence", "local"]
+
+    def play(store, session_ids, rng):
+        moves = 0
+        for session_id in session_ids:
+            session = store.session(session_id)
+            hangman = session.start(HangmanGame(rng.choice(words), '', 6))
+            board = session.start(TicTacToeGame(0, 0, 3, 3, 'difficile', 'X'))
+            session.resume('hangman')
+            for letter in rng.sample("abcdefghijklmnopqrstuvwxyz", 26):
+                hangman.guess(letter)
+                session.save(hangman)
+                moves += 1
+                if hangman.solved() or not hangman.tries:
+                    break
+            session.resume('tictactoe')
+            while not (has_won(board.x) or has_won(board.o) or board.x | board.o == 0x1FF):
+                cell = pick_move(tictactoe_scores(board.x, board.o), 'moyen', rng)
+                if board.turn == 'X':
+                    board.x |= 1 << cell
+                else:
+                    board.o |= 1 << cell
+                board.turn = 'O' if board.turn == 'X' else 'X'
+                session.save(board)
+                moves += 1
+            if rng.random() < 0.5:
+                session.end('tictactoe')
+        return moves
+
+    tictactoe_table()
+    with tempfile.TemporaryDirectory() as tmp:
+        saved_compact, GAMES_COMPACT = GAMES_COMPACT, 10 ** 9
+        try:
+            path = Path(tmp) / 'jeux.log'
+            store = GameStore(path)
+            threads = 8
+            start = time.perf_counter()
+            with ThreadPoolExecutor(threads) as pool:
+                moves = sum(pool.map(lambda t: play(store, [f"s{t}-{i}" for i in range(250)], random.Random(t)), range(threads)))
+            seconds = time.perf_counter() - start
+            size = path.stat().st_size
+            print(f"{moves} coups sur {threads * 250} sessions ({threads} threads) : {moves / seconds:,.0f} coups/s, "
+                  f"journal {size / store.lines:.0f} octets par ligne")
+            expected = {(s.id, kind): game.dump() for s in store.sessions.values() for kind, game in s.games.items()}
+            start = time.perf_counter()
+            replayed = GameStore(path)
+            seconds = time.perf_counter() - start
+            found = {(s.id, kind): game.dump() for s in replayed.sessions.values() for kind, game in s.games.items()}
+            actives = all(replayed.sessions[s.id].active == s.active for s in store.sessions.values())
+            print(f"journal rejoué ({store.lines} lignes) en {seconds * 1000:.0f} ms : "
+                  f"{'ok' if found == expected and actives else 'ÉCART'} ({len(found)} parties en cours)")
+            replayed.compact()
+            compacted = GameStore(path)
+            found = {(s.id, kind): game.dump() for s in compacted.sessions.values() for kind, game in s.games.items()}
+            print(f"après compaction : {compacted.lines} lignes, {path.stat().st_size // 1024} Ko ({'ok' if found == expected else 'ÉCART'})")
+        finally:
+            GAMES_COMPACT = saved_compact
+        memory = {'context': [{'user': 'bonjour ' * 5, 'bot': 'Bonjour ! ' * 8, 'time': datetime.now().isoformat()}] * 100,
+                  'notes': ['note'] * 50, 'game_state': {'tictactoe': TicTacToeGame(0, 0, 3, 3, 'moyen', 'X').dump()}}
+        full = Path(tmp) / 'memoire.json'
+        seconds, _ = timed(lambda: full.write_text(json.dumps(memory, ensure_ascii=False, indent=2), encoding='utf-8'), repeat=20)
+        print(f"sauvegarde complète de la mémoire (ancien fonctionnement, à chaque coup) : {seconds * 1e6:.0f} µs, {full.stat().st_size // 1024} Ko")
+
+# --- Fin des jeux ---
+
+# --- Devinettes : recherche dichotomique, Mastermind / Bulls and cows (minimax de Knuth) ---
+
+MASTERMIND = (4, "123456", True)  # (positions, symboles, répétitions permises)
+BULLS_AND_COWS = (4, "0123456789", False)
+CODE_MAX = 10_000  # Codes possibles au plus (positions et symboles demandés)
+_CODE_BLOCK = 1 << 22  # Éléments par bloc de calcul numpy (essais × codes × symboles)
+
+@lru_cache(maxsize=8)
+def all_codes(spec):
+    length, symbols, repeats = spec
+    return tuple(''.join(code) for code in (product(symbols, repeat=length) if repeats else permutations(symbols, length)))
+
+@lru_cache(maxsize=8)
+def _code_arrays(spec):
+    """Codes en tableau (N, positions) et nombre de chaque symbole (N, symboles), pour le score vectorisé"""
+    length, symbols, _ = spec
+    rank = {s: i for i, s in enumerate(symbols)}
+    codes = np.array([[rank[s] for s in code] for code in all_codes(spec)], dtype=np.int8)
+    counts = np.zeros((len(codes), len(symbols)), dtype=np.int8)
+    for column in range(length):
+        np.add.at(counts, (np.arange(len(codes)), codes[:, column]), 1)
+    return codes, counts
+
+def code_feedback(guess, code):
+    """(bien placés, mal placés) : noirs et blancs au Mastermind, taureaux et vaches au Bulls and cows"""
+    black = sum(a == b for a, b in zip(guess, code))
+    return black, sum(min(guess.count(s), code.count(s)) for s in set(guess)) - black
+
+def _feedback_rows(spec, guesses, candidates):
+    """Réponses codées noirs × (positions + 1) + blancs, une ligne par essai (indices dans all_codes)"""
+    length = spec[0]
+    if np is None:
+        codes = all_codes(spec)
+        for g in guesses:
+            yield [black * (length + 1) + white for black, white in (code_feedback(codes[g], codes[c]) for c in candidates)]
+        return
+    codes, counts = _code_arrays(spec)
+    candidates = np.asarray(candidates)
+    targets, target_counts = codes[candidates], counts[candidates]
+    step = max(1, _CODE_BLOCK // (len(candidates) * max(length, len(spec[1]))))
+    guesses = np.asarray(guesses)
+    for start in range(0, len(guesses), step):
+        block = guesses[start:start + step]
+        black = (codes[block][:, None, :] == targets[None, :, :]).sum(axis=2)
+        common = np.minimum(counts[block][:, None, :], target_counts[None, :, :]).sum(axis=2)
+        yield from black * (length + 1) + common - black
+
+@lru_cache(maxsize=4096)
+def code_candidates(spec, history):
+    """Indices des codes compatibles avec toutes les réponses ; history : ((essai, noirs, blancs), ...)"""
+    if not history:
+        return tuple(range(len(all_codes(spec))))
+    previous = code_candidates(spec, history[:-1])
+    guess, black, white = history[-1]
+    row = next(_feedback_rows(spec, [_code_index(spec)[guess]], previous))
+    expected = black * (spec[0] + 1) + white
+    return tuple(c for c, answer in zip(previous, row) if answer == expected)
+
+@lru_cache(maxsize=8)
+def _code_index(spec):
+    return {code: i for i, code in enumerate(all_codes(spec))}
+
+def _guess_pool(spec, history):
+    """Essais utiles : les symboles encore jamais joués sont interchangeables, on n'en garde qu'un ordre d'apparition"""
+    used = set(''.join(guess for guess, _, _ in history))
+    rank = {s: i for i, s in enumerate(s for s in spec[1] if s not in used)}
+    pool = []
+    for i, code in enumerate(all_codes(spec)):
+        fresh = []
+        for s in code:
+            if s in rank and s not in fresh:
+                if rank[s] != len(fresh):
+                    break
+                fresh.append(s)
+        else:
+            pool.append(i)
+    return pool
+
+@lru_cache(maxsize=4096)
+def knuth_guess(spec, history):
+    """Essai qui minimise la plus grande classe de codes restants (Knuth) ; à égalité un code encore possible"""
+    candidates = code_candidates(spec, history)
+    codes = all_codes(spec)
+    if len(candidates) <= 2:
+        return codes[candidates[0]] if candidates else None
+    pool = _guess_pool(spec, history)
+    answers = (spec[0] + 1) ** 2
+    possible = set(candidates)
+    best_key, best = None, None
+    for g, row in zip(pool, _feedback_rows(spec, pool, candidates)):
+        worst = int(np.bincount(row, minlength=answers).max()) if np is not None else max(Counter(row).values())
+        key = (worst, g not in possible)
+        if best_key is None or key < best_key:
+            best_key, best = key, g
+    return codes[best]
+
+@game_state('reverse_guess', 'mon nombre')
+class ReverseGuessGame(GameState):
+    """Freev devine le nombre de l'utilisateur par dichotomie ; sans bornes données, après un « plus grand » il
+    essaie le double de la borne basse (recherche exponentielle) jusqu'au premier « plus petit »"""
+    __slots__ = ('low', 'high', 'guess', 'tries', 'bounded')
+
+    def next_guess(self):
+        self.guess = self.high if not self.bounded and self.tries else (self.low + self.high) // 2
+        self.tries += 1
+        return self.guess
+
+    def answer(self, higher):
+        """Resserre les bornes ; False si les réponses se contredisent"""
+        if higher:
+            self.low = self.guess + 1
+            if not self.bounded:
+                self.high = max(self.high, 2 * self.low)
+        else:
+            self.high = self.guess - 1
+            self.bounded = True
+        return self.low <= self.high
+
+@game_state('mastermind', 'mastermind')
+class CodeBreakerGame(GameState):
+    """Freev cherche le code secret de l'utilisateur ; history : [[essai, noirs, blancs], ...]"""
+    __slots__ = ('length', 'symbols', 'repeats', 'history', 'guess')
+
+    def spec(self):
+        return (self.length, self.symbols, self.repeats)
+
+    def next_guess(self):
+        self.guess = knuth_guess(self.spec(), tuple(map(tuple, self.history)))
+        return self.guess
+
+@benchmark('codes')
+def bench_code_breaking():
+    """Dichotomie sur 1..1000, Mastermind sur ses 1296 codes, Bulls and cows ; temps du premier coup et des suivants"""
+    worst = 0
+    for secret in range(1, 1001):
+        game = ReverseGuessGame(1, 1000, None, 0, True)
+        while game.next_guess() != secret:
+            game.answer(secret > game.guess)
+        worst = max(worst, game.tries)
+    game = ReverseGuessGame(1, 100, None, 0, False)
+    while game.next_guess() != 123_456:
+        game.answer(123_456 > game.guess)
+    print(f"dichotomie 1..1000 : {worst} essais au plus ({'ok' if worst <= 10 else 'ÉCART'}), "
+          f"123456 sans borne en {game.tries} essais")
+    for name, spec, limit, sample in (("Mastermind 4×6", MASTERMIND, 5, None), ("Bulls and cows 4×10", BULLS_AND_COWS, 7, 200)):
+        for cache in (code_candidates, knuth_guess):
+            cache.cache_clear()
+        first, _ = timed(knuth_guess, spec, ())
+        secrets_ = all_codes(spec) if sample is None else random.Random(50).sample(all_codes(spec), sample)
+        counts, start = Counter(), time.perf_counter()
+        for secret in secrets_:
+            history = ()
+            while True:
+                guess = knuth_guess(spec, history)
+                black, white = code_feedback(guess, secret)
+                if black == spec[0]:
+                    counts[len(history) + 1] += 1
+                    break
+                history += ((guess, black, white),)
+        seconds = time.perf_counter() - start
+        total = sum(counts.values())
+        average = sum(n * c for n, c in counts.items()) / total
+        print(f"{name} : premier coup {knuth_guess(spec, ())} en {first * 1000:.0f} ms, {total} codes résolus en {seconds:.2f} s "
+              f"(moyenne {average:.3f} essais, au plus {max(counts)} : {'ok' if max(counts) <= limit else 'ÉCART'})")
+        seconds, _ = timed(lambda: knuth_guess(spec, (("1122" if spec[2] else "0123", 1, 1),)), repeat=100)
+        print(f"  coup déjà calculé : {seconds * 1e6:.1f} µs")
+
+# --- Fin des devinettes ---
+
 class Freev:
     def __init__(self):
         self.context = []
@@ -66,8 +3988,12 @@ class Freev:
         # Ajout des modes de personnalité
         self.mode = "normal"  # Modes: normal, fun, dark, philosophique, gentil, cynique, motivant
         
-        # Pour jeux comme pendu
-        self.game_state = {}  # État des jeux: pendu, morpion, devine_nombre
+        # Parties en cours (pendu, morpion, devine le nombre...), journalisées par deltas dans GAMES_FILE
+        self.games = GameStore().session()
+        
+        # Échantillonneurs système : processus à la première demande, métriques en continu (psutil conseillé)
+        self.process_sampler = None
+        self.metrics_recorder = MetricsRecorder().start()
         
         # Niveau d'intelligence
         self.level = 0
@@ -138,17 +4064,22 @@ class Freev:
         self.re_translation = re.compile(r'traduis\s+(.+)', re.IGNORECASE)
         self.re_text_analysis = re.compile(r'analyse\s+["\'](.+)["\']', re.IGNORECASE)
         self.re_timer = re.compile(r'(minuteur|timer)\s+(\d+)\s+(minutes?|secondes?|heures?)', re.IGNORECASE)
-        self.re_unit_convert = re.compile(r'convert\s+(\d+\.?\d*)\s+(\w+)\s+to\s+(\w+)', re.IGNORECASE) # Supporte float
+        self.re_unit_convert = re.compile(r'conver(?:t|tis)\s+(-?\d+(?:[.,]\d+)?)\s*(\S+)\s+(?:to|en|vers)\s+(\S+)', re.IGNORECASE)
         self.re_bmi = re.compile(r'calcule imc poids (\d+\.?\d*) taille (\d+\.?\d*)', re.IGNORECASE) # Supporte float
         self.re_dice_roll = re.compile(r'lance dé\s*(\d+)?', re.IGNORECASE)
         
         # Codage
+        self.re_codec_file = re.compile(r'(encode|coder|chiffre|decode|décode|décoder|déchiffre)\s+(base64|morse|binary|binaire|caesar|c[ée]sar|vigen[eè]re)\s+fichier\s+(\S+)\s+vers\s+(\S+)(?:\s+(?:clé|cle|décalage)\s+(\S+))?', re.IGNORECASE)
+        self.re_crack = re.compile(r'casse\s+(caesar|c[ée]sar|vigen[eè]re)\s+(?:fichier\s+(\S+)(?:\s+vers\s+(\S+))?|(.+))', re.IGNORECASE)
         self.re_base64_encode = re.compile(r'encode base64\s+(.+)', re.IGNORECASE)
         self.re_base64_decode = re.compile(r'decode base64\s+(.+)', re.IGNORECASE)
         self.re_random_num = re.compile(r'nombre aléatoire\s+(\d+)\s+(\d+)', re.IGNORECASE)
         self.re_palindrome = re.compile(r'palindrome\s+(.+)', re.IGNORECASE)
-        self.re_fibonacci = re.compile(r'fibonacci\s+(\d+)', re.IGNORECASE)
+        self.re_fibonacci = re.compile(r'fibonacci\s+(terme\s+)?(\d+)(?:\s+mod(?:ulo)?\s+(\d+))?', re.IGNORECASE)
         self.re_prime_check = re.compile(r'premier\s+(\d+)', re.IGNORECASE)
+        self.re_prime_factors = re.compile(r'(?:factorise|d[ée]compose|facteurs(?:\s+premiers)?(?:\s+de)?)\s+(\d+)', re.IGNORECASE)
+        self.re_prime_nth = re.compile(r'(\d+)\s*(?:e|è|ème|eme|ième|ieme)\s+(?:nombre\s+)?premier\b|n-?i[èe]me\s+premier\s+(\d+)', re.IGNORECASE)
+        self.re_prime_range = re.compile(r'premiers\s+entre\s+(\d+)\s+et\s+(\d+)', re.IGNORECASE)
         self.re_morse_encode = re.compile(r'(encode|coder) morse\s+(.+)', re.IGNORECASE)
         self.re_morse_decode = re.compile(r'(decode|décoder) morse\s+(.+)', re.IGNORECASE)
         self.re_binary_encode = re.compile(r'(encode|coder) binary\s+(.+)', re.IGNORECASE)
@@ -162,18 +4093,25 @@ class Freev:
         # Avancé
         self.re_mode_change = re.compile(r'change de personnalité (fun|dark|philosophique|gentil|cynique|motivant)', re.IGNORECASE)
         self.re_simulator = re.compile(r'simule un (hacker|scientifique|philosophe)', re.IGNORECASE)
-        self.re_equation_solve = re.compile(r'résous (.+)', re.IGNORECASE)
-        self.re_equation_linear = re.compile(r'(\d*)x([+-]\d+)?=([+-]?\d+)', re.IGNORECASE)
-        self.re_equation_quad = re.compile(r'(\d*)x\^2([+-]\d+)x([+-]\d+)=0', re.IGNORECASE)
+        self.re_equation_solve = re.compile(r'r[ée]sous\s+(.+)', re.IGNORECASE)
         self.re_logical_reasoning = re.compile(r'si j’ai (\d+) (\w+) et j’en (donne|ajoute|mange) (\d+)', re.IGNORECASE)
         self.re_logical_rain = re.compile(r'si (.+) il pleut, que devrais-je faire', re.IGNORECASE)
-        self.re_file_analysis = re.compile(r'analyse fichier (.+)', re.IGNORECASE)
+        self.re_file_analysis = re.compile(r'analyse\s+(d[ée]taill[ée]e\s+)?fichier\s+(.+)', re.IGNORECASE)
         self.re_system_command = re.compile(r'exécute (.+)', re.IGNORECASE)
         self.re_file_explorer = re.compile(r'explore dossier\s*(.*)', re.IGNORECASE)
+        self.re_port_scan = re.compile(r'scann?(?:er|e)?\s+(?:de\s+|des\s+)?ports?(?:\s+(?:sur\s+)?([\w.:-]*[A-Za-z.:_][\w.:-]*))?(?:\s+(\d[\d,\s-]*))?\s*$', re.IGNORECASE)
+        self.re_text_search = re.compile(r'cherche\s+(?!note\s)(.+?)\s+dans\s+(?:le\s+)?(?:dossier\s+)?(.+)$', re.IGNORECASE)
+        self.re_duplicates = re.compile(r'doublons\s+(?:dans|de|du)\s+(?:dossier\s+)?(.+?)(?:\s+sauf\s+(.+))?$', re.IGNORECASE)
+        self.re_disk_usage = re.compile(r'(?:taille|du|explore\s+r[ée]cursif)\s+(?:du\s+)?dossier\s*(.*?)(?:\s+profondeur\s+(\d+))?(?:\s+top\s+(\d+))?(?:\s+sauf\s+(.+))?$', re.IGNORECASE)
         self.re_file_delete = re.compile(r'supprime fichier (.+)', re.IGNORECASE)
         self.re_text_summary = re.compile(r'résume ce texte : "(.+)"', re.IGNORECASE)
-        self.re_world_time = re.compile(r'heure à ([\w ]+)', re.IGNORECASE)
-        self.re_financial_calc = re.compile(r'épargne (\d+)€?/mois pendant (\d+) (ans|mois) à (\d+)%', re.IGNORECASE)
+        self.re_world_time = re.compile(r"heure (?:à|a|dans) ([\w ,'’/-]+)", re.IGNORECASE)
+        self.re_world_clock = re.compile(r'horloge mondiale|fuseaux horaires', re.IGNORECASE)
+        self.re_time_convert = re.compile(r"conver(?:t|tis)\s+(?:le\s+)?(?:(\d{4}-\d{2}-\d{2})\s+)?(?:à\s+)?(\d{1,2})\s*(?:h|:)\s*(\d{2})?\s+(?:de\s+|d'|à\s+)?(.+?)\s+(?:to|en|vers|pour|à|a)\s+(.+?)\s*$", re.IGNORECASE)
+        self.re_financial_calc = re.compile(r'épargne (\d+(?:[.,]\d+)?)\s*(?:€|euros?)?\s*/\s*mois pendant (\d+) (ans?|mois) à (\d+(?:[.,]\d+)?)\s*%', re.IGNORECASE)
+        self.re_loan = re.compile(r'(prêt|pret|emprunt|amortissement) (\d+(?:[.,]\d+)?)\s*(?:€|euros?)? sur (\d+) (ans?|mois) à (\d+(?:[.,]\d+)?)\s*%(?:\s+vers\s+(\S+))?', re.IGNORECASE)
+        self.re_inflation = re.compile(r'inflation (\d+(?:[.,]\d+)?)\s*(?:€|euros?)? sur (\d+(?:[.,]\d+)?) ans? à (\d+(?:[.,]\d+)?)\s*%', re.IGNORECASE)
+        self.re_loan_sweep = re.compile(r'scénarios? prêt (\d+(?:[.,]\d+)?)\s*(?:€|euros?)? de (\d+(?:[.,]\d+)?)\s*% à (\d+(?:[.,]\d+)?)\s*% sur (\d+) à (\d+) ans', re.IGNORECASE)
         self.re_search_history = re.compile(r'recherche dans historique ‘(.+)’', re.IGNORECASE)
         self.re_memory_theme = re.compile(r'souviens-toi que (.+?) c’est (.+)', re.IGNORECASE)
 
@@ -184,9 +4122,16 @@ class Freev:
         self.re_ip_locale = re.compile(r'mon ip locale', re.IGNORECASE)
         self.re_nom_hote = re.compile(r'mon nom d\'hote', re.IGNORECASE)
         self.re_liste_processus = re.compile(r'liste processus', re.IGNORECASE)
-        self.re_joue_morpion = re.compile(r'joue au morpion', re.IGNORECASE)
-        self.re_place_morpion = re.compile(r'place (x|o) en (\d),(\d)', re.IGNORECASE) # Ex: place x en 1,2
+        self.re_system_logs_history = re.compile(r'logs?\s+syst[èe]mes?\s+(?:sur\s+)?(?:les?\s+|la\s+)?(?:derni[èe]re?s?\s+)?(\d+)?\s*(heures?|h|minutes?|min|jours?|j)\b', re.IGNORECASE)
+        self.re_top_processus = re.compile(r'top processus(?:\s+(cpu|m[ée]m(?:oire)?))?', re.IGNORECASE)
+        self.re_joue_morpion = re.compile(r'joue au morpion(?:\s+(\d+)\s*[x×]\s*(\d+))?(?:\s+(\d+)\s+align[ée]s)?(?:\s+(facile|moyen|difficile))?', re.IGNORECASE)
+        self.re_place_morpion = re.compile(r'place (x|o) en (\d+)\s*,\s*(\d+)', re.IGNORECASE) # Ex: place x en 1,2
         self.re_jeu_devine_nombre = re.compile(r'jeu devine le nombre', re.IGNORECASE)
+        self.re_game_switch = re.compile(r"(reprends|reprendre|abandonne|abandonner)\s+(?:la partie de\s+|le\s+|la\s+|l')?(pendu|morpion|mon nombre|nombre|mastermind|devinette|histoire|choix moral)\b", re.IGNORECASE)
+        self.re_devine_mon_nombre = re.compile(r'devine (?:mon|un) nombre(?:\s+entre\s+(-?\d+)\s+et\s+(-?\d+))?', re.IGNORECASE)
+        self.re_reponse_nombre = re.compile(r"^\s*(?:c'est\s+)?(plus\s+grand|plus\s+petit|plus|moins|trouvé|gagné|bravo|oui|exact|[+<>=-])\s*[.!]*$", re.IGNORECASE)
+        self.re_joue_mastermind = re.compile(r'joue au (mastermind|bulls and cows|taureaux et vaches)(?:\s+(\d+)\s+positions?)?(?:\s+(\d+)\s+(?:couleurs|chiffres|symboles))?', re.IGNORECASE)
+        self.re_reponse_code = re.compile(r'^\s*(\d+)\s*[ ,/-]?\s*(\d+)\s*$')  # Message entier « 1 2 », « 1,2 », « 1/2 »
         self.re_dessine = re.compile(r'dessine un (.+)', re.IGNORECASE)
         self.re_calendrier = re.compile(r'calendrier\s*([\w]+)?\s*(\d{4})?', re.IGNORECASE) # ex: calendrier decembre 2025
         self.re_mots_cles = re.compile(r'mots cles de "(.+)"', re.IGNORECASE)
@@ -195,23 +4140,11 @@ class Freev:
         self.re_convertir_maj = re.compile(r'convertir en majuscule "(.+)"', re.IGNORECASE)
 
 
-        # Opérations mathématiques pré-compilées
-        self.math_ops = {
-            re.compile(r'(\d+)\s*\+\s*(\d+)', re.IGNORECASE): lambda a, b: a + b,
-            re.compile(r'(\d+)\s*-\s*(\d+)', re.IGNORECASE): lambda a, b: a - b,
-            re.compile(r'(\d+)\s*\*\s*(\d+)', re.IGNORECASE): lambda a, b: a * b,
-            re.compile(r'(\d+)\s*/\s*(\d+)', re.IGNORECASE): lambda a, b: a / b if b != 0 else "Division par zéro !",
-            re.compile(r'(\d+)\s*\^\s*(\d+)', re.IGNORECASE): lambda a, b: a ** b,
-            re.compile(r'racine de (\d+)', re.IGNORECASE): lambda a: math.sqrt(a),
-            re.compile(r'sin\((\d+)\)', re.IGNORECASE): lambda a: math.sin(math.radians(a)),
-            re.compile(r'cos\((\d+)\)', re.IGNORECASE): lambda a: math.cos(math.radians(a)),
-            re.compile(r'tan\((\d+)\)', re.IGNORECASE): lambda a: math.tan(math.radians(a)),
-            re.compile(r'log\((\d+)\)', re.IGNORECASE): lambda a: math.log10(a),
-            re.compile(r'ln\((\d+)\)', re.IGNORECASE): lambda a: math.log(a),
-            re.compile(r'exp\((\d+)\)', re.IGNORECASE): lambda a: math.exp(a),
-            re.compile(r'factorielle de (\d+)', re.IGNORECASE): lambda a: math.factorial(a),
-            re.compile(r'pi', re.IGNORECASE): lambda: math.pi
-        }
+        # Calculs : l'expression est analysée par parse_expression (voir plus haut)
+        self.re_math_prefix = re.compile(r'^\s*(?:calcule[rz]?|calc|combien (?:font|fait)|que vaut)\s+', re.IGNORECASE)
+        self.re_math_legacy = re.compile(r'\b(racine|factorielle) de\b', re.IGNORECASE)
+        self.re_math_chars = re.compile(r'^[\w\s.,+\-*/%^!()=×÷]+$')
+        self.math_vars = {}  # Variables de session : "x = 3", puis "2x + 1" ; "ans" = dernier résultat
         
         # --- Fin des Regex ---
 
@@ -874,7 +4807,7 @@ class Freev:
                         pass # Ignorer les rappels mal formatés
                 
                 self.mode = data.get('mode', "normal")  # Charger mode
-                self.game_state = data.get('game_state', {})  # Charger état jeux
+                self.games.import_legacy(data.get('game_state'))  # Parties des anciennes versions
                 self.level = data.get('level', 0)
                 self.themed_memory = data.get('themed_memory', {})
                 self.user_style = data.get('user_style', [])
@@ -901,7 +4834,6 @@ class Freev:
                     'notes': self.notes,
                     'reminders': reminders_to_save, # Sauver la version str
                     'mode': self.mode,
-                    'game_state': self.game_state,
                     'level': self.level,
                     'themed_memory': self.themed_memory,
                     'user_style': self.user_style,
@@ -1366,45 +5298,26 @@ class Freev:
         return None
     
     def handle_unit_conversion(self, text):
-        """Conversions d'unités"""
+        """Conversions d'unités (dimensions, préfixes, unités composées, températures) et de devises"""
         conv_match = self.re_unit_convert.search(text)
-        if conv_match:
-            value = float(conv_match.group(1))
-            from_unit = conv_match.group(2).lower()
-            to_unit = conv_match.group(3).lower()
-            conversions = {
-                ("km", "miles"): value * 0.621371,
-                ("miles", "km"): value * 1.60934,
-                ("kg", "lbs"): value * 2.20462,
-                ("lbs", "kg"): value / 2.20462,
-                ("celsius", "fahrenheit"): (value * 9/5) + 32,
-                ("fahrenheit", "celsius"): (value - 32) * 5/9
-            }
-            result = conversions.get((from_unit, to_unit))
-            if result is not None:
-                return f"📏 {value} {from_unit} = {Colors.BRIGHT_GREEN}{result:.2f} {to_unit}{Colors.RESET}"
-            
-            # Si non trouvé, tester les devises
-            return self.handle_currency_conversion(text, conv_match)
-        return None
-    
-    def handle_currency_conversion(self, text, match):
-        """Conversions de devises (taux fixes approximatifs)"""
-        # Appelé par handle_unit_conversion si le match est déjà fait
-        value = float(match.group(1))
-        from_curr = match.group(2).upper()
-        to_curr = match.group(3).upper()
-        
-        rates = {  # Taux approximatifs 2023
-            "EUR": {"USD": 1.1, "GBP": 0.85},
-            "USD": {"EUR": 0.91, "GBP": 0.77},
-            "GBP": {"EUR": 1.18, "USD": 1.3}
-        }
-        if from_curr in rates and to_curr in rates[from_curr]:
-            result = value * rates[from_curr][to_curr]
-            return f"💱 {value} {from_curr} ≈ {Colors.BRIGHT_GREEN}{result:.2f} {to_curr}{Colors.RESET} (taux approx.)"
-        
-        return "❌ Conversion non supportée."
+        if not conv_match:
+            return None
+        value = float(conv_match.group(1).replace(',', '.'))
+        source, target = conv_match.group(2), conv_match.group(3).rstrip('?.!')
+        codes = [currency_code(source), currency_code(target)]
+        if any(codes):  # Devises avant parse_unit : « eur » n'est pas une unité inconnue
+            if not all(codes):
+                return f"❌ Conversion impossible : {target if codes[0] else source} n'est pas une devise"
+            amount, updated, origin = convert_currency(value, *codes)
+            if amount is None:
+                return (f"❌ Taux {codes[0]} → {codes[1]} inconnu ({origin}, {updated}). Devises disponibles : "
+                        f"{', '.join(available_currencies())} ; d'autres taux peuvent être ajoutés dans {RATES_FILE}")
+            return f"💱 {value:g} {codes[0]} ≈ {Colors.BRIGHT_GREEN}{amount:.2f} {codes[1]}{Colors.RESET} ({origin}, {updated})"
+        try:
+            result = convert_unit(value, source, target)
+        except UnitError as e:
+            return f"❌ Conversion impossible : {e}"
+        return f"📏 {value:g} {source} = {Colors.BRIGHT_GREEN}{result:.6g} {target}{Colors.RESET}"
     
     def handle_bmi(self, text):
         """Calcul IMC"""
@@ -1551,78 +5464,174 @@ class Freev:
         return None
     
     def handle_fibonacci(self, text):
-        """Génère suite de Fibonacci"""
+        """Fibonacci : suite (affichée par blocs), terme F(n) pour n très grand, F(n) mod m"""
         fib_match = self.re_fibonacci.search(text)
-        if fib_match:
-            n = int(fib_match.group(1))
-            if n > 200: return "❌ Limite de 200 termes pour Fibonacci." # Sécurité
-            fib = [0, 1]
-            for i in range(2, n):
-                fib.append(fib[-1] + fib[-2])
-            return f"📈 Suite Fibonacci ({n} termes) : {Colors.BRIGHT_GREEN}{', '.join(map(str, fib[:n]))}{Colors.RESET}"
-        
+        if not fib_match:
+            return None
+        term, n, modulus = fib_match.group(1), int(fib_match.group(2)), fib_match.group(3)
+        if modulus is not None:
+            m = int(modulus)
+            if m < 1:
+                return "❌ Le modulo doit être au moins 1."
+            return f"📈 F({n}) mod {m} = {Colors.BRIGHT_GREEN}{fibonacci_mod(n, m)}{Colors.RESET}"
+        if term:
+            if n > FIB_MAX_INDEX:
+                return f"❌ Terme limité à F({FIB_MAX_INDEX}) (essayez « fibonacci {n} mod 1000000007 »)."
+            digits, lead, tail = digits_summary(fibonacci(n))
+            if digits <= 60:
+                return f"📈 F({n}) = {Colors.BRIGHT_GREEN}{fibonacci(n)}{Colors.RESET}"
+            return f"📈 F({n}) : {Colors.BRIGHT_GREEN}{digits}{Colors.RESET} chiffres, {lead}…{tail}"
+        if n > FIB_MAX_TERMS:
+            return f"❌ Limite de {FIB_MAX_TERMS} termes pour la suite (utilisez « fibonacci terme {n} »)."
+        if n <= 200:
+            return f"📈 Suite Fibonacci ({n} termes) : {Colors.BRIGHT_GREEN}{', '.join(map(str, iter_fibonacci(n)))}{Colors.RESET}"
+        # Longue suite : écrite bloc par bloc au lieu d'une seule chaîne géante
+        print(f"📈 Suite Fibonacci ({n} termes) :")
+        terms = iter_fibonacci(n)
+        for start in range(0, n, FIB_CHUNK):
+            chunk = [str(next(terms)) for _ in range(min(FIB_CHUNK, n - start))]
+            sys.stdout.write(f"{Colors.BRIGHT_GREEN}{', '.join(chunk)}{Colors.RESET}\n")
+            sys.stdout.flush()
+        digits, _, _ = digits_summary(fibonacci(n - 1))
+        return f"📈 {n} termes affichés (F({n - 1}) compte {digits} chiffres)."
+    
+    def handle_prime_tools(self, text):
+        """Factorisation, n-ième premier et premiers d'un intervalle"""
+        factor_match = self.re_prime_factors.search(text)
+        if factor_match:
+            digits = factor_match.group(1)
+            if len(digits) > PRIME_MAX_DIGITS:
+                return f"❌ Factorisation limitée à {PRIME_MAX_DIGITS} chiffres."
+            num = int(digits)
+            if num < 2:
+                return f"🔢 {num} n'a pas de facteurs premiers."
+            factors, cofactors = factorize(num)
+            if len(factors) == 1 and num in factors:
+                return f"🔢 {num} est premier, il est son propre facteur."
+            if cofactors:
+                parts = ' × '.join(filter(None, [format_factors(factors), *map(str, cofactors)]))
+                return (f"🔢 {num} = {Colors.BRIGHT_GREEN}{parts}{Colors.RESET}\n"
+                        f"⚠️ {', '.join(map(str, cofactors))} : cofacteur composite non factorisé "
+                        f"(budget de {PRIME_FACTOR_BUDGET:g} s épuisé).")
+            return f"🔢 {num} = {Colors.BRIGHT_GREEN}{format_factors(factors)}{Colors.RESET}"
+        nth_match = self.re_prime_nth.search(text)
+        if nth_match:
+            n = int(nth_match.group(1) or nth_match.group(2))
+            if not 1 <= n <= PRIME_MAX_NTH:
+                return f"❌ Rang entre 1 et {PRIME_MAX_NTH}."
+            return f"🔢 Le {n}e nombre premier est {Colors.BRIGHT_GREEN}{nth_prime(n)}{Colors.RESET}."
+        range_match = self.re_prime_range.search(text)
+        if range_match:
+            low, high = sorted((int(range_match.group(1)), int(range_match.group(2))))
+            if high - low > PRIME_MAX_INTERVAL:
+                return f"❌ Intervalle limité à {PRIME_MAX_INTERVAL} nombres."
+            primes = iter_primes(low, high)
+            first = [str(p) for _, p in zip(range(200), primes)]
+            total, last = len(first), None
+            for last in primes:
+                total += 1
+            shown = ', '.join(first) or 'aucun' if last is None else f"{', '.join(first[:10])}, …, {last}"
+            return f"🔢 {total} premiers entre {low} et {high} : {Colors.BRIGHT_GREEN}{shown}{Colors.RESET}"
         return None
     
     def handle_prime_check(self, text):
-        """Vérifie si nombre premier"""
+        """Vérifie si nombre premier (Miller-Rabin)"""
         prime_match = self.re_prime_check.search(text)
         if not prime_match:
             return None
-        try:
-            num = int(prime_match.group(1))
-            if num > 1:
-                if num > 1000000: return "❌ Nombre trop grand pour vérification rapide." # Sécurité
-                for i in range(2, int(math.sqrt(num)) + 1):
-                    if num % i == 0:
-                        return f"🔢 {num} n'est pas premier."
-                return f"🔢 {num} est premier ! {Colors.BRIGHT_GREEN}Oui{Colors.RESET}"
+        digits = prime_match.group(1)
+        if len(digits) > 1000:
+            return "❌ Nombre limité à 1000 chiffres."
+        num = int(digits)
+        if not is_prime(num):
             return f"🔢 {num} n'est pas premier."
-        except ValueError:
-            return "❌ Nombre invalide."
+        if num >= MR_DETERMINISTIC_LIMIT:
+            return f"🔢 {num} est {Colors.BRIGHT_GREEN}probablement premier{Colors.RESET} (Miller-Rabin, erreur < 4^-{MR_EXTRA_ROUNDS + len(MR_BASES)})."
+        return f"🔢 {num} est premier ! {Colors.BRIGHT_GREEN}Oui{Colors.RESET}"
+    
+    def handle_codec_file(self, text):
+        """Encode/décode un fichier entier en flux, par blocs (mémoire constante)"""
+        file_match = self.re_codec_file.search(text)
+        if not file_match:
+            return None
+        action, name, source, target, key = file_match.groups()
+        decode = action.lower().startswith('d')
+        name = CODEC_NAMES[name.lower()]
+        start = time.perf_counter()
+        try:
+            read, written = stream_codec(name, source, target, decode, key)
+        except FileNotFoundError:
+            return f"❌ Fichier introuvable : {source}"
+        except (CodecError, ValueError, OSError) as e:
+            return f"❌ {name} : {e}"
+        seconds = time.perf_counter() - start
+        speed = read / (1 << 20) / seconds if seconds > 0 else float('inf')
+        return f"🔢 {name} {'décodé' if decode else 'encodé'} : {source} ({read} octets) → {Colors.BRIGHT_GREEN}{target}{Colors.RESET} ({written} octets, {speed:.1f} Mo/s)"
+    
+    def handle_cryptanalysis(self, text):
+        """Retrouve la clé César/Vigenère d'un texte ou d'un fichier chiffré (fréquences FR/EN)"""
+        crack_match = self.re_crack.search(text)
+        if not crack_match:
+            return None
+        name, source, target, inline = crack_match.groups()
+        name = CODEC_NAMES[name.lower()]
+        if source:
+            try:
+                with open(source, 'rb') as f:
+                    data = f.read(CRACK_SAMPLE)
+            except OSError as e:
+                return f"❌ Lecture de {source} impossible : {e}"
+        else:
+            data = inline.encode('utf-8')
+        letters = letters_only(data)
+        if len(letters) < 2 * CRACK_MIN_COLUMN:
+            return "❌ Texte trop court pour une analyse de fréquences."
+        if name == 'caesar':
+            key, language, _ = crack_caesar(letters)
+            found = f"décalage {Colors.BRIGHT_GREEN}{key}{Colors.RESET}"
+        else:
+            key, language, _ = crack_vigenere(letters)
+            found = f"clé {Colors.BRIGHT_GREEN}{key}{Colors.RESET} (longueur {len(key)})"
+        header = f"🔓 {'César' if name == 'caesar' else 'Vigenère'} cassé : {found}, langue probable {LANGUAGE_NAMES[language]}"
+        if source and target:
+            try:
+                stream_codec(name, source, target, decode=True, key=key)
+            except (CodecError, OSError) as e:
+                return f"{header}\n❌ Écriture de {target} impossible : {e}"
+            return f"{header}\n📄 Texte déchiffré dans {target}"
+        preview = codec_text(name, data[:2000].decode('utf-8', errors='replace'), decode=True, key=key)
+        return f"{header}\n    {preview[:300]}{'…' if len(preview) > 300 else ''}"
     
     def handle_morse(self, text):
         """Encode ou décode en Morse"""
-        morse_code = {
-            'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 'F': '..-.',
-            'G': '--.', 'H': '....', 'I': '..', 'J': '.---', 'K': '-.-', 'L': '.-..',
-            'M': '--', 'N': '-.', 'O': '---', 'P': '.--.', 'Q': '--.-', 'R': '.-.',
-            'S': '...', 'T': '-', 'U': '..-', 'V': '...-', 'W': '.--', 'X': '-..-',
-            'Y': '-.--', 'Z': '--..', '0': '-----', '1': '.----', '2': '..---',
-            '3': '...--', '4': '....-', '5': '.....', '6': '-....', '7': '--...',
-            '8': '---..', '9': '----.', ' ': '/'
-        }
-        
-        reverse_morse = {v: k for k, v in morse_code.items()}
-        
         encode_match = self.re_morse_encode.search(text)
         if encode_match:
-            content = encode_match.group(2).upper()
-            encoded = ' '.join(morse_code.get(c, '') for c in content)
+            encoded = codec_text('morse', encode_match.group(2)).rstrip()
             return f"🔢 Morse encodé : {Colors.BRIGHT_GREEN}{encoded}{Colors.RESET}"
         
         decode_match = self.re_morse_decode.search(text)
         if decode_match:
-            content = decode_match.group(2)
-            decoded = ''.join(reverse_morse.get(code, '') for code in content.split(' '))
+            try:
+                decoded = codec_text('morse', decode_match.group(2), decode=True)
+            except CodecError:
+                return "❌ Erreur de décodage morse."
             return f"🔢 Morse décodé : {Colors.BRIGHT_GREEN}{decoded}{Colors.RESET}"
         
         return None
     
     def handle_binary(self, text):
-        """Encode ou décode en binaire"""
+        """Encode ou décode en binaire (octets UTF-8)"""
         encode_match = self.re_binary_encode.search(text)
         if encode_match:
-            content = encode_match.group(2)
-            encoded = ' '.join(format(ord(c), '08b') for c in content)
+            encoded = codec_text('binary', encode_match.group(2))
             return f"🔢 Binaire encodé : {Colors.BRIGHT_GREEN}{encoded}{Colors.RESET}"
         
         decode_match = self.re_binary_decode.search(text)
         if decode_match:
-            content = decode_match.group(2)
             try:
-                decoded = ''.join(chr(int(b, 2)) for b in content.split(' '))
+                decoded = codec_text('binary', decode_match.group(2), decode=True)
                 return f"🔢 Binaire décodé : {Colors.BRIGHT_GREEN}{decoded}{Colors.RESET}"
-            except ValueError:
+            except CodecError:
                 return "❌ Erreur de décodage binaire."
         
         # Convertis en binaire (nombre)
@@ -1636,54 +5645,32 @@ class Freev:
     
     def handle_caesar(self, text):
         """Encode ou décode avec chiffrement César"""
-        shift = 3  # Décalage par défaut
+        shift = CODEC_DEFAULT_SHIFT
         
         encode_match = self.re_caesar_encode.search(text)
         if encode_match:
-            content = encode_match.group(2).upper()
-            encoded = ''.join(chr((ord(c) - 65 + shift) % 26 + 65) if c.isalpha() else c for c in content)
+            encoded = codec_text('caesar', encode_match.group(2).upper(), key=shift)
             return f"🔢 César encodé (shift {shift}) : {Colors.BRIGHT_GREEN}{encoded}{Colors.RESET}"
         
         decode_match = self.re_caesar_decode.search(text)
         if decode_match:
-            content = decode_match.group(2).upper()
-            decoded = ''.join(chr((ord(c) - 65 - shift) % 26 + 65) if c.isalpha() else c for c in content)
+            decoded = codec_text('caesar', decode_match.group(2).upper(), decode=True, key=shift)
             return f"🔢 César décodé (shift {shift}) : {Colors.BRIGHT_GREEN}{decoded}{Colors.RESET}"
         
         return None
 
     def handle_vigenere(self, text):
         """Chiffrement/déchiffrement Vigenère simple"""
-        key = "CLE"  # Clé par défaut
+        key = CODEC_DEFAULT_KEY
         
         encode_match = self.re_vigenere_encode.search(text)
         if encode_match:
-            content = encode_match.group(2).upper()
-            key_upper = key.upper()
-            encoded = ''
-            key_index = 0
-            for c in content:
-                if c.isalpha():
-                    shift = ord(key_upper[key_index % len(key_upper)]) - 65
-                    encoded += chr((ord(c) - 65 + shift) % 26 + 65)
-                    key_index += 1
-                else:
-                    encoded += c
+            encoded = codec_text('vigenere', encode_match.group(2).upper(), key=key)
             return f"🔢 Vigenère encodé (clé: {key}) : {Colors.BRIGHT_GREEN}{encoded}{Colors.RESET}"
         
         decode_match = self.re_vigenere_decode.search(text)
         if decode_match:
-            content = decode_match.group(2).upper()
-            key_upper = key.upper()
-            decoded = ''
-            key_index = 0
-            for c in content:
-                if c.isalpha():
-                    shift = ord(key_upper[key_index % len(key_upper)]) - 65
-                    decoded += chr((ord(c) - 65 - shift) % 26 + 65)
-                    key_index += 1
-                else:
-                    decoded += c
+            decoded = codec_text('vigenere', decode_match.group(2).upper(), decode=True, key=key)
             return f"🔢 Vigenère décodé (clé: {key}) : {Colors.BRIGHT_GREEN}{decoded}{Colors.RESET}"
         
         return None
@@ -1803,50 +5790,26 @@ class Freev:
         text_lower = text.lower()
         if "joue au pendu" in text_lower:
             words = ["python", "assistant", "freev", "intelligence", "local"]
-            word = random.choice(words)
-            self.game_state['hangman'] = {
-                'word': word,
-                'guessed': set(),
-                'tries': 6
-            }
-            self.save_memory()
-            return "🪢 Jeu du pendu commencé ! Mot à deviner : " + " ".join("_" if c not in self.game_state['hangman']['guessed'] else c for c in word)
+            state = self.games.start(HangmanGame(random.choice(words), '', 6))
+            return "🪢 Jeu du pendu commencé ! Mot à deviner : " + state.masked()
         
-        if 'hangman' in self.game_state:
+        state = self.games.current('hangman')
+        if state:
             guess = text.strip() # Pas de .lower() ici, géré dans l'état
             if len(guess) == 1 and guess.isalpha():
-                state = self.game_state['hangman']
-                guess_lower = guess.lower()
-                if guess_lower in state['guessed']:
+                if not state.guess(guess.lower()):
                     return "Déjà deviné !"
-                
-                state['guessed'].add(guess_lower)
-                
-                if guess_lower not in state['word']:
-                    state['tries'] -= 1
-                    
-                # Construction de l'affichage
-                masked_word = ""
-                for c in state['word']:
-                    if c in state['guessed']:
-                        masked_word += c + " "
-                    else:
-                        masked_word += "_ "
-                
-                masked = masked_word.strip()
 
-                if "_" not in masked:
-                    del self.game_state['hangman']
-                    self.save_memory()
-                    return f"🎉 Gagné ! Le mot était {state['word']}"
+                if state.solved():
+                    self.games.end('hangman')
+                    return f"🎉 Gagné ! Le mot était {state.word}"
                 
-                if state['tries'] == 0:
-                    del self.game_state['hangman']
-                    self.save_memory()
-                    return f"😞 Perdu ! Le mot était {state['word']}"
+                if state.tries == 0:
+                    self.games.end('hangman')
+                    return f"😞 Perdu ! Le mot était {state.word}"
                 
-                self.save_memory()
-                return f"Essais restants: {state['tries']} | {masked}"
+                self.games.save(state)
+                return f"Essais restants: {state.tries} | {state.masked()}"
         
         return None
     
@@ -1854,21 +5817,17 @@ class Freev:
         """Simulateur de choix moraux"""
         text_lower = text.lower()
         if "simulateur de choix moraux" in text_lower:
-            self.game_state['moral'] = {
-                'scenario': "Vous trouvez un portefeuille avec de l'argent. Que faites-vous ? (rendre / garder)"
-            }
-            self.save_memory()
-            return "🤔 Scénario : " + self.game_state['moral']['scenario']
+            state = self.games.start(MoralGame("Vous trouvez un portefeuille avec de l'argent. Que faites-vous ? (rendre / garder)"))
+            return "🤔 Scénario : " + state.scenario
         
-        if 'moral' in self.game_state:
+        if self.games.current('moral'):
             if "rendre" in text_lower:
                 response = "Bon choix moral ! Vous gagnez du karma positif."
             elif "garder" in text_lower:
                 response = "Choix risqué... Vous pourriez avoir des regrets."
             else:
                 return "Choisissez : rendre ou garder ?"
-            del self.game_state['moral']
-            self.save_memory()
+            self.games.end('moral')
             return response
         
         return None
@@ -1877,24 +5836,19 @@ class Freev:
         """Générateur d’histoires interactives"""
         text_lower = text.lower()
         if "raconte une histoire interactive" in text_lower:
-            self.game_state['story'] = {
-                'step': 0,
-                'plot': ["Vous êtes dans une forêt sombre. Allez-vous à gauche ou à droite ?"]
-            }
-            self.save_memory()
-            return "📖 Histoire interactive : " + self.game_state['story']['plot'][0]
+            self.games.start(StoryGame(0))
+            return "📖 Histoire interactive : Vous êtes dans une forêt sombre. Allez-vous à gauche ou à droite ?"
         
-        if 'story' in self.game_state:
-            state = self.game_state['story']
-            if state['step'] == 0:
+        state = self.games.current('story')
+        if state:
+            if state.step == 0:
                 if "gauche" in text_lower:
                     next_plot = "Vous trouvez un trésor ! Fin heureuse."
                 elif "droite" in text_lower:
                     next_plot = "Vous rencontrez un loup. Fin tragique."
                 else:
                     return "Choisissez : gauche ou droite ?"
-                del self.game_state['story']
-                self.save_memory()
+                self.games.end('story')
                 return next_plot
         
         return None
@@ -1904,25 +5858,47 @@ class Freev:
         text_lower = text.lower()
         if "devinette chronométrée" in text_lower:
             riddle, answer = random.choice(list(zip(self.responses["riddles"], ["un journal lu", "l'écho", "une bouteille", "l'avenir", "l'eau", "un lit", "le souffle", "la montagne", "la glace", "ton nom"])))
-            self.game_state['riddle'] = {'answer': answer.lower(), 'start': time.time()}
+            self.games.start(RiddleGame(answer.lower(), time.time()))
             return f"🧩 Devinette (30s pour répondre) : {riddle}"
         
-        if 'riddle' in self.game_state:
+        state = self.games.current('riddle')
+        if state:
             user_answer = text_lower
-            correct_answer = self.game_state['riddle']['answer']
-            elapsed = time.time() - self.game_state['riddle']['start']
+            elapsed = time.time() - state.start
             if elapsed > 30:
-                del self.game_state['riddle']
-                self.save_memory()
-                return f"⌛ Temps écoulé ! Réponse : {correct_answer}"
-            if user_answer == correct_answer:
-                del self.game_state['riddle']
-                self.save_memory()
+                self.games.end('riddle')
+                return f"⌛ Temps écoulé ! Réponse : {state.answer}"
+            if user_answer == state.answer:
+                self.games.end('riddle')
                 return "✅ Bonne réponse dans le temps !"
             else:
                 return f"❌ Essayez encore (temps restant : {30 - elapsed:.0f}s)"
         
         return None
+
+    def handle_games(self, text):
+        """Parties en cours : liste, reprise d'une partie en pause, abandon"""
+        text_lower = text.lower().strip()
+        if text_lower in ("mes parties", "parties en cours", "liste des parties"):
+            if not self.games.games:
+                return "🎮 Aucune partie en cours."
+            lines = [f"{Colors.BOLD}🎮 Parties en cours :{Colors.RESET}"]
+            for kind, game in reversed(list(self.games.games.items())):
+                status = f"{Colors.BRIGHT_GREEN}active{Colors.RESET}" if kind == self.games.active else "en pause"
+                lines.append(f"  • {game.label} ({status})")
+            return "\n".join(lines)
+        match = self.re_game_switch.search(text)
+        if match:
+            label = match.group(2).lower()
+            kind = next((kind for kind, cls in GAME_STATES.items() if cls.label == label or kind == label), None)
+            if kind is None or kind not in self.games.games:
+                return f"❌ Pas de partie de {label} en cours."
+            if match.group(1).lower().startswith('abandon'):
+                self.games.end(kind)
+                return f"🏳️ Partie de {label} abandonnée."
+            self.games.resume(kind)
+            return f"▶️ On reprend la partie de {label}."
+        return None
     
     def handle_simulator(self, text):
         """Mode simulateur"""
@@ -1939,52 +5915,34 @@ class Freev:
         return None
     
     def handle_equation_solver(self, text):
-        """Résolveur d'équations simples (linéaires) (amélioré)"""
+        """Résout un polynôme à une inconnue (termes des deux côtés) ou un système linéaire 2×2 / 3×3"""
         eq_match = self.re_equation_solve.search(text)
-        if eq_match:
-            equation = eq_match.group(1).replace(" ", "")
-            
-            # Simple parser pour ax + b = c ou plus
-            match = self.re_equation_linear.match(equation)
-            if match:
-                a_str = match.group(1)
-                a = 1
-                if a_str and a_str != '+':
-                    try: a = int(a_str)
-                    except ValueError: pass # Gérer 'x' seul
-
-                b = int(match.group(2) or 0)
-                c = int(match.group(3))
-                if a == 0: return "📊 Équation invalide (a=0)."
-                x = (c - b) / a
-                return f"📊 Solution : x = {Colors.BRIGHT_GREEN}{x}{Colors.RESET}"
-            
-            # Pour quadratique simple ax^2 + bx + c = 0 (discriminant positif)
-            quad_match = self.re_equation_quad.match(equation)
-            if quad_match:
-                a_str = quad_match.group(1)
-                a = 1
-                if a_str and a_str != '+':
-                    try: a = int(a_str)
-                    except ValueError: pass
-
-                b = int(quad_match.group(2))
-                c = int(quad_match.group(3))
-                
-                if a == 0: return "📊 Ce n'est pas une équation quadratique (a=0)."
-
-                disc = b**2 - 4*a*c
-                if disc > 0:
-                    x1 = (-b + math.sqrt(disc)) / (2*a)
-                    x2 = (-b - math.sqrt(disc)) / (2*a)
-                    return f"📊 Solutions : x1 = {x1:.2f}, x2 = {x2:.2f}"
-                elif disc == 0:
-                    x = -b / (2*a)
-                    return f"📊 Solution : x = {x:.2f}"
-                else:
-                    return "📊 Pas de solution réelle."
-            return "⚠️ Équation non supportée (format: ax+b=c ou ax^2+bx+c=0)"
-        return None
+        if not eq_match:
+            return None
+        try:
+            kind, names, solution = solve_equation(eq_match.group(1))
+        except (ExpressionError, ZeroDivisionError, OverflowError) as e:
+            return f"⚠️ Équation non supportée : {e}"
+        if kind == 'system':
+            if solution is None:
+                return "📊 Pas de solution unique (système dégénéré)."
+            values = ', '.join(f"{name} = {Colors.BRIGHT_GREEN}{format_root(value)}{Colors.RESET}" for name, value in solution.items())
+            return f"📊 Solution : {values}"
+        if solution[0] == 'all':
+            return f"📊 Toute valeur de {names} est solution."
+        if solution[0] == 'none':
+            return "📊 Aucune solution."
+        counts = Counter(solution[1])
+        roots = list(dict.fromkeys(solution[1]))  # Racines distinctes, dans l'ordre, avec leur multiplicité
+        def shown(root):
+            m = counts[root]
+            plural = 's' if isinstance(root, tuple) else ''  # ('sqrt', ...) : deux racines de même multiplicité
+            return format_root(root) + ('' if m == 1 else f" (racine{plural} {ROOT_MULTIPLICITY.get(m, f'de multiplicité {m}')}{plural if m in ROOT_MULTIPLICITY else ''})")
+        if len(roots) == 1:
+            label = "Solutions" if isinstance(roots[0], tuple) else "Solution"
+            return f"📊 {label} : {names} = {Colors.BRIGHT_GREEN}{shown(roots[0])}{Colors.RESET}"
+        lines = [f"    {names}{i} = {Colors.BRIGHT_GREEN}{shown(r)}{Colors.RESET}" for i, r in enumerate(roots, 1)]
+        return "📊 Solutions :\n" + "\n".join(lines)
     
     def handle_logical_reasoning(self, text):
         """Moteur logique / raisonnement"""
@@ -2009,23 +5967,35 @@ class Freev:
         return None
     
     def handle_file_analysis(self, text):
-        """Analyse de fichiers texte"""
+        """Analyse de fichiers texte en flux (taille quelconque), statistiques détaillées en option"""
         file_match = self.re_file_analysis.search(text)
         if file_match:
-            filename = file_match.group(1)
-            if not os.path.exists(filename):
+            details, filename = bool(file_match.group(1)), file_match.group(2).strip()
+            if not os.path.isfile(filename):
                 return "⚠️ Fichier non trouvé."
             try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                words = len(content.split())
-                lines = len(content.splitlines())
-                chars = len(content)
-                size = os.path.getsize(filename)
+                start = time.perf_counter()
+                stats = analyze_file(filename, details)
+                seconds = time.perf_counter() - start
                 mod_time = datetime.fromtimestamp(os.path.getmtime(filename)).strftime('%d/%m/%Y %H:%M')
-                return f"📊 Analyse de {filename}: {lines} lignes, {words} mots, {chars} caractères, taille {size} bytes, modifié le {mod_time}."
-            except Exception as e:
+            except OSError as e:
                 return f"⚠️ Erreur d'analyse fichier: {e}"
+            result = (f"📊 Analyse de {filename}: {stats.lines} lignes, {stats.words} mots, {stats.chars} caractères, "
+                      f"taille {stats.size} bytes, encodage {stats.encoding}, modifié le {mod_time}.")
+            if not details:
+                return result
+            lines = [result, f"    Plus longue ligne : n°{stats.longest[1]} ({stats.longest[0]} octets)"]
+            if stats.top_words:
+                top = ', '.join(f"{w} ({n})" for w, n in stats.top_words.most_common(FILE_TOP_WORDS))
+                lines.append(f"    Mots fréquents : {Colors.BRIGHT_GREEN}{top}{Colors.RESET}")
+            histogram = [int(n) for n in stats.histogram]
+            if stats.size:
+                ascii_share = sum(histogram[9:14] + histogram[32:127]) / stats.size
+                common = sorted(range(256), key=histogram.__getitem__, reverse=True)[:6]
+                shown = ', '.join(f"{chr(b) if 33 <= b < 127 else hex(b)} {histogram[b] / stats.size:.1%}" for b in common if histogram[b])
+                lines.append(f"    Octets : {ascii_share:.1%} ASCII imprimable ; plus fréquents : {shown}")
+            lines.append(f"    Lu en {seconds:.2f} s ({stats.size / (1 << 20) / max(seconds, 1e-9):.0f} Mo/s)")
+            return "\n".join(lines)
         return None
     
     def handle_system_command(self, text):
@@ -2053,6 +6023,106 @@ class Freev:
             return "⚠️ Commande non autorisée."
         return None
     
+    def handle_disk_usage(self, text):
+        """Tailles cumulées d'une arborescence (du), plus gros dossiers et fichiers"""
+        du_match = self.re_disk_usage.search(text)
+        if not du_match:
+            return None
+        dir_path = os.path.abspath(du_match.group(1).strip() or ".")
+        if not os.path.isdir(dir_path):
+            return "⚠️ Dossier non valide."
+        max_depth = int(du_match.group(2)) if du_match.group(2) else None
+        top = int(du_match.group(3)) if du_match.group(3) else EXPLORE_TOP
+        ignore = [p for p in re.split(r'[,\s]+', du_match.group(4) or '') if p]
+
+        shown = []
+
+        def progress(scan):
+            shown.append(scan.files)
+            sys.stdout.write(f"\r⏳ {scan.files} fichiers, {len(scan.dirs)} dossiers, {format_size(scan.size)}...")
+            sys.stdout.flush()
+
+        start = time.perf_counter()
+        scan = scan_tree(dir_path, ignore, top, progress=progress)
+        seconds = time.perf_counter() - start
+        if shown:
+            sys.stdout.write("\r" + " " * 60 + "\r")
+        lines = [f"📂 {dir_path} : {Colors.BRIGHT_GREEN}{format_size(scan.size)}{Colors.RESET} dans {scan.files} fichiers, "
+                 f"{len(scan.dirs) - 1} sous-dossiers ({seconds:.2f} s)"]
+        if scan.errors:
+            lines.append(f"    ⚠️ {scan.errors} entrée(s) illisible(s) ignorée(s)")
+        dirs = scan.largest_dirs(top, max_depth)
+        if dirs:
+            depth = f", profondeur ≤ {max_depth}" if max_depth is not None else ""
+            lines.append(f"{Colors.BRIGHT_YELLOW}Plus gros dossiers{depth} :{Colors.RESET}")
+            lines.extend(f"    {format_size(size):>10}  {os.path.relpath(path, dir_path)}/" for size, path in dirs)
+        files = scan.largest_files()
+        if files:
+            lines.append(f"{Colors.BRIGHT_YELLOW}Plus gros fichiers :{Colors.RESET}")
+            lines.extend(f"    {format_size(size):>10}  {os.path.relpath(path, dir_path)}" for size, path in files)
+        return "\n".join(lines)
+    
+    def handle_duplicates(self, text):
+        """Fichiers en double : tailles, puis empreintes partielles, puis complètes (cache persistant)"""
+        dup_match = self.re_duplicates.search(text)
+        if not dup_match:
+            return None
+        dir_path = os.path.abspath(dup_match.group(1).strip())
+        if not os.path.isdir(dir_path):
+            return "⚠️ Dossier non valide."
+        ignore = [p for p in re.split(r'[,\s]+', dup_match.group(2) or '') if p]
+        start = time.perf_counter()
+        groups, stats = find_duplicates(dir_path, ignore, cache=HashCache())
+        seconds = time.perf_counter() - start
+        summary = (f"({stats['fichiers']} fichiers examinés, {stats['calculées']} empreintes calculées, "
+                   f"{stats['en cache']} en cache, {seconds:.2f} s)")
+        if not groups:
+            return f"✅ Aucun doublon dans {dir_path} {summary}."
+        wasted = sum(size * (len(paths) - 1) for size, paths in groups)
+        lines = [f"🧬 {len(groups)} groupe(s) de doublons, {Colors.BRIGHT_GREEN}{format_size(wasted)}{Colors.RESET} récupérables {summary}"]
+        for size, paths in groups[:DUP_SHOWN]:
+            lines.append(f"{Colors.BRIGHT_YELLOW}    {format_size(size)} × {len(paths)}{Colors.RESET}")
+            lines.extend(f"        {os.path.relpath(path, dir_path)}" for path in paths)
+        if len(groups) > DUP_SHOWN:
+            lines.append(f"    ... et {len(groups) - DUP_SHOWN} autre(s) groupe(s)")
+        return "\n".join(lines)
+    
+    def handle_text_search(self, text):
+        """Recherche plein texte dans un dossier : index de trigrammes mis à jour, puis regex sur les candidats"""
+        search_match = self.re_text_search.search(text)
+        if not search_match:
+            return None
+        pattern, dir_path = search_match.group(1).strip(), os.path.abspath(search_match.group(2).strip())
+        if not os.path.isdir(dir_path):
+            return "⚠️ Dossier non valide."
+        try:
+            regex, literals = search_pattern(pattern)
+        except re.error as e:
+            return f"❌ Expression régulière invalide : {e}"
+        start = time.perf_counter()
+        index = TextIndex(dir_path)
+        try:
+            stats = index.update()
+            indexed = time.perf_counter()
+            candidates = index.candidates(literals)
+            lines, files, total = [], set(), 0
+            for path, line_no, line in index.search(regex, literals):
+                total += 1
+                files.add(path)
+                if total <= SEARCH_MAX_RESULTS:
+                    lines.append(f"    {Colors.BRIGHT_CYAN}{os.path.relpath(path, dir_path)}:{line_no}{Colors.RESET}: {line.strip()[:160]}")
+        finally:
+            index.close()
+        seconds = time.perf_counter() - start
+        summary = (f"({stats['fichiers']} fichiers, {stats['indexés']} (ré)indexés en {indexed - start:.2f} s, "
+                   f"{len(candidates)} candidats, {seconds:.2f} s au total)")
+        if not total:
+            return f"🔎 Aucun résultat pour « {pattern} » {summary}."
+        header = f"🔎 {Colors.BRIGHT_GREEN}{total}{Colors.RESET} ligne(s) dans {len(files)} fichier(s) pour « {pattern} » {summary}"
+        if total > SEARCH_MAX_RESULTS:
+            lines.append(f"    ... {total - SEARCH_MAX_RESULTS} autre(s) ligne(s)")
+        return "\n".join([header] + lines)
+    
     def handle_file_explorer(self, text):
         """Explorateur de fichiers en texte"""
         explore_match = self.re_file_explorer.search(text)
@@ -2063,21 +6133,20 @@ class Freev:
             if not os.path.isdir(dir_path):
                 return "⚠️ Dossier non valide."
             try:
-                files = os.listdir(dir_path)
                 total_size = 0
                 file_list = []
                 dir_list = []
                 
-                for f in files:
-                    full_path = os.path.join(dir_path, f)
-                    if os.path.isfile(full_path):
+                with os.scandir(dir_path) as entries:  # Type et taille lus depuis l'entrée, sans stat en double
+                    for entry in entries:
                         try:
-                            total_size += os.path.getsize(full_path)
-                            file_list.append(f)
+                            if entry.is_dir():
+                                dir_list.append(f"{entry.name}/")
+                            elif entry.is_file():
+                                total_size += entry.stat().st_size
+                                file_list.append(entry.name)
                         except OSError:
                             pass # Fichier inaccessible
-                    elif os.path.isdir(full_path):
-                        dir_list.append(f"{f}/")
 
                 result = f"📂 Dossier : {dir_path}\n"
                 result += f"Répertoires : {', '.join(dir_list)}\n"
@@ -2101,7 +6170,36 @@ class Freev:
         return None
     
     def handle_system_logs(self, text):
-        """Mini-logs systèmes"""
+        """Mini-logs systèmes : instantané, ou historique enregistré (min/moy/max et mini-graphes)"""
+        history_match = self.re_system_logs_history.search(text)
+        if history_match:
+            count = int(history_match.group(1) or 1)
+            unit = history_match.group(2).lower()
+            seconds = count * (60 if unit.startswith('m') else 86400 if unit.startswith('j') else 3600)
+            try:
+                rows, interval = read_metrics(METRICS_FILE, time.time() - seconds)
+            except (OSError, struct.error):
+                rows, interval = [], METRICS_INTERVAL
+            if not rows:
+                return f"🖥️ Aucune mesure enregistrée sur cette période (un relevé toutes les {METRICS_INTERVAL:g} s pendant que Freev tourne)."
+            span = f"{count} {unit}" if history_match.group(1) else f"la dernière {unit}"
+            lines = [f"🖥️ Métriques sur {span} : {len(rows)} relevés, un toutes les {interval:g} s"]
+            summary = metrics_summary(rows)
+            for key, label, unit_label in METRICS_FIELDS:
+                stats = summary.get(key)
+                if stats is None:
+                    continue
+                low, mean, high, graph = stats
+                show = (lambda v: f"{format_size(v)}/s") if unit_label == 'o/s' else (lambda v: f"{v:.1f} {unit_label}")
+                lines.append(f"    {label:<17} min {show(low):>11}  moy {show(mean):>11}  max {show(high):>11}  "
+                             f"{Colors.BRIGHT_GREEN}{graph}{Colors.RESET}")
+            cores = [sum(row[2][i] for row in rows) / len(rows) for i in range(len(rows[-1][2]))]
+            if cores:
+                lines.append("    Cœurs (moyenne)   " + " ".join(f"{i}:{c:.0f}%" for i, c in enumerate(cores)))
+            if self.metrics_recorder:
+                cpu_ms, share = self.metrics_recorder.overhead()
+                lines.append(f"    Enregistreur : {cpu_ms:.2f} ms CPU par relevé ({share:.3%} d'un cœur)")
+            return "\n".join(lines)
         if "logs systèmes" in text.lower():
             if psutil is None:
                 return "⚠️ psutil non installé. (Essayez: pip install psutil)"
@@ -2112,15 +6210,8 @@ class Freev:
                 uptime_sec = time.time() - psutil.boot_time()
                 uptime = timedelta(seconds=int(uptime_sec))
                 
-                temp_str = "N/A"
-                if hasattr(psutil, "sensors_temperatures"):
-                    temps = psutil.sensors_temperatures()
-                    if 'coretemp' in temps and temps['coretemp']:
-                        temp_str = f"{temps['coretemp'][0].current}°C"
-                    elif temps: # Prendre le premier disponible
-                        first_sensor_key = list(temps.keys())[0]
-                        if temps[first_sensor_key]:
-                            temp_str = f"{temps[first_sensor_key][0].current}°C"
+                temperature = system_temperature()
+                temp_str = "N/A" if math.isnan(temperature) else f"{temperature}°C"
 
                 return f"🖥️ CPU: {cpu}% | Mémoire: {mem}% | Disque: {disk}% | Temp: {temp_str} | Uptime: {uptime}"
             except Exception as e:
@@ -2141,68 +6232,128 @@ class Freev:
         return None
     
     def handle_world_time(self, text):
-        """Horloge mondiale avec décalages fixes"""
-        cities = {
-            "new york": -5,
-            "tokyo": 9,
-            "london": 0,
-            "paris": 1,
-            "sydney": 10,
-            "berlin": 1,
-            "moscow": 3,
-            "beijing": 8
-        }
-        time_match = self.re_world_time.search(text)
-        if time_match:
-            city = time_match.group(1).lower().strip()
-            if city in cities:
-                offset_hours = cities[city]
-                offset = timedelta(hours=offset_hours)
-                utc_time = datetime.now(timezone.utc)
-                local_time = utc_time + offset
-                return f"🕒 Heure à {city.capitalize()}: {local_time.strftime('%H:%M')} (UTC{offset_hours:+.0f})"
+        """Heure dans une ou plusieurs villes, horloge mondiale et conversion d'heure (zoneinfo, heures d'été exactes)"""
+        convert_match = self.re_time_convert.search(text)
+        time_match = None if convert_match else self.re_world_time.search(text)
+        if not (convert_match or time_match or self.re_world_clock.search(text)):
+            return None
+        if ZoneInfo is None:
+            return "❌ Fuseaux horaires indisponibles (module 'zoneinfo', Python 3.9+)."
+        if convert_match:
+            day, hour, minute, source, target = convert_match.groups()
+            found = [find_city(source), find_city(target.rstrip('?.!'))]
+            unknown = [name for name, city in zip((source, target), found) if city is None]
+            if unknown:
+                return f"❌ Ville inconnue : {', '.join(unknown)}"
+            if int(hour) > 23 or int(minute or 0) > 59:
+                return "❌ Heure invalide."
+            try:
+                day = datetime.strptime(day, '%Y-%m-%d').date() if day else None
+            except ValueError:
+                return "❌ Date invalide (AAAA-MM-JJ)."
+            local, converted, note = convert_time(int(hour), int(minute or 0), found[0][1], found[1][1], day)
+            shift = (converted.date() - local.date()).days
+            day_note = f", {'le lendemain' if shift > 0 else 'la veille'}" if shift else ""
+            lines = [f"🕒 {local:%H:%M} à {found[0][0]} ({local:%d/%m}, {format_utc_offset(local)}) = "
+                     f"{Colors.BRIGHT_GREEN}{converted:%H:%M}{Colors.RESET} à {found[1][0]}{day_note} ({format_utc_offset(converted)} {converted.tzname()})"]
+            if note == 'inexistante':
+                lines.append(f"⚠️ {int(hour):02d}:{int(minute or 0):02d} n'existe pas ce jour-là à {found[0][0]} (passage à l'heure d'été) : {local:%H:%M} retenu.")
+            elif note == 'ambiguë':
+                lines.append(f"⚠️ {int(hour):02d}:{int(minute or 0):02d} existe deux fois ce jour-là à {found[0][0]} (retour à l'heure d'hiver) : première occurrence retenue.")
+            return "\n".join(lines)
+        cities = WORLD_CLOCK_DEFAULT if not time_match else [name for name in re.split(r'\s*,\s*|\s+et\s+', time_match.group(1).strip()) if name]
+        rows, unknown = world_clock_rows(cities)
+        if not rows:
             return "❌ Ville non connue."
-        return None
+        if len(rows) == 1 and not unknown:
+            name, dt = rows[0]
+            return f"🕒 Heure à {name} : {Colors.BRIGHT_GREEN}{dt:%H:%M}{Colors.RESET} ({_DAY_NAMES[dt.weekday()]} {dt:%d/%m}, {format_utc_offset(dt)} {dt.tzname()}{', heure d’été' if dt.dst() else ''})"
+        lines = [f"{Colors.BOLD}🌍 Horloge mondiale :{Colors.RESET}"] + [format_clock_line(name, dt) for name, dt in rows]
+        if unknown:
+            lines.append(f"❌ Ville inconnue : {', '.join(unknown)}")
+        return "\n".join(lines)
     
     def handle_financial_calc(self, text):
-        """Calculs financiers simples"""
+        """Épargne, prêt, tableau d'amortissement (CSV), inflation et scénarios taux × durée"""
+        number = lambda value: float(value.replace(',', '.'))
         savings_match = self.re_financial_calc.search(text)
         if savings_match:
-            monthly = int(savings_match.group(1))
-            period = int(savings_match.group(2))
-            unit = savings_match.group(3)
-            rate_percent = int(savings_match.group(4))
-            
-            rate = rate_percent / 100
+            monthly, period, unit, rate_percent = number(savings_match.group(1)), int(savings_match.group(2)), savings_match.group(3), number(savings_match.group(4))
             months = period * 12 if unit.startswith("an") else period
-            total = 0
-            
-            for _ in range(months):
-                total += monthly
-                total *= (1 + rate / 12) # Intérêts composés mensuels
-            
-            return f"💰 Total épargné ({months} mois à {rate_percent}%) : {Colors.BRIGHT_GREEN}{total:.2f}€{Colors.RESET}"
+            if months > FINANCE_MAX_MONTHS:
+                return f"❌ Durée limitée à {FINANCE_MAX_MONTHS // 12} ans."
+            total = savings_future_value(monthly, rate_percent / 100, months)
+            return f"💰 Total épargné ({months} mois à {rate_percent:g}%) : {Colors.BRIGHT_GREEN}{total:.2f}€{Colors.RESET} (versé : {monthly * months:.2f}€)"
+        sweep_match = self.re_loan_sweep.search(text)
+        if sweep_match:
+            principal = number(sweep_match.group(1))
+            low_rate, high_rate = sorted((number(sweep_match.group(2)), number(sweep_match.group(3))))
+            low_years, high_years = sorted((int(sweep_match.group(4)), int(sweep_match.group(5))))
+            if not 1 <= low_years or high_years * 12 > FINANCE_MAX_MONTHS:
+                return f"❌ Durées entre 1 et {FINANCE_MAX_MONTHS // 12} ans."
+            rates = _sweep_axis(low_rate, high_rate, FINANCE_TABLE_RATES)
+            years = sorted({round(y) for y in _sweep_axis(low_years, high_years, FINANCE_TABLE_DURATIONS)})
+            grid = payment_sweep(principal, [r / 100 for r in rates], [y * 12 for y in years])
+            lines = [f"💰 Mensualités pour {principal:.0f}€ :", "    taux " + "".join(f"{y:>8} ans" for y in years)]
+            for rate, row in zip(rates, grid):
+                lines.append(f"  {rate:5.2f}% " + "".join(f"{p:>12.2f}" for p in row))
+            return "\n".join(lines)
+        loan_match = self.re_loan.search(text)
+        if loan_match:
+            kind, principal, period, unit, rate_percent, path = loan_match.groups()
+            principal, rate = number(principal), number(rate_percent) / 100
+            months = int(period) * 12 if unit.startswith("an") else int(period)
+            if not 1 <= months <= FINANCE_MAX_MONTHS:
+                return f"❌ Durée entre 1 mois et {FINANCE_MAX_MONTHS // 12} ans."
+            payment = loan_payment(principal, rate, months)
+            summary = f"💰 Prêt de {principal:.2f}€ sur {months} mois à {rate * 100:g}% : mensualité {Colors.BRIGHT_GREEN}{payment:.2f}€{Colors.RESET}, coût des intérêts {payment * months - principal:.2f}€"
+            if not kind.lower().startswith('amort'):
+                return summary
+            path = path or 'amortissement.csv'
+            try:
+                write_amortization_csv(path, principal, rate, months)
+            except OSError as e:
+                return f"❌ Écriture de {path} impossible : {e}"
+            rows = amortization_schedule(principal, rate, months)
+            shown = rows if months <= 6 else rows[:3] + [None] + rows[-2:]
+            lines = [summary, "    mois   intérêts    capital    restant"]
+            lines += ["     ..." if row is None else f"  {row[0]:>6} {row[2]:>10.2f} {row[3]:>10.2f} {row[4]:>10.2f}" for row in shown]
+            lines.append(f"📄 Tableau complet ({months} lignes) exporté dans {path}")
+            return "\n".join(lines)
+        inflation_match = self.re_inflation.search(text)
+        if inflation_match:
+            amount, years, rate_percent = (number(g) for g in inflation_match.groups())
+            if years > 200:
+                return "❌ Durée limitée à 200 ans."
+            real, nominal = inflation_adjust(amount, rate_percent / 100, years)
+            return (f"💰 Avec {rate_percent:g}% d'inflation sur {years:g} ans, {amount:.2f}€ n'achèteront plus que "
+                    f"{Colors.BRIGHT_GREEN}{real:.2f}€{Colors.RESET} d'aujourd'hui ; il faudra {Colors.BRIGHT_GREEN}{nominal:.2f}€{Colors.RESET} pour le même panier.")
         return None
     
     def handle_math(self, text):
-        """Gère les calculs mathématiques"""
-        for pattern_obj, func in self.math_ops.items():
-            match = pattern_obj.search(text)
-            if match:
-                try:
-                    num_groups = len(match.groups())
-                    if num_groups == 0: # Cas 'pi'
-                        result = func()
-                    elif num_groups == 1:
-                        result = func(int(match.group(1)))
-                    else: # 2 groupes
-                        result = func(int(match.group(1)), int(match.group(2)))
-                    
-                    return f"🧮 Résultat : {Colors.BRIGHT_GREEN}{result}{Colors.RESET}"
-                
-                except Exception as e:
-                    return f"❌ Erreur math : {e}"
-        return None
+        """Gère les calculs mathématiques (expressions complètes : 2+3*4, (1,5+2)^2, x = 3, sin 30...)"""
+        expr = self.re_math_prefix.sub('', text).strip().rstrip('=?').strip()
+        if not expr or not self.re_math_chars.match(expr):
+            return None
+        expr = self.re_math_legacy.sub(lambda m: 'sqrt' if m.group(1).lower() == 'racine' else 'factorial', expr)
+        expr = expr.replace('×', '*').replace('÷', '/')
+        try:
+            target, tree = parse_expression(expr)
+        except ExpressionError:
+            return None  # Pas une expression : on laisse la main aux autres handlers
+        if tree[0] in ('num', 'var') and target is None:
+            return None  # Un nombre ou un mot seul (« e », « pi » compris) n'est pas un calcul
+        if expression_names(tree) - set(self.math_vars) - set(EXPR_CONSTANTS):
+            return None  # Variable inconnue : "a-b" dans une phrase n'est pas un calcul
+        try:
+            result = evaluate_expression(tree, self.math_vars)
+        except ExpressionError as e:
+            return f"❌ Erreur math : {e}"
+        self.math_vars['ans'] = result
+        if target:
+            self.math_vars[target] = result
+            return f"🧮 {target} = {Colors.BRIGHT_GREEN}{format_number(result)}{Colors.RESET}"
+        return f"🧮 Résultat : {Colors.BRIGHT_GREEN}{format_number(result)}{Colors.RESET}"
     
     def handle_time(self, text):
         """Gère les questions sur l'heure et la date"""
@@ -2253,23 +6404,23 @@ class Freev:
         return None
     
     def handle_port_scanner(self, text):
-        """Scanner de ports local basique"""
-        if "scanner de ports" in text.lower():
-            ports = [80, 443, 22, 21, 8080, 3306, 5432]  # Ports communs
-            open_ports = []
-            target = 'localhost'
-            print(f"🔍 Scan des ports sur {target}...")
-            for port in ports:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(0.5) # Rapide
-                result = sock.connect_ex((target, port))
-                if result == 0:
-                    open_ports.append(port)
-                sock.close()
-            
+        """Scanner de ports asynchrone : localhost par défaut, plages configurables, résultats au fil de l'eau"""
+        scan_match = self.re_port_scan.search(text)
+        if scan_match:
+            target = scan_match.group(1) or 'localhost'
+            try:
+                ports = parse_ports(scan_match.group(2)) if scan_match.group(2) else list(PORT_COMMON)
+                resolve_scan_target(target)  # Refus avant d'annoncer le scan
+                print(f"🔍 Scan de {len(ports)} port(s) sur {target}...")
+                start = time.perf_counter()
+                open_ports = scan_ports(target, ports, lambda port: print(
+                    f"    {Colors.BRIGHT_GREEN}✅ {port}/tcp{Colors.RESET} {service_name(port)}"))
+                seconds = time.perf_counter() - start
+            except ScanError as e:
+                return f"⚠️ {e}"
             if open_ports:
-                return f"🔍 Ports ouverts sur {target} : {', '.join(map(str, open_ports))}"
-            return f"🔍 Aucun port ouvert détecté (parmi {len(ports)} testés) sur {target}."
+                return f"🔍 {len(open_ports)} port(s) ouvert(s) sur {target} : {', '.join(map(str, open_ports))} ({len(ports)} testés en {seconds:.2f} s)"
+            return f"🔍 Aucun port ouvert détecté (parmi {len(ports)} testés en {seconds:.2f} s) sur {target}."
         return None
     
     def handle_memory_theme(self, text):
@@ -2394,202 +6545,251 @@ class Freev:
         return None
 
     def handle_file_compare(self, text):
-        """Compare deux fichiers texte"""
+        """Compare deux fichiers : empreinte d'abord, puis diff unifié affiché hunk par hunk"""
         match = self.re_compare_fichiers.search(text)
         if match:
             file1_path = match.group(1)
             file2_path = match.group(2)
             
-            if not os.path.exists(file1_path) or not os.path.exists(file2_path):
+            if not os.path.isfile(file1_path) or not os.path.isfile(file2_path):
                 return "⚠️ Un ou les deux fichiers n'existent pas."
             try:
-                with open(file1_path, 'r', encoding='utf-8') as f1:
-                    file1_lines = f1.readlines()
-                with open(file2_path, 'r', encoding='utf-8') as f2:
-                    file2_lines = f2.readlines()
-                
-                diff = difflib.unified_diff(file1_lines, file2_lines, fromfile=file1_path, tofile=file2_path, lineterm='')
-                diff_output = '\n'.join(diff)
-                
-                if not diff_output:
+                kind, detail = compare_files(file1_path, file2_path)
+                if kind == 'identiques':
                     return "✅ Fichiers identiques."
-                
-                return f"🔄 Différences entre les fichiers:\n{Colors.BRIGHT_YELLOW}{diff_output}{Colors.RESET}"
+                if kind == 'binaires':
+                    return f"🔄 Fichiers binaires différents (premier octet différent : {detail})."
+                shown = added = removed = hunks = 0
+                for hunk in detail:
+                    if not hunks:
+                        print(f"🔄 Différences entre les fichiers:\n{Colors.BRIGHT_YELLOW}--- {file1_path}\n+++ {file2_path}{Colors.RESET}")
+                    hunks += 1
+                    added += sum(1 for line in hunk if line[0] == '+')
+                    removed += sum(1 for line in hunk if line[0] == '-')
+                    for line in hunk:
+                        if shown >= DIFF_MAX_SHOWN:
+                            break
+                        color = {'@': Colors.BRIGHT_CYAN, '+': Colors.BRIGHT_GREEN, '-': Colors.BRIGHT_RED}.get(line[0], '')
+                        sys.stdout.write(f"{color}{line}{Colors.RESET}\n")
+                        shown += 1
+                    sys.stdout.flush()
+                if not hunks:
+                    return "✅ Contenus identiques (seul l'encodage diffère)."
+                more = f", affichage limité à {DIFF_MAX_SHOWN} lignes" if shown >= DIFF_MAX_SHOWN else ""
+                return f"🔄 {hunks} bloc(s) modifié(s) : +{added} / -{removed} lignes{more}."
             except Exception as e:
                 return f"⚠️ Erreur de comparaison: {e}"
         return None
 
+    def _processes(self):
+        """Échantillonneur de processus partagé, avec au moins deux tours (%CPU significatif)"""
+        if self.process_sampler is None:
+            self.process_sampler = ProcessSampler()
+        self.process_sampler.start().ready.wait(PROC_INTERVAL * 3)
+        return self.process_sampler
+
     def handle_process_info(self, text):
-        """Liste les processus (via psutil)"""
-        if self.re_liste_processus.search(text):
+        """Top des processus (via psutil) : instantané ou vue rafraîchie en direct"""
+        top_match = self.re_top_processus.search(text)
+        if top_match or self.re_liste_processus.search(text):
             if psutil is None:
                 return "⚠️ psutil non installé. (Essayez: pip install psutil)"
             try:
-                procs = []
-                for p in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                    procs.append(p.info)
-                
-                # Trier par CPU
-                top_cpu = sorted(procs, key=lambda p: p['cpu_percent'], reverse=True)[:5]
-                
-                result = f"{Colors.BRIGHT_CYAN}📊 Top 5 Processus (CPU):{Colors.RESET}\n"
-                result += "PID\t%CPU\t%MEM\tNom\n"
-                result += "-----------------------------------\n"
-                for p in top_cpu:
-                    result += f"{p['pid']}\t{p['cpu_percent']:.1f}\t{p['memory_percent']:.1f}\t{p['name']}\n"
-                return result
+                sampler = self._processes()
+                key = 'mem' if top_match and top_match.group(1) and top_match.group(1).lower() != 'cpu' else 'cpu'
+                title = f"{Colors.BRIGHT_CYAN}📊 Top {PROC_TOP} Processus ({'mémoire' if key == 'mem' else 'CPU'}):{Colors.RESET}"
+                if not top_match:
+                    return "\n".join([title] + format_process_table(sampler.top(key)))
+                # Vue en direct : le tableau est réécrit en place à chaque tour de l'échantillonneur
+                drawn = 0
+                try:
+                    for _ in range(PROC_REFRESHES):
+                        lines = [title] + format_process_table(sampler.top(key))
+                        sys.stdout.write((f"\033[{drawn}F" if drawn else "") + "".join(f"\033[2K{line}\n" for line in lines))
+                        sys.stdout.flush()
+                        drawn = len(lines)
+                        time.sleep(sampler.interval)
+                except KeyboardInterrupt:
+                    pass
+                cpu_ms, share = sampler.cost()
+                return f"📊 Échantillonnage : {cpu_ms:.1f} ms CPU par tour ({share:.2%} d'un cœur), {len(sampler.latest)} processus suivis."
             except Exception as e:
                 return f"⚠️ Erreur psutil: {e}"
         return None
 
-    def _tictactoe_print_board(self, board):
-        """Affiche le plateau de morpion"""
-        res = "\n"
-        for i, row in enumerate(board):
-            res += " " + " | ".join(f"{Colors.BRIGHT_GREEN}{c}{Colors.RESET}" if c == 'X' else f"{Colors.BRIGHT_YELLOW}{c}{Colors.RESET}" if c == 'O' else c for c in row) + "\n"
-            if i < 2:
-                res += "---|---|---\n"
-        return res
-
-    def _tictactoe_check_win(self, board, player):
-        """Vérifie si un joueur a gagné"""
-        # Lignes et colonnes
-        for i in range(3):
-            if all(board[i][j] == player for j in range(3)) or \
-               all(board[j][i] == player for j in range(3)):
-                return True
-        # Diagonales
-        if all(board[i][i] == player for i in range(3)) or \
-           all(board[i][2-i] == player for i in range(3)):
-            return True
-        return False
-
-    def _tictactoe_ai_move(self, board):
-        """IA simple pour le morpion"""
-        empty_cells = [(r, c) for r in range(3) for c in range(3) if board[r][c] == ' ']
-        if not empty_cells:
-            return None
-
-        # 1. Gagner
-        for r, c in empty_cells:
-            board[r][c] = 'O'
-            if self._tictactoe_check_win(board, 'O'):
-                return (r, c)
-            board[r][c] = ' ' # Annuler
-        
-        # 2. Bloquer
-        for r, c in empty_cells:
-            board[r][c] = 'X'
-            if self._tictactoe_check_win(board, 'X'):
-                board[r][c] = 'O' # Placer le coup bloquant
-                return (r, c)
-            board[r][c] = ' ' # Annuler
-
-        # 3. Aléatoire
-        return random.choice(empty_cells)
+    def _tictactoe_ai_move(self, state):
+        """Coup de l'IA (O) : table négamax en 3×3, alpha-bêta au-delà ; erreurs volontaires selon le niveau"""
+        if state.size == 3 and state.align == 3:
+            return pick_move(tictactoe_scores(state.x, state.o), state.level)
+        search = alignment_search(state.size, state.align)
+        if random.random() < TICTACTOE_LEVELS[state.level]:
+            return random.choice(search.candidates(state.o, state.x))
+        return search.best_move(state.o, state.x)[0]
 
     def handle_tictactoe(self, text):
-        """Gère le jeu du morpion"""
-        if self.re_joue_morpion.search(text):
-            board = [[' ' for _ in range(3)] for _ in range(3)]
-            self.game_state['tictactoe'] = {
-                'board': board,
-                'turn': 'X' # L'utilisateur commence
-            }
-            self.save_memory()
-            return f"🏁 Morpion lancé ! Vous êtes les {Colors.BRIGHT_GREEN}X{Colors.RESET}. À vous de jouer.\n" + \
-                   f"Utilisez `place X en L,C` (Ligne,Colonne de 0 à 2)\n" + \
-                   self._tictactoe_print_board(board)
+        """Gère le jeu du morpion (3×3 ou N×N, k pions alignés) sur bitboards"""
+        start_match = self.re_joue_morpion.search(text)
+        if start_match:
+            rows, cols, align, level = start_match.groups()
+            size = int(rows or 3)
+            if rows and rows != cols:
+                return "❌ Plateau carré uniquement (ex: 5x5)."
+            if not 3 <= size <= TICTACTOE_MAX_SIZE:
+                return f"❌ Taille de 3 à {TICTACTOE_MAX_SIZE}."
+            align = int(align or (3 if size == 3 else 4 if size <= 6 else 5))
+            if not 3 <= align <= size:
+                return f"❌ Alignement de 3 à {size} pions."
+            state = self.games.start(TicTacToeGame(0, 0, size, align, (level or 'difficile').lower(), 'X'))
+            return f"🏁 Morpion {size}×{size} ({align} alignés, niveau {state.level}) lancé ! Vous êtes les {Colors.BRIGHT_GREEN}X{Colors.RESET}. À vous de jouer.\n" + \
+                   f"Utilisez `place X en L,C` (Ligne,Colonne de 0 à {size - 1})\n" + \
+                   format_alignment_board(0, 0, size)
+
+        state = self.games.current('tictactoe')
+        if state:
+            size, align = state.size, state.align
+            full = (1 << size * size) - 1
 
-        if 'tictactoe' in self.game_state:
-            state = self.game_state['tictactoe']
-            board = state['board']
-            
             # Tour du joueur
             match = self.re_place_morpion.search(text)
-            if match and state['turn'] == 'X':
+            if match and state.turn == 'X':
                 player = match.group(1).upper()
                 if player != 'X':
                     return "C'est au tour de X."
-                
-                try:
-                    r, c = int(match.group(2)), int(match.group(3))
-                    if not (0 <= r <= 2 and 0 <= c <= 2):
-                        return "❌ Coordonnées invalides (0-2)."
-                    if board[r][c] != ' ':
-                        return "❌ Case déjà prise !"
-                except ValueError:
-                    return "❌ Format invalide. Ex: `place X en 1,2`"
-                
-                board[r][c] = 'X'
-                if self._tictactoe_check_win(board, 'X'):
-                    del self.game_state['tictactoe']
-                    self.save_memory()
-                    return f"🎉 Vous avez gagné !\n{self._tictactoe_print_board(board)}"
-                
-                state['turn'] = 'O'
-                
+                r, c = int(match.group(2)), int(match.group(3))
+                if not (0 <= r < size and 0 <= c < size):
+                    return f"❌ Coordonnées invalides (0-{size - 1})."
+                bit = 1 << (r * size + c)
+                if (state.x | state.o) & bit:
+                    return "❌ Case déjà prise !"
+
+                state.x |= bit
+                if has_won(state.x, size, align):
+                    self.games.end('tictactoe')
+                    return f"🎉 Vous avez gagné !\n{format_alignment_board(state.x, state.o, size)}"
+                if state.x | state.o == full:
+                    self.games.end('tictactoe')
+                    return f"🤝 Égalité !\n{format_alignment_board(state.x, state.o, size)}"
+
                 # Tour de l'IA
-                ai_move = self._tictactoe_ai_move(board)
-                if ai_move is None:
-                    del self.game_state['tictactoe']
-                    self.save_memory()
-                    return f"🤝 Égalité !\n{self._tictactoe_print_board(board)}"
-                
-                r_ai, c_ai = ai_move
-                board[r_ai][c_ai] = 'O'
-                
-                response = f"J'ai joué O en {r_ai},{c_ai}.\n{self._tictactoe_print_board(board)}"
-                
-                if self._tictactoe_check_win(board, 'O'):
-                    del self.game_state['tictactoe']
-                    self.save_memory()
-                    return f"😞 J'ai gagné !\n{self._tictactoe_print_board(board)}"
-                
-                state['turn'] = 'X'
-                self.save_memory()
+                cell = self._tictactoe_ai_move(state)
+                state.o |= 1 << cell
+                r_ai, c_ai = divmod(cell, size)
+                response = f"J'ai joué O en {r_ai},{c_ai}.\n{format_alignment_board(state.x, state.o, size)}"
+
+                if has_won(state.o, size, align):
+                    self.games.end('tictactoe')
+                    return f"😞 J'ai gagné !\n{format_alignment_board(state.x, state.o, size)}"
+                if state.x | state.o == full:
+                    self.games.end('tictactoe')
+                    return f"🤝 Égalité !\n{response}"
+
+                self.games.save(state)
                 return response
-            elif state['turn'] == 'O':
+            elif state.turn == 'O':
                 return "C'est à mon tour, mais j'attends votre coup."
-            elif match and state['turn'] != 'X':
+            elif match and state.turn != 'X':
                  return "Ce n'est pas votre tour."
 
         return None
 
     def handle_guess_number(self, text):
-        """Gère le jeu 'Devinez le Nombre'"""
+        """Gère le jeu 'Devinez le Nombre', et le mode inverse où Freev devine par dichotomie"""
+        reverse_match = self.re_devine_mon_nombre.search(text)
+        if reverse_match:
+            if reverse_match.group(1):
+                low, high = sorted((int(reverse_match.group(1)), int(reverse_match.group(2))))
+                state = self.games.start(ReverseGuessGame(low, high, None, 0, True))
+                intro = f"entre {low} et {high}"
+            else:
+                state = self.games.start(ReverseGuessGame(1, 100, None, 0, False))
+                intro = "(entre 1 et 100 de préférence, mais je m'adapte)"
+            guess = state.next_guess()
+            self.games.save(state)
+            return f"🤔 Pensez à un nombre {intro}. Je propose {Colors.BRIGHT_GREEN}{guess}{Colors.RESET} : répondez « plus grand », « plus petit » ou « trouvé »."
+
+        state = self.games.current('reverse_guess')
+        if state:
+            answer_match = self.re_reponse_nombre.search(text)
+            if not answer_match:
+                return None
+            answer = ' '.join(answer_match.group(1).lower().split())
+            if answer not in ('plus grand', 'plus', '+', '>', 'plus petit', 'moins', '-', '<'):
+                self.games.end('reverse_guess')
+                return f"🎉 Trouvé : {state.guess}, en {state.tries} essai(s) !"
+            if not state.answer(answer in ('plus grand', 'plus', '+', '>')):
+                self.games.end('reverse_guess')
+                return "🤨 Vos réponses se contredisent : aucun nombre ne convient. Partie terminée."
+            guess = state.next_guess()
+            self.games.save(state)
+            return f"Essai {state.tries} : {Colors.BRIGHT_GREEN}{guess}{Colors.RESET} ?"
+
         if self.re_jeu_devine_nombre.search(text):
-            target = random.randint(1, 100)
-            self.game_state['guess_number'] = {
-                'target': target,
-                'tries': 0
-            }
-            self.save_memory()
+            self.games.start(GuessNumberGame(random.randint(1, 100), 0))
             return "🎲 J'ai choisi un nombre entre 1 et 100. À vous de deviner !"
 
-        if 'guess_number' in self.game_state:
+        state = self.games.current('guess_number')
+        if state:
             try:
                 guess = int(text.strip())
-                state = self.game_state['guess_number']
-                state['tries'] += 1
-                
-                if guess < state['target']:
-                    self.save_memory()
-                    return "C'est plus grand ! ⬆️"
-                elif guess > state['target']:
-                    self.save_memory()
-                    return "C'est plus petit ! ⬇️"
-                else:
-                    tries = state['tries']
-                    del self.game_state['guess_number']
-                    self.save_memory()
-                    return f"🎉 Bravo ! Vous avez trouvé {state['target']} en {tries} essais."
             except ValueError:
                 # Ce n'est pas un nombre, donc ce n'est pas une tentative
                 return None
+            state.tries += 1
+            if guess < state.target:
+                self.games.save(state)
+                return "C'est plus grand ! ⬆️"
+            elif guess > state.target:
+                self.games.save(state)
+                return "C'est plus petit ! ⬇️"
+            self.games.end('guess_number')
+            return f"🎉 Bravo ! Vous avez trouvé {state.target} en {state.tries} essais."
         
         return None
 
+    def handle_code_breaker(self, text):
+        """Mastermind / Bulls and cows : Freev cherche le code secret de l'utilisateur (minimax de Knuth)"""
+        start_match = self.re_joue_mastermind.search(text)
+        if start_match:
+            name, length, count = start_match.groups()
+            bulls = not name.lower().startswith('mastermind')
+            length = int(length or 4)
+            alphabet = "0123456789" if bulls else "123456789ABCDEF"
+            count = int(count or (10 if bulls else 6))
+            if not 2 <= count <= len(alphabet) or not 1 <= length <= (count if bulls else 8):
+                return f"❌ De 2 à {len(alphabet)} symboles{', pas plus de positions que de chiffres' if bulls else ', 8 positions au plus'}."
+            total = math.perm(count, length) if bulls else count ** length
+            if total > CODE_MAX:
+                return f"❌ {total} codes possibles : limite {CODE_MAX}, réduisez les positions ou les symboles."
+            state = self.games.start(CodeBreakerGame(length, alphabet[:count], not bulls, [], None))
+            guess = state.next_guess()
+            self.games.save(state)
+            rules = "chiffres tous différents" if bulls else "répétitions permises"
+            answer = "taureaux (bien placés) et vaches (mal placés)" if bulls else "noirs (bien placés) et blancs (mal placés)"
+            return (f"🧠 Choisissez en secret un code de {length} symboles pris parmi {state.symbols} ({rules}). Répondez à chaque essai par le nombre de "
+                    f"{answer}, ex : 1 2.\nMon essai n°1 : {Colors.BRIGHT_GREEN}{guess}{Colors.RESET}")
+
+        state = self.games.current('mastermind')
+        if state:
+            answer_match = self.re_reponse_code.match(text)
+            if not answer_match:
+                return None
+            black, white = int(answer_match.group(1)), int(answer_match.group(2))
+            if black + white > state.length or (black == state.length - 1 and white == 1):
+                return f"❌ Réponse impossible pour {state.length} positions."
+            state.history = state.history + [[state.guess, black, white]]
+            if black == state.length:
+                self.games.end('mastermind')
+                return f"🎉 Votre code était {state.guess} : trouvé en {len(state.history)} essai(s) !"
+            left = len(code_candidates(state.spec(), tuple(map(tuple, state.history))))
+            guess = state.next_guess()
+            if guess is None:
+                self.games.end('mastermind')
+                return "🤨 Aucun code ne correspond à vos réponses : une erreur s'est glissée. Partie terminée."
+            self.games.save(state)
+            return f"Essai n°{len(state.history) + 1} : {Colors.BRIGHT_GREEN}{guess}{Colors.RESET} ({left} code(s) encore possible(s))"
+
+        return None
+
     def handle_ascii_art(self, text):
         """Affiche de l'ASCII art"""
         match = self.re_dessine.search(text)
@@ -2696,13 +6896,16 @@ class Freev:
             self.handle_hangman,
             self.handle_tictactoe,
             self.handle_guess_number,
+            self.handle_code_breaker,
             self.handle_riddle_timed,
+            self.handle_games,
             # Gestion perso
             self.handle_notes,
             self.handle_reminders,
             self.handle_calendar,
             # Outils rapides
             self.handle_math,
+            self.handle_world_time,
             self.handle_time,
             self.handle_password_gen,
             self.handle_translation,
@@ -2718,6 +6921,8 @@ class Freev:
             self.handle_moral_choice,
             self.handle_interactive_story,
             # Codage & Crypto
+            self.handle_codec_file,
+            self.handle_cryptanalysis,
             self.handle_base64,
             self.handle_morse,
             self.handle_binary,
@@ -2734,6 +6939,7 @@ class Freev:
             # Outils Maths/Logique
             self.handle_random_num,
             self.handle_fibonacci,
+            self.handle_prime_tools,
             self.handle_prime_check,
             self.handle_equation_solver,
             self.handle_logical_reasoning,
@@ -2741,8 +6947,11 @@ class Freev:
             # Outils Système & Fichiers
             self.handle_mini_editor,
             self.handle_file_analysis,
+            self.handle_text_search,  # Avant compare : « cherche ... compare ... dans »
             self.handle_file_compare,
             self.handle_system_command,
+            self.handle_disk_usage,
+            self.handle_duplicates,
             self.handle_file_explorer,
             self.handle_system_logs,
             self.handle_process_info,
@@ -2752,7 +6961,6 @@ class Freev:
             self.handle_history,
             self.handle_mode_change,
             self.handle_simulator,
-            self.handle_world_time,
             self.handle_search_history,
             self.handle_export,
             self.handle_memory_theme,
@@ -2768,12 +6976,7 @@ class Freev:
             try:
                 result = handler(user_input)
                 if result is not None:
-                    # Si c'est un jeu, ne pas continuer
-                    if handler in [self.handle_hangman, self.handle_tictactoe, self.handle_guess_number, self.handle_riddle_timed]:
-                        if 'game_state' in self.game_state:
-                             return result # Retourner la réponse du jeu
-                    else:
-                        return result # Retourner la réponse de l'outil
+                    return result
             except Exception as e:
                 print(f"Erreur handler {handler.__name__}: {e}")
                 return "❌ Oups, j'ai rencontré une erreur avec cette commande."
@@ -2795,7 +6998,7 @@ class Freev:
             response = random.choice(self.responses[category])
         else:
             # Ne pas répondre si c'est un nombre (probable tentative de jeu)
-            if 'guess_number' in self.game_state and user_input.strip().isdigit():
+            if self.games.current('guess_number') and user_input.strip().isdigit():
                  return "❌ Ce n'est pas ça. Essayez encore."
 
             response = random.choice([
@@ -2865,14 +7068,15 @@ class Freev:
     • Analyse de sentiment
 
   {Colors.BRIGHT_MAGENTA}🧮 Calculs{Colors.RESET}
-    • Opérations : 5 + 3, 10 * 2, 15 / 3
-    • Puissance : 2 ^ 8
-    • Racine carrée : racine de 16
-    • Trigonométrie : sin(30), cos(45), tan(60)
+    • Expressions : 2 + 3 * 4, (1,5 + 2) ^ 2, 17 % 5, 7 // 2
+    • Puissance : 2 ^ 8 (ou 2 ** 8)
+    • Racine carrée : racine de 16, sqrt(2)
+    • Trigonométrie (degrés) : sin(30), cos 45, tan(60)
     • Logarithme : log(100), ln(5)
     • Exponentielle : exp(2)
-    • Factorielle : factorielle de 5
-    • Pi : pi
+    • Factorielle : factorielle de 5, 5!
+    • Constantes : pi, e, tau (2pi, 3e...)
+    • Variables : x = 3 puis 2x + 1 ; ans = dernier résultat
 
   {Colors.BRIGHT_MAGENTA}📝 Notes{Colors.RESET}
     • "note: acheter du pain"
@@ -2905,10 +7109,10 @@ class Freev:
     • "convertir en majuscule "petit texte""
 
   {Colors.BRIGHT_MAGENTA}📏 Conversions{Colors.RESET}
-    • "convert 10 km to miles"
-    • "convert 20 celsius to fahrenheit"
-    • "convert 100 eur to usd" (taux approx.)
-    • "convert 50 kg to lbs"
+    • "convert 10 km to miles", "convert 90 km/h to m/s"
+    • "convert 20 celsius to fahrenheit", "convert 3 kWh to kcal"
+    • "convert 100 eur to usd" (taux de ~/.freev_rates.json si présent)
+    • "convertis 700 Mo en Gio"
 
   {Colors.BRIGHT_MAGENTA}🩺 Santé{Colors.RESET}
     • "calcule imc poids 70 taille 1.75"
@@ -2920,26 +7124,35 @@ class Freev:
     • "quiz" - question aléatoire
     • "nombre aléatoire 1 100"
     • "palindrome radar"
-    • "fibonacci 10"
-    • "premier 17"
+    • "fibonacci 10" (suite), "fibonacci terme 1000000"
+    • "fibonacci 1000000000000 mod 1000000007"
+    • "premier 18446744073709551557"
+    • "factorise 10000000000000000001"
+    • "1000e premier", "premiers entre 100 et 200"
     • "joue au pendu"
-    • "joue au morpion" (puis "place X en 0,1")
-    • "jeu devine le nombre" (puis "50")
+    • "joue au morpion" (puis "place X en 0,1"), "joue au morpion facile", "joue au morpion 7x7 4 alignés"
+    • "jeu devine le nombre" (puis "50"), ou "devine mon nombre [entre 1 et 1000]" (puis "plus grand", "plus petit", "trouvé")
+    • "joue au mastermind" ou "joue au bulls and cows" (je cherche votre code, répondez "1 2")
     • "simulateur de choix moraux"
     • "raconte une histoire interactive"
     • "devinette chronométrée"
+    • "mes parties" (plusieurs jeux à la fois), "reprends le pendu", "abandonne le morpion"
     • "simule un hacker" (ou scientifique, philosophe)
 
   {Colors.BRIGHT_MAGENTA}🔢 Codage{Colors.RESET}
     • "encode base64 hello"
     • "decode base64 aGVsbG8="
     • "encode morse SOS"
-    • "decode morse ...---..."
+    • "decode morse ... --- ..."
     • "encode binary hello"
     • "decode binary 01101000..."
     • "convertis en binaire 25"
     • "encode caesar hello" (shift 3)
     • "encode vigenere bonjour" (clé: CLE)
+    • "encode base64 fichier photo.jpg vers photo.txt"
+    • "chiffre vigenere fichier a.txt vers b.txt clé SECRET"
+    • "casse caesar KHOOR ZRUOG..." (clé retrouvée par fréquences)
+    • "casse vigenere fichier b.txt vers clair.txt"
 
   {Colors.BRIGHT_MAGENTA}🍲 Recettes{Colors.RESET}
     • "suggère recette" - idée simple
@@ -2959,28 +7172,41 @@ class Freev:
   {Colors.BRIGHT_MAGENTA}🕐 Date & Heure{Colors.RESET}
     • "quelle heure"
     • "quelle date"
-    • "heure à new york"
+    • "heure à new york" ou "heure à Paris, Tokyo et Montréal" (fuseaux IANA, heure d'été)
+    • "horloge mondiale"
+    • "convert 15h Paris to Tokyo" ou "convertis 2024-03-31 9h30 New York en Paris"
 
   {Colors.BRIGHT_MAGENTA}🧰 Outils Système & Fichiers{Colors.RESET}
     • "mon ip locale"
     • "mon nom d'hote"
-    • "logs systèmes" (CPU, RAM... nécessite 'psutil')
-    • "liste processus" (Top 5 CPU, nécessite 'psutil')
-    • "analyse fichier notes.txt"
+    • "logs systèmes" (CPU, RAM... nécessite 'psutil') ou "logs systèmes dernière heure" (historique)
+    • "liste processus" (Top 10 CPU, nécessite 'psutil')
+    • "top processus" ou "top processus mémoire" (vue rafraîchie en direct)
+    • "analyse fichier notes.txt" (fichiers de toute taille)
+    • "analyse détaillée fichier app.log" (mots fréquents, histogramme)
     • "cree fichier test.txt "mon contenu""
     • "ajoute a test.txt "autre ligne""
-    • "compare fichier1.txt fichier2.txt"
+    • "compare fichier1.txt fichier2.txt" (diff unifié, binaires détectés)
     • "exécute ls -l" (Commandes : ls, pwd, date, echo)
     • "explore dossier" (ou "explore dossier /chemin")
+    • "taille dossier /chemin profondeur 2 top 5 sauf *.log,.git" (du récursif)
+    • "doublons dans /chemin" (ou "doublons dans /chemin sauf .git")
+    • "cherche motif dans /chemin" (ou "cherche /regex/ dans /chemin", index incrémental)
     • "supprime fichier test.txt"
-    • "scanner de ports" (teste localhost)
+    • "scanner de ports" (ports courants de localhost) ou "scanner de ports 127.0.0.1 1-65535,8080"
 
   {Colors.BRIGHT_MAGENTA}🤖 Méta-Commandes (Freev){Colors.RESET}
     • "historique" - voir discussions
     • "change de personnalité fun/dark/..."
-    • "résous 2x + 3 = 9" (ou 1x^2+5x+6=0)
+    • "résous 2x + 3 = 9", "résous x^2 + 5x = -6"
+    • "résous x^5 - 3x = 1" (numérique au-delà du degré 2)
+    • "résous x + y = 3, x - y = 1" (systèmes 2×2 / 3×3)
     • "chiffre chanceux"
     • "épargne 50€/mois pendant 2 ans à 3%"
+    • "prêt 200000€ sur 20 ans à 3,5%"
+    • "amortissement 200000€ sur 20 ans à 3,5% vers pret.csv"
+    • "inflation 1000€ sur 10 ans à 2%"
+    • "scénarios prêt 200000€ de 2% à 5% sur 10 à 25 ans"
     • "recherche dans historique ‘math’" (avec ‘’)
     • "export tout" (sauvegarde freev_export.json)
     • "souviens-toi que ma couleur préférée c’est bleu"
@@ -3064,7 +7290,7 @@ class Freev:
                         self.notes = []
                         self.reminders = []
                         self.mode = "normal"
-                        self.game_state = {}
+                        self.games.clear()
                         self.level = 0
                         self.themed_memory = {}
                         self.user_style = []
@@ -3105,5 +7331,7 @@ class Freev:
                 print(f"\n{Colors.BRIGHT_RED}⚠ Erreur: {e}{Colors.RESET}\n")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--bench':
+        sys.exit(run_benchmarks(sys.argv[2:]))
     freev = Freev()
     freev.run()
\ No newline at end of file
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests de freev1 (python -m unittest test_freev1, depuis ce dossier)
+Les fichiers ~/.freev_* sont lus dans un HOME temporaire, jamais dans celui de l'utilisateur
+"""
+
+import os
+import socket
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+_HOME = tempfile.TemporaryDirectory(prefix='freev-test-')
+os.environ['HOME'] = os.environ['USERPROFILE'] = _HOME.name
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import freev1  # noqa: E402  (après HOME : les chemins ~/.freev_* sont fixés à l'import)
+
+
+class PortScanTests(unittest.TestCase):
+    def setUp(self):
+        self.listeners = []
+        for _ in range(5):
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.addCleanup(server.close)
+            server.bind(('127.0.0.1', 0))
+            server.listen(16)
+            self.listeners.append(server.getsockname()[1])
+        # Ports libérés juste avant le scan : personne n'y écoute
+        self.closed = []
+        for _ in range(5):
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+                probe.bind(('127.0.0.1', 0))
+                self.closed.append(probe.getsockname()[1])
+
+    def test_finds_exactly_the_local_listeners(self):
+        streamed = []
+        found = freev1.scan_ports('127.0.0.1', sorted(self.listeners + self.closed), streamed.append)
+        self.assertEqual(found, sorted(self.listeners))
+        self.assertEqual(sorted(streamed), found)
+
+    def test_concurrency_one_gives_the_same_ports(self):
+        found = freev1.scan_ports('127.0.0.1', self.closed + self.listeners, concurrency=1)
+        self.assertEqual(found, sorted(self.listeners))
+
+    def test_refuses_a_non_local_host(self):
+        for host in ('192.0.2.1', '8.8.8.8'):
+            with self.subTest(host=host), self.assertRaises(freev1.ScanError):
+                freev1.scan_ports(host, self.listeners)
+
+    def test_accepts_a_host_declared_in_the_scan_hosts_file(self):
+        freev1.SCAN_HOSTS_FILE.write_text('192.0.2.1\n', encoding='utf-8')
+        self.addCleanup(freev1.SCAN_HOSTS_FILE.unlink)
+        self.assertEqual(freev1.resolve_scan_target('192.0.2.1'), (socket.AF_INET, '192.0.2.1'))
+
+
+class MathTests(unittest.TestCase):
+    def setUp(self):
+        self.freev = freev1.Freev()
+
+    def test_lone_number_word_or_constant_is_not_a_calculation(self):
+        for text in ('42', 'bonjour', 'e', 'pi', 'tau'):
+            with self.subTest(text=text):
+                self.assertIsNone(self.freev.handle_math(text))
+
+    def test_constants_inside_expressions_are_evaluated(self):
+        self.assertIn('6.28318530717959', self.freev.handle_math('2*pi'))
+        answer = self.freev.handle_math('x = pi')
+        self.assertTrue(answer.startswith('🧮 x = '))
+        self.assertIn('3.14159265358979', answer)
+
+
+class CurrencyTests(unittest.TestCase):
+    def setUp(self):
+        self.freev = freev1.Freev()
+
+    def test_currency_codes_are_recognised_before_units(self):
+        self.assertEqual(freev1.currency_code('eur'), 'EUR')
+        self.assertEqual(freev1.currency_code('JPY'), 'JPY')
+        self.assertIsNone(freev1.currency_code('km'))
+
+    def test_unknown_rate_lists_the_available_currencies(self):
+        answer = self.freev.handle_unit_conversion('convert 100 eur to jpy')
+        self.assertIn('EUR → JPY inconnu', answer)
+        self.assertIn('EUR, GBP, USD', answer)
+        self.assertNotIn('unité inconnue', answer)
+
+    def test_known_rate_and_units_still_convert(self):
+        self.assertIn('110.00 USD', self.freev.handle_unit_conversion('convert 100 eur en usd'))
+        self.assertIn("km n'est pas une devise", self.freev.handle_unit_conversion('convert 100 eur to km'))
+        self.assertIn('3.10686 mi', self.freev.handle_unit_conversion('convert 5 km to mi'))
+
+
+@unittest.skipIf(freev1.ZoneInfo is None, "module 'zoneinfo' absent (Python < 3.9)")
+class TimeZoneTests(unittest.TestCase):
+    # (ville, date, heure, minute, décalage UTC attendu en minutes, remarque attendue)
+    DST_CASES = [
+        ('Paris', date(2024, 3, 31), 1, 59, 60, None), ('Paris', date(2024, 3, 31), 3, 0, 120, None),
+        ('Paris', date(2024, 3, 31), 2, 30, 120, 'inexistante'), ('Paris', date(2024, 10, 27), 2, 30, 120, 'ambiguë'),
+        ('Paris', date(2024, 10, 27), 3, 0, 60, None), ('New York', date(2024, 3, 10), 2, 30, -240, 'inexistante'),
+        ('New York', date(2024, 11, 3), 1, 30, -240, 'ambiguë'), ('Sydney', date(2024, 4, 7), 2, 30, 660, 'ambiguë'),
+        ('Sydney', date(2024, 10, 6), 2, 30, 660, 'inexistante'), ('Lord Howe', date(2024, 4, 7), 1, 45, 660, 'ambiguë'),
+        ('Lord Howe', date(2024, 7, 1), 12, 0, 630, None),
+    ]
+    # (source, cible, date, heure source, heure cible attendue)
+    CONVERSIONS = [
+        ('Paris', 'Tokyo', date(2024, 1, 15), 15, '23:00'), ('Paris', 'Tokyo', date(2024, 7, 15), 15, '22:00'),
+        ('New York', 'Paris', date(2024, 3, 20), 9, '14:00'), ('New York', 'Paris', date(2024, 4, 20), 9, '15:00'),
+    ]
+
+    def test_dst_transitions(self):
+        for city, day, hour, minute, offset, note in self.DST_CASES:
+            with self.subTest(city=city, day=day, time=f"{hour:02d}:{minute:02d}"):
+                local, utc, found_note = freev1.convert_time(hour, minute, freev1.find_city(city)[1], 'UTC', day)
+                self.assertEqual(local.utcoffset(), timedelta(minutes=offset))
+                self.assertEqual(found_note, note)
+                self.assertEqual(utc.replace(tzinfo=None) + timedelta(minutes=offset), local.replace(tzinfo=None))
+
+    def test_conversions_follow_each_side_dst(self):
+        for source, target, day, hour, expected in self.CONVERSIONS:
+            with self.subTest(source=source, target=target, day=day):
+                _, converted, _ = freev1.convert_time(hour, 0, freev1.find_city(source)[1], freev1.find_city(target)[1], day)
+                self.assertEqual(f"{converted:%H:%M}", expected)
+
+    def test_find_city(self):
+        expected = {'Paris': 'Europe/Paris', 'new york': 'America/New_York', 'Sydney': 'Australia/Sydney',
+                    'Lord Howe': 'Australia/Lord_Howe', 'Pékin': 'Asia/Shanghai', 'sao paolo': 'America/Sao_Paulo',
+                    'san fran': 'America/Los_Angeles', 'Europe/Berlin': 'Europe/Berlin', 'utc': 'UTC'}
+        for query, zone in expected.items():
+            with self.subTest(query=query):
+                self.assertEqual(freev1.find_city(query)[1], zone)
+        self.assertIsNone(freev1.find_city('xqzwv'))
+        self.assertIsNone(freev1.find_city('Mars/Olympus'))
+
+
+if __name__ == '__main__':
+    unittest.main()